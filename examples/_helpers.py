@@ -46,7 +46,8 @@ async def get_websocket():
     # WebDriver Classic with BiDi capabilities.
     try:
         # `max_size` is needed for `browsingContext.captureScreenshot` and
-        # `browsingContext.print` commands, both of which return a big payload.
+        # `browsingContext.print` commands, both of which return a big payload,
+        # unless they are called with `"goog:stream": True`.
         websocket = await websockets.connect(f'ws://localhost:{port}/session',
                                              max_size=None)
         # Init BiDi session.
@@ -34,8 +34,9 @@ export class BidiNoOpParser implements IBidiParser {
   }
   parseCaptureScreenshotParams(
     params: unknown
-  ): BrowsingContext.CaptureScreenshotParameters {
-    return params as BrowsingContext.CaptureScreenshotParameters;
+  ): BrowsingContext.CaptureScreenshotParameters & Cdp.StreamParameters {
+    return params as BrowsingContext.CaptureScreenshotParameters &
+      Cdp.StreamParameters;
   }
   parseCloseParams(params: unknown): BrowsingContext.CloseParameters {
     return params as BrowsingContext.CloseParameters;
@@ -54,8 +55,10 @@ export class BidiNoOpParser implements IBidiParser {
   parseNavigateParams(params: unknown): BrowsingContext.NavigateParameters {
     return params as BrowsingContext.NavigateParameters;
   }
-  parsePrintParams(params: unknown): BrowsingContext.PrintParameters {
-    return params as BrowsingContext.PrintParameters;
+  parsePrintParams(
+    params: unknown
+  ): BrowsingContext.PrintParameters & Cdp.StreamParameters {
+    return params as BrowsingContext.PrintParameters & Cdp.StreamParameters;
   }
   parseReloadParams(params: unknown): BrowsingContext.ReloadParameters {
     return params as BrowsingContext.ReloadParameters;
@@ -74,9 +77,15 @@ export class BidiNoOpParser implements IBidiParser {
 
   // CDP domain
   // keep-sorted start block=yes
+  parseCloseStreamParams(params: unknown): Cdp.CloseStreamParameters {
+    return params as Cdp.CloseStreamParameters;
+  }
   parseGetSessionParams(params: unknown): Cdp.GetSessionParameters {
     return params as Cdp.GetSessionParameters;
   }
+  parseReadStreamParams(params: unknown): Cdp.ReadStreamParameters {
+    return params as Cdp.ReadStreamParameters;
+  }
   parseSendCommandParams(params: unknown): Cdp.SendCommandParameters {
     return params as Cdp.SendCommandParameters;
   }
@@ -30,7 +30,7 @@ export interface IBidiParser {
   parseActivateParams(params: unknown): BrowsingContext.ActivateParameters;
   parseCaptureScreenshotParams(
     params: unknown
-  ): BrowsingContext.CaptureScreenshotParameters;
+  ): BrowsingContext.CaptureScreenshotParameters & Cdp.StreamParameters;
   parseCloseParams(params: unknown): BrowsingContext.CloseParameters;
   parseCreateParams(params: unknown): BrowsingContext.CreateParameters;
   parseGetTreeParams(params: unknown): BrowsingContext.GetTreeParameters;
@@ -38,7 +38,9 @@ export interface IBidiParser {
     params: unknown
   ): BrowsingContext.HandleUserPromptParameters;
   parseNavigateParams(params: unknown): BrowsingContext.NavigateParameters;
-  parsePrintParams(params: unknown): BrowsingContext.PrintParameters;
+  parsePrintParams(
+    params: unknown
+  ): BrowsingContext.PrintParameters & Cdp.StreamParameters;
   parseReloadParams(params: unknown): BrowsingContext.ReloadParameters;
   parseSetViewportParams(
     params: unknown
@@ -50,7 +52,9 @@ export interface IBidiParser {
 
   // CDP domain
   // keep-sorted start block=yes
+  parseCloseStreamParams(params: unknown): Cdp.CloseStreamParameters;
   parseGetSessionParams(params: unknown): Cdp.GetSessionParameters;
+  parseReadStreamParams(params: unknown): Cdp.ReadStreamParameters;
   parseSendCommandParams(params: unknown): Cdp.SendCommandParameters;
   // keep-sorted end
 
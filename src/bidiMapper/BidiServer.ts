@@ -17,7 +17,7 @@
 
 import type {ICdpClient} from '../cdp/CdpClient';
 import type {ICdpConnection} from '../cdp/CdpConnection.js';
-import type {ChromiumBidi} from '../protocol/protocol.js';
+import type {BrowsingContext, ChromiumBidi} from '../protocol/protocol.js';
 import {EventEmitter} from '../utils/EventEmitter.js';
 import {type LoggerFn, LogType} from '../utils/log.js';
 import {ProcessingQueue} from '../utils/ProcessingQueue.js';
@@ -40,6 +40,25 @@ type BidiServerEvent = {
 
 export type MapperOptions = {acceptInsecureCerts: boolean};
 
+/**
+ * Outgoing messages are only kept in order where it matters:
+ * - Events of a browsing context are sent in order.
+ * - Command responses are sent after the earlier events of the context they
+ *   target, and after the earlier events registered with a ready payload, e.g.
+ *   `browsingContext.contextCreated`, so that the events caused by a command
+ *   precede its response.
+ * Other messages are sent as soon as they are ready, so a slow event, e.g. a
+ * `log.entryAdded` waiting for its arguments to be serialized, does not delay
+ * unrelated responses.
+ */
+const RESPONSES_ORDERING_KEY = ProcessingQueue.DEFAULT_ORDERING_KEY;
+
+function getContextOrderingKey(
+  contextId: BrowsingContext.BrowsingContext | null
+): string {
+  return `context:${contextId ?? ''}`;
+}
+
 export class BidiServer extends EventEmitter<BidiServerEvent> {
   #messageQueue: ProcessingQueue<OutgoingMessage>;
   #transport: IBidiTransport;
@@ -55,12 +74,18 @@ export class BidiServer extends EventEmitter<BidiServerEvent> {
   };
 
   #processOutgoingMessage = async (messageEntry: OutgoingMessage) => {
-    const message = messageEntry.message;
-
-    if (messageEntry.channel !== null) {
-      message['channel'] = messageEntry.channel;
+    if (this.#transport.sendSerializedMessage !== undefined) {
+      await this.#transport.sendSerializedMessage(messageEntry.toJson());
+      return;
     }
 
+    // The same message object is sent to all the subscribed channels, so it
+    // must not be modified.
+    const message =
+      messageEntry.channel === null
+        ? messageEntry.message
+        : {...messageEntry.message, channel: messageEntry.channel};
+
     await this.#transport.sendMessage(message);
   };
 
@@ -93,13 +118,28 @@ export class BidiServer extends EventEmitter<BidiServerEvent> {
       parser,
       this.#logger
     );
-    this.#eventManager.on(EventManagerEvents.Event, ({message, event}) => {
-      this.emitOutgoingMessage(message, event);
-    });
+    this.#eventManager.on(
+      EventManagerEvents.Event,
+      ({message, event, contextId, orderedWithResponses}) => {
+        this.emitOutgoingMessage(
+          message,
+          event,
+          orderedWithResponses
+            ? [RESPONSES_ORDERING_KEY, getContextOrderingKey(contextId)]
+            : [getContextOrderingKey(contextId)]
+        );
+      }
+    );
     this.#commandProcessor.on(
       CommandProcessorEvents.Response,
-      ({message, event}) => {
-        this.emitOutgoingMessage(message, event);
+      ({message, event, contextId}) => {
+        this.emitOutgoingMessage(
+          message,
+          event,
+          contextId === null
+            ? [RESPONSES_ORDERING_KEY]
+            : [RESPONSES_ORDERING_KEY, getContextOrderingKey(contextId)]
+        );
       }
     );
   }
@@ -142,13 +182,14 @@ export class BidiServer extends EventEmitter<BidiServerEvent> {
   }
 
   /**
-   * Sends BiDi message.
+   * Sends BiDi message. Messages sharing an ordering key are sent in order.
    */
   emitOutgoingMessage(
     messageEntry: Promise<Result<OutgoingMessage>>,
-    event: string
+    event: string,
+    orderingKeys?: readonly string[]
   ): void {
-    this.#messageQueue.add(messageEntry, event);
+    this.#messageQueue.add(messageEntry, event, orderingKeys);
   }
 
   close() {
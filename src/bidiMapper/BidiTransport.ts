@@ -22,5 +22,11 @@ export interface IBidiTransport {
     handler: (message: ChromiumBidi.Command) => Promise<void> | void
   ) => void;
   sendMessage: (message: ChromiumBidi.Message) => Promise<void> | void;
+  /**
+   * Sends an already serialized message. If implemented, it is used instead of
+   * `sendMessage`, so that events sent to several channels are serialized
+   * only once.
+   */
+  sendSerializedMessage?: (json: string) => Promise<void> | void;
   close(): void;
 }
@@ -22,6 +22,7 @@ import {
   UnknownCommandException,
   UnknownErrorException,
   UnsupportedOperationException,
+  type BrowsingContext,
   type ChromiumBidi,
 } from '../protocol/protocol.js';
 import {EventEmitter} from '../utils/EventEmitter.js';
@@ -32,6 +33,7 @@ import {BidiNoOpParser} from './BidiNoOpParser.js';
 import type {IBidiParser} from './BidiParser.js';
 import {BrowserProcessor} from './domains/browser/BrowserProcessor.js';
 import {CdpProcessor} from './domains/cdp/CdpProcessor.js';
+import {StreamStorage} from './domains/cdp/StreamStorage.js';
 import {BrowsingContextProcessor} from './domains/context/BrowsingContextProcessor.js';
 import type {BrowsingContextStorage} from './domains/context/BrowsingContextStorage.js';
 import type {EventManager} from './domains/events/EventManager.js';
@@ -52,6 +54,8 @@ type CommandProcessorEventsMap = {
   [CommandProcessorEvents.Response]: {
     message: Promise<Result<OutgoingMessage>>;
     event: string;
+    /** The browsing context targeted by the command, if any. */
+    contextId: BrowsingContext.BrowsingContext | null;
   };
 };
 
@@ -67,6 +71,7 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
   // keep-sorted end
 
   #parser: IBidiParser;
+  #realmStorage: RealmStorage;
   #logger?: LoggerFn;
 
   constructor(
@@ -82,10 +87,12 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
   ) {
     super();
     this.#parser = parser;
+    this.#realmStorage = realmStorage;
     this.#logger = logger;
 
     const networkStorage = new NetworkStorage();
     const preloadScriptStorage = new PreloadScriptStorage();
+    const streamStorage = new StreamStorage();
 
     // keep-sorted start block=yes
     this.#browserProcessor = new BrowserProcessor(browserCdpClient);
@@ -98,13 +105,16 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
       realmStorage,
       networkStorage,
       preloadScriptStorage,
+      streamStorage,
       acceptInsecureCerts,
       logger
     );
     this.#cdpProcessor = new CdpProcessor(
       browsingContextStorage,
       cdpConnection,
-      browserCdpClient
+      browserCdpClient,
+      streamStorage,
+      eventManager
     );
     this.#inputProcessor = new InputProcessor(browsingContextStorage);
     this.#networkProcessor = new NetworkProcessor(
@@ -117,7 +127,10 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
       preloadScriptStorage,
       logger
     );
-    this.#sessionProcessor = new SessionProcessor(eventManager);
+    this.#sessionProcessor = new SessionProcessor(
+      eventManager,
+      browsingContextStorage
+    );
     // keep-sorted end
   }
 
@@ -190,10 +203,20 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
 
       // CDP domain
       // keep-sorted start block=yes
+      case 'cdp.closeStream':
+        return await this.#cdpProcessor.closeStream(
+          this.#parser.parseCloseStreamParams(command.params)
+        );
+      case 'cdp.getEventBufferStats':
+        return this.#cdpProcessor.getEventBufferStats();
       case 'cdp.getSession':
         return this.#cdpProcessor.getSession(
           this.#parser.parseGetSessionParams(command.params)
         );
+      case 'cdp.readStream':
+        return await this.#cdpProcessor.readStream(
+          this.#parser.parseReadStreamParams(command.params)
+        );
       case 'cdp.sendCommand':
         return await this.#cdpProcessor.sendCommand(
           this.#parser.parseSendCommandParams(command.params)
@@ -277,7 +300,7 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
       case 'session.status':
         return this.#sessionProcessor.status();
       case 'session.subscribe':
-        return this.#sessionProcessor.subscribe(
+        return await this.#sessionProcessor.subscribe(
           this.#parser.parseSubscribeParams(command.params),
           command.channel
         );
@@ -295,7 +318,33 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
     throw new UnknownCommandException(`Unknown command '${command.method}'.`);
   }
 
+  /**
+   * Returns the browsing context targeted by the command, if any. The realm
+   * is resolved before the command is processed, as the command may destroy
+   * it.
+   */
+  #getTargetContext(
+    command: ChromiumBidi.Command
+  ): BrowsingContext.BrowsingContext | null {
+    const params = command.params as
+      | {
+          context?: unknown;
+          target?: {context?: unknown; realm?: unknown};
+        }
+      | undefined;
+    const context = params?.context ?? params?.target?.context;
+    if (typeof context === 'string') {
+      return context;
+    }
+    const realmId = params?.target?.realm;
+    if (typeof realmId === 'string') {
+      return this.#realmStorage.findRealm({realmId})?.browsingContextId ?? null;
+    }
+    return null;
+  }
+
   async processCommand(command: ChromiumBidi.Command): Promise<void> {
+    const contextId = this.#getTargetContext(command);
     try {
       const result = await this.#processCommand(command);
 
@@ -308,6 +357,7 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
       this.emit(CommandProcessorEvents.Response, {
         message: OutgoingMessage.createResolved(response, command.channel),
         event: command.method,
+        contextId,
       });
     } catch (e) {
       if (e instanceof Exception) {
@@ -317,6 +367,7 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
             command.channel
           ),
           event: command.method,
+          contextId,
         });
       } else {
         const error = e as Error;
@@ -330,6 +381,7 @@ export class CommandProcessor extends EventEmitter<CommandProcessorEventsMap> {
             command.channel
           ),
           event: command.method,
+          contextId,
         });
       }
     }
@@ -0,0 +1,58 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+import {expect} from 'chai';
+
+import type {ChromiumBidi} from '../protocol/protocol.js';
+
+import {OutgoingMessage} from './OutgoingMessage.js';
+
+describe('OutgoingMessage', () => {
+  const EVENT = {
+    type: 'event',
+    method: 'log.entryAdded',
+    params: {text: 'SOME_TEXT'},
+  } as unknown as ChromiumBidi.Message;
+
+  async function toJson(channel: string | null) {
+    const result = await OutgoingMessage.createResolved(EVENT, channel);
+    if (result.kind !== 'success') {
+      throw result.error;
+    }
+    return result.value.toJson();
+  }
+
+  it('should serialize message without channel', async () => {
+    expect(JSON.parse(await toJson(null))).to.deep.equal(EVENT);
+  });
+
+  it('should splice channel into the message', async () => {
+    expect(JSON.parse(await toJson('SOME_CHANNEL'))).to.deep.equal({
+      ...EVENT,
+      channel: 'SOME_CHANNEL',
+    });
+    expect(JSON.parse(await toJson('"quoted"'))).to.deep.equal({
+      ...EVENT,
+      channel: '"quoted"',
+    });
+  });
+
+  it('should not modify the shared message', async () => {
+    await toJson('SOME_CHANNEL');
+    expect(EVENT).not.to.have.property('channel');
+    expect(JSON.parse(await toJson(null))).to.deep.equal(EVENT);
+  });
+});
@@ -18,6 +18,22 @@
 import type {ChromiumBidi} from '../protocol/protocol.js';
 import type {Result} from '../utils/result.js';
 
+/**
+ * Caches the JSON of the messages, as the same event message is sent to all
+ * the subscribed channels.
+ */
+const serializedMessages = new WeakMap<ChromiumBidi.Message, string>();
+
+/** Returns the JSON of the message, serializing it only once. */
+export function serializeMessage(message: ChromiumBidi.Message): string {
+  let json = serializedMessages.get(message);
+  if (json === undefined) {
+    json = JSON.stringify(message);
+    serializedMessages.set(message, json);
+  }
+  return json;
+}
+
 export class OutgoingMessage {
   readonly #message: ChromiumBidi.Message;
   readonly #channel: string | null;
@@ -62,4 +78,18 @@ export class OutgoingMessage {
   get channel(): string | null {
     return this.#channel;
   }
+
+  /**
+   * Returns the JSON of the message, with the channel if any. The message
+   * itself is serialized only once and the channel is spliced in.
+   */
+  toJson(): string {
+    const json = serializeMessage(this.#message);
+    if (this.#channel === null) {
+      return json;
+    }
+    // The message is a non-empty object, so it ends with `}` and the channel
+    // can be appended as the last property.
+    return `${json.slice(0, -1)},"channel":${JSON.stringify(this.#channel)}}`;
+  }
 }
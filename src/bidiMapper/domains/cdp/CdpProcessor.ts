@@ -15,23 +15,32 @@
  * limitations under the License.
  */
 
-import type {Cdp} from '../../../protocol/protocol.js';
+import type {Cdp, EmptyResult} from '../../../protocol/protocol.js';
 import type {ICdpClient, ICdpConnection} from '../../BidiMapper.js';
 import type {BrowsingContextStorage} from '../context/BrowsingContextStorage.js';
+import type {EventManager} from '../events/EventManager.js';
+
+import type {StreamStorage} from './StreamStorage.js';
 
 export class CdpProcessor {
   readonly #browsingContextStorage: BrowsingContextStorage;
   readonly #cdpConnection: ICdpConnection;
   readonly #browserCdpClient: ICdpClient;
+  readonly #streamStorage: StreamStorage;
+  readonly #eventManager: EventManager;
 
   constructor(
     browsingContextStorage: BrowsingContextStorage,
     cdpConnection: ICdpConnection,
-    browserCdpClient: ICdpClient
+    browserCdpClient: ICdpClient,
+    streamStorage: StreamStorage,
+    eventManager: EventManager
   ) {
     this.#browsingContextStorage = browsingContextStorage;
     this.#cdpConnection = cdpConnection;
     this.#browserCdpClient = browserCdpClient;
+    this.#streamStorage = streamStorage;
+    this.#eventManager = eventManager;
   }
 
   getSession(params: Cdp.GetSessionParameters): Cdp.GetSessionResult {
@@ -56,4 +65,19 @@ export class CdpProcessor {
       session: params.session,
     };
   }
+
+  async readStream(
+    params: Cdp.ReadStreamParameters
+  ): Promise<Cdp.ReadStreamResult> {
+    return await this.#streamStorage.get(params.stream).read(params.size);
+  }
+
+  getEventBufferStats(): Cdp.GetEventBufferStatsResult {
+    return this.#eventManager.getBufferStats();
+  }
+
+  async closeStream(params: Cdp.CloseStreamParameters): Promise<EmptyResult> {
+    await this.#streamStorage.close(params.stream);
+    return {};
+  }
 }
@@ -0,0 +1,86 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import type {Protocol} from 'devtools-protocol';
+
+import type {ICdpClient} from '../../../cdp/CdpClient.js';
+import type {Cdp} from '../../../protocol/protocol.js';
+
+/**
+ * Default number of bytes per read. Chunks stay below the default 1 MiB
+ * message size limit of common WebSocket clients once base64 encoded.
+ */
+export const DEFAULT_READ_SIZE = 512 * 1024;
+
+/** Data read in chunks with `cdp.readStream`. */
+export interface Stream {
+  read(size?: number): Promise<Cdp.ReadStreamResult>;
+  close(): Promise<void>;
+}
+
+/** A CDP `IO` stream, e.g. returned by `Page.printToPDF`. */
+export class CdpStream implements Stream {
+  readonly #cdpClient: ICdpClient;
+  readonly #handle: Protocol.IO.StreamHandle;
+
+  constructor(cdpClient: ICdpClient, handle: Protocol.IO.StreamHandle) {
+    this.#cdpClient = cdpClient;
+    this.#handle = handle;
+  }
+
+  async read(size = DEFAULT_READ_SIZE): Promise<Cdp.ReadStreamResult> {
+    const {data, base64Encoded, eof} = await this.#cdpClient.sendCommand(
+      'IO.read',
+      {handle: this.#handle, size}
+    );
+    return {data, base64Encoded, eof};
+  }
+
+  async close() {
+    await this.#cdpClient.sendCommand('IO.close', {handle: this.#handle});
+  }
+}
+
+/** Base64-encoded data already received by the Mapper. */
+export class Base64Stream implements Stream {
+  #data: string;
+  #offset = 0;
+
+  constructor(data: string) {
+    this.#data = data;
+  }
+
+  read(size = DEFAULT_READ_SIZE): Promise<Cdp.ReadStreamResult> {
+    // Every 3 bytes are encoded as 4 characters. Keeping the chunks aligned
+    // lets each of them be decoded on its own.
+    const length = Math.max(1, Math.floor(size / 3)) * 4;
+    const data = this.#data.slice(this.#offset, this.#offset + length);
+    this.#offset += data.length;
+    const eof = this.#offset >= this.#data.length;
+    if (eof) {
+      // The data can be large, so don't keep it until the stream is closed.
+      this.#data = '';
+      this.#offset = 0;
+    }
+    return Promise.resolve({data, base64Encoded: true, eof});
+  }
+
+  close(): Promise<void> {
+    this.#data = '';
+    return Promise.resolve();
+  }
+}
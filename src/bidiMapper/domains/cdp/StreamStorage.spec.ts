@@ -0,0 +1,121 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import {expect} from 'chai';
+import sinon from 'sinon';
+
+import {NoSuchHandleException} from '../../../protocol/protocol.js';
+
+import {Base64Stream, type Stream} from './Stream.js';
+import {StreamStorage} from './StreamStorage.js';
+
+describe('Base64Stream', () => {
+  const BYTES = String.fromCharCode(
+    ...Array.from({length: 1000}, (_, i) => i % 256)
+  );
+
+  async function readAll(stream: Stream, size?: number) {
+    const chunks: string[] = [];
+    let eof = false;
+    while (!eof) {
+      const result = await stream.read(size);
+      expect(result.base64Encoded).to.be.true;
+      chunks.push(result.data);
+      eof = result.eof;
+    }
+    return chunks;
+  }
+
+  it('reads the data in one chunk by default', async () => {
+    const chunks = await readAll(new Base64Stream(btoa(BYTES)));
+
+    expect(chunks).to.deep.equal([btoa(BYTES)]);
+  });
+
+  it('reads chunks that can be decoded on their own', async () => {
+    const chunks = await readAll(new Base64Stream(btoa(BYTES)), 100);
+
+    expect(chunks).to.have.lengthOf(11);
+    expect(chunks.map((chunk) => atob(chunk)).join('')).to.equal(BYTES);
+  });
+
+  it('releases the data at the end', async () => {
+    const stream = new Base64Stream(btoa(BYTES));
+    await readAll(stream);
+
+    expect(await stream.read()).to.deep.equal({
+      data: '',
+      base64Encoded: true,
+      eof: true,
+    });
+  });
+
+  it('reads at least one group of 4 characters', async () => {
+    const chunks = await readAll(new Base64Stream(btoa('abcdef')), 0);
+
+    expect(chunks).to.deep.equal(['YWJj', 'ZGVm']);
+  });
+});
+
+describe('StreamStorage', () => {
+  let streamStorage: StreamStorage;
+
+  beforeEach(() => {
+    streamStorage = new StreamStorage();
+  });
+
+  it('returns the added stream', () => {
+    const stream = new Base64Stream('');
+    const handle = streamStorage.add(stream, 'context');
+
+    expect(streamStorage.get(handle)).to.equal(stream);
+  });
+
+  it('closes and removes the stream', async () => {
+    const stream = new Base64Stream('');
+    const close = sinon.spy(stream, 'close');
+    const handle = streamStorage.add(stream, 'context');
+
+    await streamStorage.close(handle);
+
+    expect(close.calledOnce).to.be.true;
+    expect(() => streamStorage.get(handle)).to.throw(NoSuchHandleException);
+  });
+
+  it('closes the streams of a browsing context', () => {
+    const stream = new Base64Stream('');
+    const otherStream = new Base64Stream('');
+    const close = sinon.spy(stream, 'close');
+    const otherClose = sinon.spy(otherStream, 'close');
+    const handle = streamStorage.add(stream, 'context');
+    const otherHandle = streamStorage.add(otherStream, 'other context');
+
+    streamStorage.closeByContext('context');
+
+    expect(close.calledOnce).to.be.true;
+    expect(otherClose.called).to.be.false;
+    expect(() => streamStorage.get(handle)).to.throw(NoSuchHandleException);
+    expect(streamStorage.get(otherHandle)).to.equal(otherStream);
+  });
+
+  it('throws on unknown stream', () => {
+    expect(() => streamStorage.get('unknown')).to.throw(
+      NoSuchHandleException,
+      'Unknown stream unknown'
+    );
+  });
+});
@@ -0,0 +1,75 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import {
+  NoSuchHandleException,
+  type BrowsingContext,
+  type Cdp,
+} from '../../../protocol/protocol.js';
+import {uuidv4} from '../../../utils/uuid.js';
+
+import type {Stream} from './Stream.js';
+
+type StoredStream = {
+  stream: Stream;
+  /** The browsing context whose data is streamed. */
+  contextId: BrowsingContext.BrowsingContext;
+};
+
+/**
+ * Stores the streams opened with the `goog:stream` parameter, until they are
+ * closed or their browsing context is destroyed.
+ */
+export class StreamStorage {
+  readonly #streams = new Map<Cdp.StreamHandle, StoredStream>();
+
+  add(
+    stream: Stream,
+    contextId: BrowsingContext.BrowsingContext
+  ): Cdp.StreamHandle {
+    const handle = uuidv4();
+    this.#streams.set(handle, {stream, contextId});
+    return handle;
+  }
+
+  get(handle: Cdp.StreamHandle): Stream {
+    const storedStream = this.#streams.get(handle);
+    if (storedStream === undefined) {
+      throw new NoSuchHandleException(`Unknown stream ${handle}`);
+    }
+    return storedStream.stream;
+  }
+
+  async close(handle: Cdp.StreamHandle) {
+    const stream = this.get(handle);
+    this.#streams.delete(handle);
+    await stream.close();
+  }
+
+  /** Closes the streams of the given browsing context, e.g. once destroyed. */
+  closeByContext(contextId: BrowsingContext.BrowsingContext) {
+    for (const [handle, storedStream] of this.#streams) {
+      if (storedStream.contextId !== contextId) {
+        continue;
+      }
+      this.#streams.delete(handle);
+      void storedStream.stream.close().catch(() => {
+        // The target is most likely gone, along with its streams.
+      });
+    }
+  }
+}
@@ -32,6 +32,7 @@ import {assert} from '../../../utils/assert.js';
 import {Deferred} from '../../../utils/Deferred.js';
 import {LogType, type LoggerFn} from '../../../utils/log.js';
 import {inchesFromCm} from '../../../utils/unitConversions.js';
+import type {StreamStorage} from '../cdp/StreamStorage.js';
 import type {EventManager} from '../events/EventManager.js';
 import {Realm} from '../script/Realm.js';
 import type {RealmStorage} from '../script/RealmStorage.js';
@@ -72,6 +73,7 @@ export class BrowsingContextImpl {
   #url = 'about:blank';
   readonly #eventManager: EventManager;
   readonly #realmStorage: RealmStorage;
+  readonly #streamStorage: StreamStorage;
   #loaderId?: Protocol.Network.LoaderId;
   #cdpTarget: CdpTarget;
   #maybeDefaultRealm?: Realm;
@@ -84,6 +86,7 @@ export class BrowsingContextImpl {
     parentId: BrowsingContext.BrowsingContext | null,
     eventManager: EventManager,
     browsingContextStorage: BrowsingContextStorage,
+    streamStorage: StreamStorage,
     logger?: LoggerFn
   ) {
     this.#cdpTarget = cdpTarget;
@@ -92,6 +95,7 @@ export class BrowsingContextImpl {
     this.#parentId = parentId;
     this.#eventManager = eventManager;
     this.#browsingContextStorage = browsingContextStorage;
+    this.#streamStorage = streamStorage;
     this.#logger = logger;
   }
 
@@ -102,6 +106,7 @@ export class BrowsingContextImpl {
     parentId: BrowsingContext.BrowsingContext | null,
     eventManager: EventManager,
     browsingContextStorage: BrowsingContextStorage,
+    streamStorage: StreamStorage,
     logger?: LoggerFn
   ): BrowsingContextImpl {
     const context = new BrowsingContextImpl(
@@ -111,6 +116,7 @@ export class BrowsingContextImpl {
       parentId,
       eventManager,
       browsingContextStorage,
+      streamStorage,
       logger
     );
 
@@ -172,6 +178,8 @@ export class BrowsingContextImpl {
       this.id
     );
     this.#browsingContextStorage.deleteContextById(this.id);
+    this.#eventManager.clearBufferedEvents(this.id);
+    this.#streamStorage.closeByContext(this.id);
   }
 
   /** Returns the ID of this context. */
@@ -199,10 +207,16 @@ export class BrowsingContextImpl {
     );
   }
 
-  /** Returns all children contexts, flattened. */
+  /** Returns all children contexts, flattened in pre-order. */
   get allChildren(): BrowsingContextImpl[] {
-    const children = this.directChildren;
-    return children.concat(...children.map((child) => child.allChildren));
+    const result: BrowsingContextImpl[] = [];
+    const stack = this.directChildren.reverse();
+    while (stack.length > 0) {
+      const child = stack.pop()!;
+      result.push(child);
+      stack.push(...child.directChildren.reverse());
+    }
+    return result;
   }
 
   /**
@@ -214,14 +228,9 @@ export class BrowsingContextImpl {
   }
 
   get top(): BrowsingContextImpl {
-    // eslint-disable-next-line @typescript-eslint/no-this-alias
-    let topContext: BrowsingContextImpl = this;
-    let parent = topContext.parent;
-    while (parent) {
-      topContext = parent;
-      parent = topContext.parent;
-    }
-    return topContext;
+    return this.#browsingContextStorage.getContext(
+      this.#browsingContextStorage.findTopLevelContextId(this.id)!
+    );
   }
 
   addChild(childId: BrowsingContext.BrowsingContext) {
@@ -826,7 +835,26 @@ export class BrowsingContextImpl {
   async print(
     params: BrowsingContext.PrintParameters
   ): Promise<BrowsingContext.PrintResult> {
-    const cdpParams: Protocol.Page.PrintToPDFRequest = {};
+    const result = await this.#printToPDF(params, 'ReturnAsBase64');
+    return {
+      data: result.data,
+    };
+  }
+
+  /** Prints to a CDP stream, to be read with `IO.read`. */
+  async printToStream(
+    params: BrowsingContext.PrintParameters
+  ): Promise<Protocol.IO.StreamHandle> {
+    const result = await this.#printToPDF(params, 'ReturnAsStream');
+    assert(result.stream);
+    return result.stream;
+  }
+
+  async #printToPDF(
+    params: BrowsingContext.PrintParameters,
+    transferMode: Protocol.Page.PrintToPDFRequest['transferMode']
+  ): Promise<Protocol.Page.PrintToPDFResponse> {
+    const cdpParams: Protocol.Page.PrintToPDFRequest = {transferMode};
 
     if (params.background !== undefined) {
       cdpParams.printBackground = params.background;
@@ -896,13 +924,10 @@ export class BrowsingContextImpl {
     }
 
     try {
-      const result = await this.#cdpTarget.cdpClient.sendCommand(
+      return await this.#cdpTarget.cdpClient.sendCommand(
         'Page.printToPDF',
         cdpParams
       );
-      return {
-        data: result.data,
-      };
     } catch (error: any) {
       // Effectively zero dimensions.
       if (
@@ -20,11 +20,14 @@ import type {ICdpClient} from '../../../cdp/CdpClient.js';
 import type {ICdpConnection} from '../../../cdp/CdpConnection.js';
 import {
   BrowsingContext,
+  type Cdp,
   type EmptyResult,
   InvalidArgumentException,
 } from '../../../protocol/protocol.js';
 import {CdpErrorConstants} from '../../../utils/CdpErrorConstants.js';
 import {type LoggerFn, LogType} from '../../../utils/log.js';
+import {Base64Stream, CdpStream} from '../cdp/Stream.js';
+import type {StreamStorage} from '../cdp/StreamStorage.js';
 import type {EventManager} from '../events/EventManager.js';
 import type {NetworkStorage} from '../network/NetworkStorage.js';
 import type {PreloadScriptStorage} from '../script/PreloadScriptStorage.js';
@@ -45,6 +48,7 @@ export class BrowsingContextProcessor {
   readonly #acceptInsecureCerts: boolean;
   readonly #preloadScriptStorage: PreloadScriptStorage;
   readonly #realmStorage: RealmStorage;
+  readonly #streamStorage: StreamStorage;
 
   readonly #logger?: LoggerFn;
 
@@ -57,6 +61,7 @@ export class BrowsingContextProcessor {
     realmStorage: RealmStorage,
     networkStorage: NetworkStorage,
     preloadScriptStorage: PreloadScriptStorage,
+    streamStorage: StreamStorage,
     acceptInsecureCerts: boolean,
     logger?: LoggerFn
   ) {
@@ -69,6 +74,7 @@ export class BrowsingContextProcessor {
     this.#preloadScriptStorage = preloadScriptStorage;
     this.#networkStorage = networkStorage;
     this.#realmStorage = realmStorage;
+    this.#streamStorage = streamStorage;
     this.#logger = logger;
 
     this.#setEventListeners(browserCdpClient);
@@ -173,17 +179,39 @@ export class BrowsingContextProcessor {
   }
 
   async captureScreenshot(
-    params: BrowsingContext.CaptureScreenshotParameters
-  ): Promise<BrowsingContext.CaptureScreenshotResult> {
+    params: BrowsingContext.CaptureScreenshotParameters & Cdp.StreamParameters
+  ): Promise<BrowsingContext.CaptureScreenshotResult & Cdp.StreamResult> {
     const context = this.#browsingContextStorage.getContext(params.context);
-    return await context.captureScreenshot(params);
+    const result = await context.captureScreenshot(params);
+    if (!params['goog:stream']) {
+      return result;
+    }
+    // CDP can't stream screenshots, but the data is still spared from passing
+    // through the BiDi transport at once.
+    return {
+      data: '',
+      'goog:stream': this.#streamStorage.add(
+        new Base64Stream(result.data),
+        context.id
+      ),
+    };
   }
 
   async print(
-    params: BrowsingContext.PrintParameters
-  ): Promise<BrowsingContext.PrintResult> {
+    params: BrowsingContext.PrintParameters & Cdp.StreamParameters
+  ): Promise<BrowsingContext.PrintResult & Cdp.StreamResult> {
     const context = this.#browsingContextStorage.getContext(params.context);
-    return await context.print(params);
+    if (!params['goog:stream']) {
+      return await context.print(params);
+    }
+    const handle = await context.printToStream(params);
+    return {
+      data: '',
+      'goog:stream': this.#streamStorage.add(
+        new CdpStream(context.cdpTarget.cdpClient, handle),
+        context.id
+      ),
+    };
   }
 
   async setViewport(
@@ -317,6 +345,7 @@ export class BrowsingContextProcessor {
         params.parentFrameId,
         this.#eventManager,
         this.#browsingContextStorage,
+        this.#streamStorage,
         this.#logger
       );
     }
@@ -386,6 +415,7 @@ export class BrowsingContextProcessor {
         null,
         this.#eventManager,
         this.#browsingContextStorage,
+        this.#streamStorage,
         this.#logger
       );
     }
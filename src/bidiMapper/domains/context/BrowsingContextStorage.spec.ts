@@ -17,8 +17,22 @@
 
 import {expect} from 'chai';
 
+import type {BrowsingContext} from '../../../protocol/protocol.js';
+
+import type {BrowsingContextImpl} from './BrowsingContextImpl.js';
 import {BrowsingContextStorage} from './BrowsingContextStorage.js';
 
+function createContext(
+  id: BrowsingContext.BrowsingContext,
+  parentId: BrowsingContext.BrowsingContext | null = null
+): BrowsingContextImpl {
+  return {
+    id,
+    parentId,
+    isTopLevelContext: () => parentId === null,
+  } as BrowsingContextImpl;
+}
+
 describe('BrowsingContextStorage', () => {
   let browsingContextStorage: BrowsingContextStorage;
 
@@ -35,5 +49,55 @@ describe('BrowsingContextStorage', () => {
     it('top-level context', () => {
       expect(browsingContextStorage.findTopLevelContextId(null)).to.be.null;
     });
+
+    it('nested contexts', () => {
+      browsingContextStorage.addContext(createContext('top'));
+      browsingContextStorage.addContext(createContext('child', 'top'));
+      browsingContextStorage.addContext(createContext('grandchild', 'child'));
+
+      expect(browsingContextStorage.findTopLevelContextId('top')).to.equal(
+        'top'
+      );
+      expect(
+        browsingContextStorage.findTopLevelContextId('grandchild')
+      ).to.equal('top');
+    });
+
+    it('unknown context', () => {
+      expect(browsingContextStorage.findTopLevelContextId('unknown')).to.equal(
+        'unknown'
+      );
+    });
+
+    it('deleted context', () => {
+      browsingContextStorage.addContext(createContext('top'));
+      browsingContextStorage.addContext(createContext('child', 'top'));
+      browsingContextStorage.deleteContextById('child');
+
+      expect(browsingContextStorage.findTopLevelContextId('child')).to.equal(
+        'child'
+      );
+    });
+  });
+
+  describe('get top-level contexts', () => {
+    it('returns only top-level contexts in the order of addition', () => {
+      const top = createContext('top');
+      const anotherTop = createContext('anotherTop');
+      browsingContextStorage.addContext(top);
+      browsingContextStorage.addContext(createContext('child', 'top'));
+      browsingContextStorage.addContext(anotherTop);
+
+      expect(browsingContextStorage.getTopLevelContexts()).to.deep.equal([
+        top,
+        anotherTop,
+      ]);
+
+      browsingContextStorage.deleteContext(top);
+
+      expect(browsingContextStorage.getTopLevelContexts()).to.deep.equal([
+        anotherTop,
+      ]);
+    });
   });
 });
@@ -30,11 +30,23 @@ export class BrowsingContextStorage {
     BrowsingContextImpl
   >();
 
+  /**
+   * Map from context ID to its top-level context ID. Maintained on adding and
+   * deleting contexts, as the parent of a context never changes.
+   */
+  readonly #topLevelContextIds = new Map<
+    BrowsingContext.BrowsingContext,
+    BrowsingContext.BrowsingContext
+  >();
+  /** Top-level contexts, in the order of addition. */
+  readonly #topLevelContexts = new Map<
+    BrowsingContext.BrowsingContext,
+    BrowsingContextImpl
+  >();
+
   /** Gets all top-level contexts, i.e. those with no parent. */
   getTopLevelContexts(): BrowsingContextImpl[] {
-    return this.getAllContexts().filter((context) =>
-      context.isTopLevelContext()
-    );
+    return Array.from(this.#topLevelContexts.values());
   }
 
   /** Gets all contexts. */
@@ -45,16 +57,28 @@ export class BrowsingContextStorage {
   /** Deletes the context with the given ID. */
   deleteContextById(id: BrowsingContext.BrowsingContext) {
     this.#contexts.delete(id);
+    this.#topLevelContextIds.delete(id);
+    this.#topLevelContexts.delete(id);
   }
 
   /** Deletes the given context. */
   deleteContext(context: BrowsingContextImpl) {
-    this.#contexts.delete(context.id);
+    this.deleteContextById(context.id);
   }
 
   /** Tracks the given context. */
   addContext(context: BrowsingContextImpl) {
     this.#contexts.set(context.id, context);
+    const parentId = context.parentId;
+    if (parentId === null) {
+      this.#topLevelContextIds.set(context.id, context.id);
+      this.#topLevelContexts.set(context.id, context);
+    } else {
+      this.#topLevelContextIds.set(
+        context.id,
+        this.#topLevelContextIds.get(parentId) ?? parentId
+      );
+    }
   }
 
   /** Returns true whether there is an existing context with the given ID. */
@@ -76,12 +100,8 @@ export class BrowsingContextStorage {
     if (id === null) {
       return null;
     }
-    const maybeContext = this.findContext(id);
-    const parentId = maybeContext?.parentId ?? null;
-    if (parentId === null) {
-      return id;
-    }
-    return this.findTopLevelContextId(parentId);
+    // Unknown contexts are considered top-level.
+    return this.#topLevelContextIds.get(id) ?? id;
   }
 
   /** Gets the context with the given ID, if any, otherwise throws. */
@@ -18,6 +18,7 @@
 import type {Protocol} from 'devtools-protocol';
 
 import type {ICdpClient} from '../../../cdp/CdpClient.js';
+import {ChromiumBidi} from '../../../protocol/protocol.js';
 import {Deferred} from '../../../utils/Deferred.js';
 import type {Result} from '../../../utils/result.js';
 import type {EventManager} from '../events/EventManager.js';
@@ -41,6 +42,8 @@ export class CdpTarget {
   readonly #targetUnblocked = new Deferred<Result<void>>();
   readonly #acceptInsecureCerts: boolean;
 
+  #networkDomainEnabled = false;
+
   static create(
     targetId: Protocol.Target.TargetID,
     cdpClient: ICdpClient,
@@ -119,10 +122,14 @@ export class CdpTarget {
 
   /** Calls `Fetch.enable` with the added network intercepts. */
   async fetchEnable() {
-    await this.#cdpClient.sendCommand(
-      'Fetch.enable',
-      this.#networkStorage.getFetchEnableParams()
-    );
+    await Promise.all([
+      // Intercepted requests are tracked by the Network domain events.
+      this.enableNetworkIfNeeded(),
+      this.#cdpClient.sendCommand(
+        'Fetch.enable',
+        this.#networkStorage.getFetchEnableParams()
+      ),
+    ]);
   }
 
   /** Calls `Fetch.disable`. */
@@ -130,6 +137,38 @@ export class CdpTarget {
     await this.#cdpClient.sendCommand('Fetch.disable');
   }
 
+  /**
+   * Enables the Network domain if there are network intercepts or any
+   * subscriptions to the network events in the target. Once enabled, the
+   * domain is kept enabled, so that the started requests are still tracked.
+   */
+  async enableNetworkIfNeeded() {
+    if (this.#networkDomainEnabled || !this.#isNetworkNeeded()) {
+      return;
+    }
+    try {
+      // Concurrent calls share the same in-flight CDP command.
+      await this.#cdpClient.sendCommand('Network.enable');
+      this.#networkDomainEnabled = true;
+    } catch (error: any) {
+      // The target might have been closed meanwhile.
+      if (!this.#cdpClient.isCloseError(error)) {
+        throw error;
+      }
+    }
+  }
+
+  #isNetworkNeeded(): boolean {
+    return (
+      this.#networkStorage.hasIntercepts() ||
+      this.#eventManager.isSubscribedTo(
+        ChromiumBidi.BiDiModule.Network,
+        // Frame targets share the ID with their browsing context.
+        this.#targetId
+      )
+    );
+  }
+
   /**
    * Enables all the required CDP domains and unblocks the target.
    */
@@ -145,11 +184,10 @@ export class CdpTarget {
         this.#cdpClient.sendCommand('Security.setIgnoreCertificateErrors', {
           ignore: this.#acceptInsecureCerts,
         }),
-        // XXX: #1080: Do not always enable the network domain globally.
-        // TODO: enable Network domain for OOPiF targets.
-        this.#cdpClient.sendCommand('Network.enable'),
-        // XXX: #1080: Do not always enable the fetch domain globally.
-        this.fetchEnable(),
+        // The Network and Fetch domains are only enabled when required by
+        // subscriptions or intercepts, as they slow down the target.
+        this.enableNetworkIfNeeded(),
+        this.#networkStorage.hasIntercepts() ? this.fetchEnable() : undefined,
         this.#cdpClient.sendCommand('Target.setAutoAttach', {
           autoAttach: true,
           waitForDebuggerOnStart: true,
@@ -207,12 +245,12 @@ export class CdpTarget {
       .flatMap((script) => script.channels);
   }
 
-  /** Loads all top-level preload scripts. */
+  /** Loads all top-level preload scripts concurrently. */
   async #initAndEvaluatePreloadScripts() {
-    for (const script of this.#preloadScriptStorage.find({
-      global: true,
-    })) {
-      await script.initInTarget(this, true);
-    }
+    await Promise.all(
+      this.#preloadScriptStorage
+        .find({global: true})
+        .map((script) => script.initInTarget(this, true))
+    );
   }
 }
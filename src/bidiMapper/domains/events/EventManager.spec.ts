@@ -0,0 +1,200 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import {expect} from 'chai';
+import sinon from 'sinon';
+
+import {ChromiumBidi} from '../../../protocol/protocol.js';
+import {BrowsingContextStorage} from '../context/BrowsingContextStorage.js';
+
+import {EventManager, EventManagerEvents} from './EventManager.js';
+
+const SOME_CONTEXT = 'SOME_CONTEXT';
+const ANOTHER_CONTEXT = 'ANOTHER_CONTEXT';
+
+function createLogEvent(text: string): ChromiumBidi.Event {
+  return {
+    type: 'event',
+    method: ChromiumBidi.Log.EventNames.LogEntryAdded,
+    params: {text},
+  } as unknown as ChromiumBidi.Event;
+}
+
+const EVENT_SIZE = JSON.stringify(createLogEvent('0')).length;
+
+describe('EventManager', () => {
+  describe('event buffers', () => {
+    it('should report the occupancy', async () => {
+      const eventManager = new EventManager(new BrowsingContextStorage());
+      eventManager.registerEvent(createLogEvent('0'), SOME_CONTEXT);
+      eventManager.registerEvent(createLogEvent('1'), ANOTHER_CONTEXT);
+      eventManager.registerEvent(createLogEvent('2'), null);
+      await wait(1);
+
+      expect(eventManager.getBufferStats()).to.deep.include({
+        events: 3,
+        size: 3 * EVENT_SIZE,
+        contexts: 2,
+      });
+    });
+
+    it('should purge the events of the destroyed context', async () => {
+      const eventManager = new EventManager(new BrowsingContextStorage());
+      eventManager.registerEvent(createLogEvent('0'), SOME_CONTEXT);
+      eventManager.registerEvent(createLogEvent('1'), ANOTHER_CONTEXT);
+      await wait(1);
+
+      eventManager.clearBufferedEvents(SOME_CONTEXT);
+
+      expect(eventManager.getBufferStats()).to.deep.include({
+        events: 1,
+        size: EVENT_SIZE,
+        contexts: 1,
+      });
+    });
+
+    it('should evict the oldest events over the size budget', async () => {
+      const eventManager = new EventManager(
+        new BrowsingContextStorage(),
+        2.5 * EVENT_SIZE
+      );
+      for (let i = 0; i < 5; i++) {
+        eventManager.registerEvent(createLogEvent(String(i)), null);
+      }
+      await wait(1);
+
+      expect(eventManager.getBufferStats()).to.deep.include({
+        events: 2,
+        size: 2 * EVENT_SIZE,
+      });
+
+      const listener = sinon.spy();
+      eventManager.on(EventManagerEvents.Event, listener);
+      eventManager.subscribe(
+        [ChromiumBidi.Log.EventNames.LogEntryAdded],
+        [null],
+        null
+      );
+      const messages = await Promise.all(
+        listener.getCalls().map((call) => call.firstArg.message)
+      );
+      expect(
+        messages.map((message) => message.value.message.params.text)
+      ).to.deep.equal(['3', '4']);
+    });
+  });
+
+  describe('lazy events', () => {
+    it('should be created only when sent', async () => {
+      const eventManager = new EventManager(new BrowsingContextStorage());
+      const createEvent = sinon
+        .stub()
+        .resolves({kind: 'success', value: createLogEvent('0')});
+      eventManager.registerLazyEvent(
+        createEvent,
+        null,
+        ChromiumBidi.Log.EventNames.LogEntryAdded,
+        1000
+      );
+      await wait(1);
+
+      sinon.assert.notCalled(createEvent);
+      expect(eventManager.getBufferStats()).to.deep.include({
+        events: 1,
+        size: 1000,
+      });
+
+      eventManager.subscribe(
+        [ChromiumBidi.Log.EventNames.LogEntryAdded],
+        [null],
+        null
+      );
+      eventManager.subscribe(
+        [ChromiumBidi.Log.EventNames.LogEntryAdded],
+        [null],
+        'SOME_CHANNEL'
+      );
+      await wait(1);
+
+      sinon.assert.calledOnce(createEvent);
+      expect(eventManager.getBufferStats()).to.deep.include({
+        events: 1,
+        size: EVENT_SIZE,
+      });
+    });
+
+    it('should not be created without subscriptions and buffering', () => {
+      const eventManager = new EventManager(new BrowsingContextStorage());
+      const createEvent = sinon.stub();
+      eventManager.registerLazyEvent(
+        createEvent,
+        null,
+        ChromiumBidi.Network.EventNames.ResponseCompleted,
+        1000
+      );
+
+      sinon.assert.notCalled(createEvent);
+    });
+
+    it('should evict the oldest events over the size budget unsent', () => {
+      const eventManager = new EventManager(new BrowsingContextStorage(), 2500);
+      const createEvent = sinon.stub();
+      for (let i = 0; i < 5; i++) {
+        eventManager.registerLazyEvent(
+          createEvent,
+          null,
+          ChromiumBidi.Log.EventNames.LogEntryAdded,
+          1000
+        );
+      }
+
+      sinon.assert.notCalled(createEvent);
+      expect(eventManager.getBufferStats()).to.deep.include({
+        events: 2,
+        size: 2000,
+      });
+    });
+
+    it('should reflect the state when sent, not registered', async () => {
+      const eventManager = new EventManager(new BrowsingContextStorage());
+      let text = 'registered';
+      eventManager.registerLazyEvent(
+        async () => ({kind: 'success', value: createLogEvent(text)}),
+        null,
+        ChromiumBidi.Log.EventNames.LogEntryAdded,
+        1000
+      );
+      text = 'sent';
+
+      const listener = sinon.spy();
+      eventManager.on(EventManagerEvents.Event, listener);
+      eventManager.subscribe(
+        [ChromiumBidi.Log.EventNames.LogEntryAdded],
+        [null],
+        null
+      );
+      const message = await listener.firstCall.firstArg.message;
+      expect(message.value.message.params.text).to.equal('sent');
+    });
+  });
+});
+
+function wait(timeout: number): Promise<void> {
+  return new Promise((resolve) => {
+    setTimeout(resolve, timeout);
+  });
+}
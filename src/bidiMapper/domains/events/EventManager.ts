@@ -20,26 +20,36 @@ import {
   type BrowsingContext,
 } from '../../../protocol/protocol.js';
 import {Buffer} from '../../../utils/Buffer.js';
-import {DefaultMap} from '../../../utils/DefaultMap.js';
 import {EventEmitter} from '../../../utils/EventEmitter.js';
 import {IdWrapper} from '../../../utils/IdWrapper.js';
 import type {Result} from '../../../utils/result.js';
-import {OutgoingMessage} from '../../OutgoingMessage.js';
+import {OutgoingMessage, serializeMessage} from '../../OutgoingMessage.js';
 import type {BrowsingContextStorage} from '../context/BrowsingContextStorage.js';
 
 import {assertSupportedEvent} from './events.js';
 import {SubscriptionManager} from './SubscriptionManager.js';
 
+type EventFactory = () => Promise<Result<ChromiumBidi.Event>>;
+
 class EventWrapper {
   readonly #idWrapper = new IdWrapper();
   readonly #contextId: BrowsingContext.BrowsingContext | null;
-  readonly #event: Promise<Result<ChromiumBidi.Event>>;
+  #createEvent: EventFactory | undefined;
+  #event: Promise<Result<ChromiumBidi.Event>> | undefined;
 
+  /**
+   * @param event The event, or a factory creating the event when it is
+   * accessed first.
+   */
   constructor(
-    event: Promise<Result<ChromiumBidi.Event>>,
+    event: Promise<Result<ChromiumBidi.Event>> | EventFactory,
     contextId: BrowsingContext.BrowsingContext | null
   ) {
-    this.#event = event;
+    if (typeof event === 'function') {
+      this.#createEvent = event;
+    } else {
+      this.#event = event;
+    }
     this.#contextId = contextId;
   }
 
@@ -51,7 +61,16 @@ class EventWrapper {
     return this.#contextId;
   }
 
+  get isEventCreated(): boolean {
+    return this.#event !== undefined;
+  }
+
+  /** Returns the event, creating it on the first access. */
   get event(): Promise<Result<ChromiumBidi.Event>> {
+    if (this.#event === undefined) {
+      this.#event = this.#createEvent!();
+      this.#createEvent = undefined;
+    }
     return this.#event;
   }
 }
@@ -64,6 +83,14 @@ type EventManagerEventsMap = {
   [EventManagerEvents.Event]: {
     message: Promise<Result<OutgoingMessage>>;
     event: string;
+    contextId: BrowsingContext.BrowsingContext | null;
+    /**
+     * Whether the event has to be sent before the responses to the commands
+     * received after it. False for events which are registered before their
+     * payload is ready, e.g. `log.entryAdded`; these are only ordered within
+     * their browsing context.
+     */
+    orderedWithResponses: boolean;
   };
 };
 /**
@@ -72,59 +99,85 @@ type EventManagerEventsMap = {
 const eventBufferLength: ReadonlyMap<ChromiumBidi.EventNames, number> = new Map(
   [[ChromiumBidi.Log.EventNames.LogEntryAdded, 100]]
 );
+/**
+ * The default budget for the size of all the buffered events, in characters
+ * of their JSON.
+ */
+const MAX_BUFFERED_EVENTS_SIZE = 16 * 1024 * 1024;
 
-export class EventManager extends EventEmitter<EventManagerEventsMap> {
+/** Occupancy of the event buffers. */
+export interface EventBufferStats {
+  /** The number of buffered events. */
+  events: number;
+  /** The size of the buffered events, in characters of their JSON. */
+  size: number;
+  /** The budget for the size of all the buffered events. */
+  maxSize: number;
+  /** The number of browsing contexts with buffered events. */
+  contexts: number;
+}
+
+type BufferedEventInfo = {
+  buffer: Buffer<EventWrapper>;
   /**
-   * Maps event name to a set of contexts where this event already happened.
-   * Needed for getting buffered events from all the contexts in case of
-   * subscripting to all contexts.
+   * The JSON size of the event, or its estimated size until it is created and
+   * resolved.
    */
-  #eventToContextsMap = new DefaultMap<
-    string,
-    Set<BrowsingContext.BrowsingContext | null>
-  >(() => new Set());
+  size: number;
+};
+
+export class EventManager extends EventEmitter<EventManagerEventsMap> {
   /**
-   * Maps `eventName` + `browsingContext` to buffer. Used to get buffered events
-   * during subscription. Channel-agnostic.
+   * Maps `eventName` -> `browsingContext` to buffer. Used to get buffered
+   * events during subscription. Channel-agnostic. The contexts of an event are
+   * also needed for getting buffered events from all the contexts in case of
+   * subscripting to all contexts.
    */
-  #eventBuffers = new Map<string, Buffer<EventWrapper>>();
+  #eventBuffers = new Map<
+    ChromiumBidi.EventNames,
+    Map<BrowsingContext.BrowsingContext | null, Buffer<EventWrapper>>
+  >();
   /**
-   * Maps `eventName` + `browsingContext` + `channel` to last sent event id.
+   * Maps `eventName` -> `browsingContext` -> `channel` to last sent event id.
    * Used to avoid sending duplicated events when user
    * subscribes -> unsubscribes -> subscribes.
    */
-  #lastMessageSent = new Map<string, number>();
+  #lastMessageSent = new Map<
+    ChromiumBidi.EventNames,
+    Map<BrowsingContext.BrowsingContext | null, Map<string | null, number>>
+  >();
+  /**
+   * All the buffered events, from the oldest to the newest, with their buffer
+   * and size. Used to evict the oldest events over the size budget.
+   */
+  #bufferedEvents = new Map<EventWrapper, BufferedEventInfo>();
+  #bufferedEventsSize = 0;
+  readonly #maxBufferedEventsSize: number;
   #subscriptionManager: SubscriptionManager;
   #browsingContextStorage: BrowsingContextStorage;
 
-  constructor(browsingContextStorage: BrowsingContextStorage) {
+  constructor(
+    browsingContextStorage: BrowsingContextStorage,
+    maxBufferedEventsSize = MAX_BUFFERED_EVENTS_SIZE
+  ) {
     super();
     this.#browsingContextStorage = browsingContextStorage;
     this.#subscriptionManager = new SubscriptionManager(browsingContextStorage);
-  }
-
-  /**
-   * Returns consistent key to be used to access value maps.
-   */
-  static #getMapKey(
-    eventName: ChromiumBidi.EventNames,
-    browsingContext: BrowsingContext.BrowsingContext | null,
-    channel?: string | null
-  ) {
-    return JSON.stringify({eventName, browsingContext, channel});
+    this.#maxBufferedEventsSize = maxBufferedEventsSize;
   }
 
   registerEvent(
     event: ChromiumBidi.Event,
     contextId: BrowsingContext.BrowsingContext | null
   ): void {
-    this.registerPromiseEvent(
+    this.#registerEvent(
       Promise.resolve({
         kind: 'success',
         value: event,
       }),
       contextId,
-      event.method as ChromiumBidi.EventNames
+      event.method as ChromiumBidi.EventNames,
+      true
     );
   }
 
@@ -132,6 +185,44 @@ export class EventManager extends EventEmitter<EventManagerEventsMap> {
     event: Promise<Result<ChromiumBidi.Event>>,
     contextId: BrowsingContext.BrowsingContext | null,
     eventName: ChromiumBidi.EventNames
+  ): void {
+    this.#registerEvent(event, contextId, eventName, false);
+  }
+
+  /**
+   * Registers an event which is created only when it is sent to a channel,
+   * either right away or from the buffer. Used for events which are costly to
+   * create and are often not subscribed to, e.g. `log.entryAdded`.
+   *
+   * The event reflects the state at the time it is created, not registered:
+   * e.g. an object logged and then mutated is sent in its mutated state, and
+   * once its realm is gone only what the factory captured is left.
+   *
+   * @param estimatedSize The size retained by the factory, in characters.
+   * It is charged to the buffer budget until the event is created and
+   * measured, so that buffered events which are never sent are bounded too.
+   */
+  registerLazyEvent(
+    createEvent: EventFactory,
+    contextId: BrowsingContext.BrowsingContext | null,
+    eventName: ChromiumBidi.EventNames,
+    estimatedSize: number
+  ): void {
+    this.#registerEvent(
+      createEvent,
+      contextId,
+      eventName,
+      false,
+      estimatedSize
+    );
+  }
+
+  #registerEvent(
+    event: Promise<Result<ChromiumBidi.Event>> | EventFactory,
+    contextId: BrowsingContext.BrowsingContext | null,
+    eventName: ChromiumBidi.EventNames,
+    orderedWithResponses: boolean,
+    estimatedSize = 0
   ): void {
     const eventWrapper = new EventWrapper(event, contextId);
     const sortedChannels =
@@ -139,12 +230,17 @@ export class EventManager extends EventEmitter<EventManagerEventsMap> {
         eventName,
         contextId
       );
-    this.#bufferEvent(eventWrapper, eventName);
+    this.#bufferEvent(eventWrapper, eventName, estimatedSize);
     // Send events to channels in the subscription priority.
     for (const channel of sortedChannels) {
       this.emit(EventManagerEvents.Event, {
-        message: OutgoingMessage.createFromPromise(event, channel),
+        message: OutgoingMessage.createFromPromise(
+          this.#getEvent(eventWrapper),
+          channel
+        ),
         event: eventName,
+        contextId,
+        orderedWithResponses,
       });
       this.#markEventSent(eventWrapper, channel, eventName);
     }
@@ -178,10 +274,14 @@ export class EventManager extends EventEmitter<EventManagerEventsMap> {
           // The order of the events is important.
           this.emit(EventManagerEvents.Event, {
             message: OutgoingMessage.createFromPromise(
-              eventWrapper.event,
+              this.#getEvent(eventWrapper),
               channel
             ),
             event: eventName,
+            contextId: eventWrapper.contextId,
+            // Buffered events are sent before the `session.subscribe`
+            // response.
+            orderedWithResponses: true,
           });
           this.#markEventSent(eventWrapper, channel, eventName);
         }
@@ -200,27 +300,114 @@ export class EventManager extends EventEmitter<EventManagerEventsMap> {
     this.#subscriptionManager.unsubscribeAll(eventNames, contextIds, channel);
   }
 
+  /**
+   * Returns true if any channel is subscribed to the given event, or to any
+   * event of the given module, in the given context.
+   */
+  isSubscribedTo(
+    moduleOrEvent: ChromiumBidi.EventNames,
+    contextId: BrowsingContext.BrowsingContext | null
+  ): boolean {
+    return this.#subscriptionManager.isSubscribedTo(moduleOrEvent, contextId);
+  }
+
   /**
    * If the event is buffer-able, put it in the buffer.
    */
-  #bufferEvent(eventWrapper: EventWrapper, eventName: ChromiumBidi.EventNames) {
+  #bufferEvent(
+    eventWrapper: EventWrapper,
+    eventName: ChromiumBidi.EventNames,
+    estimatedSize: number
+  ) {
     if (!eventBufferLength.has(eventName)) {
       // Do nothing if the event is no buffer-able.
       return;
     }
-    const bufferMapKey = EventManager.#getMapKey(
-      eventName,
-      eventWrapper.contextId
-    );
-    if (!this.#eventBuffers.has(bufferMapKey)) {
-      this.#eventBuffers.set(
-        bufferMapKey,
-        new Buffer<EventWrapper>(eventBufferLength.get(eventName)!)
+    let buffers = this.#eventBuffers.get(eventName);
+    if (buffers === undefined) {
+      buffers = new Map();
+      this.#eventBuffers.set(eventName, buffers);
+    }
+    let buffer = buffers.get(eventWrapper.contextId);
+    if (buffer === undefined) {
+      buffer = new Buffer<EventWrapper>(
+        eventBufferLength.get(eventName)!,
+        (removedEventWrapper) => this.#unbufferEvent(removedEventWrapper)
       );
+      buffers.set(eventWrapper.contextId, buffer);
+    }
+    buffer.add(eventWrapper);
+
+    const info: BufferedEventInfo = {buffer, size: estimatedSize};
+    this.#bufferedEvents.set(eventWrapper, info);
+    this.#bufferedEventsSize += estimatedSize;
+    if (eventWrapper.isEventCreated) {
+      this.#measureBufferedEvent(eventWrapper, info);
+    }
+    this.#evictOverBudget();
+  }
+
+  /**
+   * Returns the event of the wrapper, creating it if needed. Lazy buffered
+   * events are measured once created.
+   */
+  #getEvent(eventWrapper: EventWrapper): Promise<Result<ChromiumBidi.Event>> {
+    if (eventWrapper.isEventCreated) {
+      return eventWrapper.event;
+    }
+    const event = eventWrapper.event;
+    const info = this.#bufferedEvents.get(eventWrapper);
+    if (info !== undefined) {
+      this.#measureBufferedEvent(eventWrapper, info);
+    }
+    return event;
+  }
+
+  /**
+   * Replaces the estimated size of the buffered event with its actual size
+   * once resolved.
+   */
+  #measureBufferedEvent(eventWrapper: EventWrapper, info: BufferedEventInfo) {
+    eventWrapper.event.then(
+      (result) => {
+        if (
+          result.kind !== 'success' ||
+          !this.#bufferedEvents.has(eventWrapper)
+        ) {
+          return;
+        }
+        // The JSON is cached, so the event is not serialized again when sent.
+        const size = serializeMessage(result.value).length;
+        this.#bufferedEventsSize += size - info.size;
+        info.size = size;
+        this.#evictOverBudget();
+      },
+      () => {
+        // Errors are reported when the event is sent.
+      }
+    );
+  }
+
+  #unbufferEvent(eventWrapper: EventWrapper) {
+    const info = this.#bufferedEvents.get(eventWrapper);
+    if (info === undefined) {
+      return;
+    }
+    this.#bufferedEventsSize -= info.size;
+    this.#bufferedEvents.delete(eventWrapper);
+  }
+
+  /** Drops the oldest buffered events until they fit the size budget. */
+  #evictOverBudget() {
+    for (const [eventWrapper, info] of this.#bufferedEvents) {
+      if (this.#bufferedEventsSize <= this.#maxBufferedEventsSize) {
+        return;
+      }
+      // Events are buffered in the order of their IDs, so the oldest event is
+      // the first one in its buffer as well.
+      info.buffer.shift();
+      this.#unbufferEvent(eventWrapper);
     }
-    this.#eventBuffers.get(bufferMapKey)!.add(eventWrapper);
-    // Add the context to the list of contexts having `eventName` events.
-    this.#eventToContextsMap.get(eventName).add(eventWrapper.contextId);
   }
 
   /**
@@ -236,14 +423,19 @@ export class EventManager extends EventEmitter<EventManagerEventsMap> {
       return;
     }
 
-    const lastSentMapKey = EventManager.#getMapKey(
-      eventName,
-      eventWrapper.contextId,
-      channel
-    );
-    this.#lastMessageSent.set(
-      lastSentMapKey,
-      Math.max(this.#lastMessageSent.get(lastSentMapKey) ?? 0, eventWrapper.id)
+    let lastSentInContexts = this.#lastMessageSent.get(eventName);
+    if (lastSentInContexts === undefined) {
+      lastSentInContexts = new Map();
+      this.#lastMessageSent.set(eventName, lastSentInContexts);
+    }
+    let lastSent = lastSentInContexts.get(eventWrapper.contextId);
+    if (lastSent === undefined) {
+      lastSent = new Map();
+      lastSentInContexts.set(eventWrapper.contextId, lastSent);
+    }
+    lastSent.set(
+      channel,
+      Math.max(lastSent.get(channel) ?? 0, eventWrapper.id)
     );
   }
 
@@ -255,36 +447,93 @@ export class EventManager extends EventEmitter<EventManagerEventsMap> {
     contextId: BrowsingContext.BrowsingContext | null,
     channel: string | null
   ): EventWrapper[] {
-    const bufferMapKey = EventManager.#getMapKey(eventName, contextId);
-    const lastSentMapKey = EventManager.#getMapKey(
+    const buffers = this.#eventBuffers.get(eventName);
+    if (buffers === undefined) {
+      return [];
+    }
+    const result = this.#getBufferedEventsInContext(
+      buffers,
       eventName,
       contextId,
       channel
     );
-    const lastSentMessageId =
-      this.#lastMessageSent.get(lastSentMapKey) ?? -Infinity;
-
-    const result: EventWrapper[] =
-      this.#eventBuffers
-        .get(bufferMapKey)
-        ?.get()
-        .filter((wrapper) => wrapper.id > lastSentMessageId) ?? [];
 
     if (contextId === null) {
       // For global subscriptions, events buffered in each context should be sent back.
-      Array.from(this.#eventToContextsMap.get(eventName).keys())
-        .filter(
-          (_contextId) =>
-            // Events without context are already in the result.
-            _contextId !== null &&
-            // Events from deleted contexts should not be sent.
-            this.#browsingContextStorage.hasContext(_contextId)
-        )
-        .map((_contextId) =>
-          this.#getBufferedEvents(eventName, _contextId, channel)
-        )
-        .forEach((events) => result.push(...events));
+      for (const _contextId of buffers.keys()) {
+        if (
+          // Events without context are already in the result.
+          _contextId !== null &&
+          // Events from deleted contexts should not be sent.
+          this.#browsingContextStorage.hasContext(_contextId)
+        ) {
+          result.push(
+            ...this.#getBufferedEventsInContext(
+              buffers,
+              eventName,
+              _contextId,
+              channel
+            )
+          );
+        }
+      }
     }
     return result.sort((e1, e2) => e1.id - e2.id);
   }
+
+  #getBufferedEventsInContext(
+    buffers: Map<BrowsingContext.BrowsingContext | null, Buffer<EventWrapper>>,
+    eventName: ChromiumBidi.EventNames,
+    contextId: BrowsingContext.BrowsingContext | null,
+    channel: string | null
+  ): EventWrapper[] {
+    const buffer = buffers.get(contextId);
+    if (buffer === undefined) {
+      return [];
+    }
+    const lastSentMessageId =
+      this.#lastMessageSent.get(eventName)?.get(contextId)?.get(channel) ??
+      -Infinity;
+    const result: EventWrapper[] = [];
+    for (const wrapper of buffer) {
+      if (wrapper.id > lastSentMessageId) {
+        result.push(wrapper);
+      }
+    }
+    return result;
+  }
+
+  /**
+   * Drops the buffered events and the sent event ids of the given context.
+   * Called when the context is destroyed, as its events are never sent again.
+   */
+  clearBufferedEvents(contextId: BrowsingContext.BrowsingContext) {
+    for (const buffers of this.#eventBuffers.values()) {
+      for (const eventWrapper of buffers.get(contextId) ?? []) {
+        this.#unbufferEvent(eventWrapper);
+      }
+      buffers.delete(contextId);
+    }
+    for (const lastSent of this.#lastMessageSent.values()) {
+      lastSent.delete(contextId);
+    }
+  }
+
+  /** Returns the occupancy of the event buffers. */
+  getBufferStats(): EventBufferStats {
+    const contexts = new Set<BrowsingContext.BrowsingContext>();
+    for (const buffers of this.#eventBuffers.values()) {
+      for (const [contextId, buffer] of buffers) {
+        if (contextId !== null && buffer.length > 0) {
+          contexts.add(contextId);
+        }
+      }
+    }
+    return {
+      events: this.#bufferedEvents.size,
+      size: this.#bufferedEventsSize,
+      maxSize: this.#maxBufferedEventsSize,
+      contexts: contexts.size,
+    };
+  }
 }
@@ -399,6 +399,157 @@ describe('SubscriptionManager', () => {
     });
   });
 
+  describe('with cdp events', () => {
+    const CDP_EVENT = 'cdp.Runtime.consoleAPICalled' as ChromiumBidi.EventNames;
+
+    it('should send specific cdp event when subscribed to the module', () => {
+      subscriptionManager.subscribe(
+        ChromiumBidi.BiDiModule.Cdp,
+        null,
+        SOME_CHANNEL
+      );
+      subscriptionManager.subscribe(CDP_EVENT, SOME_CONTEXT, ANOTHER_CHANNEL);
+
+      expect(
+        subscriptionManager.getChannelsSubscribedToEvent(
+          CDP_EVENT,
+          SOME_NESTED_CONTEXT
+        )
+      ).to.deep.equal([SOME_CHANNEL, ANOTHER_CHANNEL]);
+      expect(
+        subscriptionManager.getChannelsSubscribedToEvent(
+          CDP_EVENT,
+          ANOTHER_CONTEXT
+        )
+      ).to.deep.equal([SOME_CHANNEL]);
+      expect(
+        subscriptionManager.getChannelsSubscribedToEvent(
+          'cdp.Page.loadEventFired' as ChromiumBidi.EventNames,
+          SOME_CONTEXT
+        )
+      ).to.deep.equal([SOME_CHANNEL]);
+    });
+  });
+
+  describe('isSubscribedTo', () => {
+    const NETWORK_EVENT = ChromiumBidi.Network.EventNames.ResponseCompleted;
+
+    it('should check the module by its events', () => {
+      subscriptionManager.subscribe(NETWORK_EVENT, SOME_CONTEXT, SOME_CHANNEL);
+
+      expect(
+        subscriptionManager.isSubscribedTo(
+          ChromiumBidi.BiDiModule.Network,
+          SOME_NESTED_CONTEXT
+        )
+      ).to.be.true;
+      expect(
+        subscriptionManager.isSubscribedTo(NETWORK_EVENT, SOME_CONTEXT)
+      ).to.be.true;
+      expect(
+        subscriptionManager.isSubscribedTo(
+          ChromiumBidi.BiDiModule.Network,
+          ANOTHER_CONTEXT
+        )
+      ).to.be.false;
+      expect(
+        subscriptionManager.isSubscribedTo(
+          ChromiumBidi.BiDiModule.Log,
+          SOME_CONTEXT
+        )
+      ).to.be.false;
+    });
+
+    it('should take global subscriptions into account', () => {
+      subscriptionManager.subscribe(
+        ChromiumBidi.BiDiModule.Network,
+        null,
+        SOME_CHANNEL
+      );
+
+      expect(
+        subscriptionManager.isSubscribedTo(
+          ChromiumBidi.BiDiModule.Network,
+          ANOTHER_NESTED_CONTEXT
+        )
+      ).to.be.true;
+    });
+  });
+
+  describe('lookup table', () => {
+    const CHANNEL_COUNT = 50;
+    const CONTEXT_COUNT = 200;
+    const LOOKUP_COUNT = 1_000_000;
+
+    const channels = Array.from(
+      {length: CHANNEL_COUNT},
+      (_, i) => `channel-${i}`
+    );
+    const contexts = Array.from(
+      {length: CONTEXT_COUNT},
+      (_, i) => `context-${i}`
+    );
+
+    beforeEach(() => {
+      const browsingContextStorage: BrowsingContextStorage =
+        sinon.createStubInstance(BrowsingContextStorage);
+      // All the contexts are top-level.
+      browsingContextStorage.findTopLevelContextId = (contextId) => contextId;
+      subscriptionManager = new SubscriptionManager(browsingContextStorage);
+
+      // Even channels subscribe globally, odd ones to every context.
+      for (const [i, channel] of channels.entries()) {
+        for (const contextId of i % 2 === 0 ? [null] : contexts) {
+          subscriptionManager.subscribe(
+            ChromiumBidi.BiDiModule.Log,
+            contextId,
+            channel
+          );
+        }
+      }
+    });
+
+    it('should return the same sorted channels for every event', () => {
+      const first = subscriptionManager.getChannelsSubscribedToEvent(
+        ChromiumBidi.Log.EventNames.LogEntryAdded,
+        contexts[0]!
+      );
+      expect(first).to.deep.equal(channels);
+      expect(
+        subscriptionManager.getChannelsSubscribedToEvent(
+          ChromiumBidi.Log.EventNames.LogEntryAdded,
+          contexts[0]!
+        )
+      ).to.equal(first);
+    });
+
+    it('should be rebuilt on unsubscribe', () => {
+      subscriptionManager.unsubscribe(
+        ChromiumBidi.Log.EventNames.LogEntryAdded,
+        null,
+        channels[0]!
+      );
+
+      expect(
+        subscriptionManager.getChannelsSubscribedToEvent(
+          ChromiumBidi.Log.EventNames.LogEntryAdded,
+          contexts[0]!
+        )
+      ).to.deep.equal(channels.slice(1));
+    });
+
+    it(`benchmark: ${LOOKUP_COUNT} lookups with ${CHANNEL_COUNT} channels x ${CONTEXT_COUNT} contexts`, () => {
+      let count = 0;
+      for (let i = 0; i < LOOKUP_COUNT; i++) {
+        count += subscriptionManager.getChannelsSubscribedToEvent(
+          ChromiumBidi.Log.EventNames.LogEntryAdded,
+          contexts[i % CONTEXT_COUNT]!
+        ).length;
+      }
+      expect(count).to.equal(LOOKUP_COUNT * CHANNEL_COUNT);
+    });
+  });
+
   describe('cartesian product', () => {
     it('should return empty array for empty array', () => {
       expect(cartesianProduct([], [])).to.deep.equal([]);
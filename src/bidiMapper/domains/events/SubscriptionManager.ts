@@ -70,6 +70,18 @@ export function unrollEvents(
   return [...allEvents.values()];
 }
 
+/**
+ * Maps event name -> top-level context to the channels subscribed to the event
+ * in that context, sorted by subscription priority. Context entries include the
+ * global subscriptions, and the `null` entry has only the global ones.
+ */
+type ChannelsIndex = Map<
+  string,
+  Map<BrowsingContext.BrowsingContext | null, readonly (string | null)[]>
+>;
+
+const NO_CHANNELS: readonly (string | null)[] = Object.freeze([]);
+
 export class SubscriptionManager {
   #subscriptionPriority = 0;
   // BrowsingContext `null` means the event has subscription across all the
@@ -82,6 +94,11 @@ export class SubscriptionManager {
       Map<ChromiumBidi.EventNames, number>
     >
   >();
+  /**
+   * Precomputed lookup table for `getChannelsSubscribedToEvent`. Reset on any
+   * subscription change and rebuilt on the next lookup.
+   */
+  #channelsIndex: ChannelsIndex | null = null;
   #browsingContextStorage: BrowsingContextStorage;
 
   constructor(browsingContextStorage: BrowsingContextStorage) {
@@ -91,76 +108,135 @@ export class SubscriptionManager {
   getChannelsSubscribedToEvent(
     eventMethod: ChromiumBidi.EventNames,
     contextId: BrowsingContext.BrowsingContext | null
-  ): (string | null)[] {
-    const prioritiesAndChannels = Array.from(
-      this.#channelToContextToEventMap.keys()
-    )
-      .map((channel) => ({
-        priority: this.#getEventSubscriptionPriorityForChannel(
-          eventMethod,
-          contextId,
-          channel
-        ),
-        channel,
-      }))
-      .filter(({priority}) => priority !== null) as {
-      priority: number;
-      channel: string | null;
-    }[];
-
-    // Sort channels by priority.
-    return prioritiesAndChannels
-      .sort((a, b) => a.priority - b.priority)
-      .map(({channel}) => channel);
+  ): readonly (string | null)[] {
+    const index = this.#getChannelsIndex();
+    // For CDP we can't provide specific event name when subscribing to the
+    // module directly, so the `cdp` entry covers all the other CDP events.
+    const contextToChannels =
+      index.get(eventMethod) ??
+      (isCdpEvent(eventMethod)
+        ? index.get(ChromiumBidi.BiDiModule.Cdp)
+        : undefined);
+    if (contextToChannels === undefined) {
+      return NO_CHANNELS;
+    }
+    const maybeTopLevelContextId =
+      this.#browsingContextStorage.findTopLevelContextId(contextId);
+    return (
+      contextToChannels.get(maybeTopLevelContextId) ??
+      // `null` covers global subscription.
+      contextToChannels.get(null) ??
+      NO_CHANNELS
+    );
   }
 
-  #getEventSubscriptionPriorityForChannel(
-    eventMethod: ChromiumBidi.EventNames,
-    contextId: BrowsingContext.BrowsingContext | null,
-    channel: string | null
-  ): null | number {
-    const contextToEventMap = this.#channelToContextToEventMap.get(channel);
-    if (contextToEventMap === undefined) {
-      return null;
+  /**
+   * Returns true if any channel is subscribed to the given event, or to any
+   * event of the given module, in the given context.
+   */
+  isSubscribedTo(
+    moduleOrEvent: ChromiumBidi.EventNames,
+    contextId: BrowsingContext.BrowsingContext | null
+  ): boolean {
+    return unrollEvents([moduleOrEvent]).some(
+      (eventName) =>
+        this.getChannelsSubscribedToEvent(eventName, contextId).length > 0
+    );
+  }
+
+  #getChannelsIndex(): ChannelsIndex {
+    if (this.#channelsIndex === null) {
+      this.#channelsIndex = this.#buildChannelsIndex();
     }
+    return this.#channelsIndex;
+  }
 
-    const maybeTopLevelContextId =
-      this.#browsingContextStorage.findTopLevelContextId(contextId);
+  #buildChannelsIndex(): ChannelsIndex {
+    // Maps event -> context -> channel to the minimal subscription priority.
+    const priorities = new Map<
+      string,
+      Map<BrowsingContext.BrowsingContext | null, Map<string | null, number>>
+    >();
+    const addPriority = (
+      event: string,
+      contextId: BrowsingContext.BrowsingContext | null,
+      channel: string | null,
+      priority: number
+    ) => {
+      let contextToChannels = priorities.get(event);
+      if (contextToChannels === undefined) {
+        contextToChannels = new Map();
+        priorities.set(event, contextToChannels);
+      }
+      let channels = contextToChannels.get(contextId);
+      if (channels === undefined) {
+        channels = new Map();
+        contextToChannels.set(contextId, channels);
+      }
+      channels.set(
+        channel,
+        Math.min(channels.get(channel) ?? Infinity, priority)
+      );
+    };
 
-    // `null` covers global subscription.
-    const relevantContexts = [...new Set([null, maybeTopLevelContextId])];
-
-    // Get all the subscription priorities.
-    const priorities: number[] = relevantContexts
-      .map((context) => {
-        // Get the priority for exact event name
-        const priority = contextToEventMap.get(context)?.get(eventMethod);
-        // For CDP we can't provide specific event name when subscribing
-        // to the module directly.
-        // Because of that we need to see event `cdp` exits in the map.
-        if (isCdpEvent(eventMethod)) {
-          const cdpPriority = contextToEventMap
-            .get(context)
-            ?.get(ChromiumBidi.BiDiModule.Cdp);
-          // If we subscribe to the event directly and `cdp` module as well
-          // priority will be different we take minimal priority
-          return priority && cdpPriority
-            ? Math.min(priority, cdpPriority)
-            : // At this point we know that we have subscribed
-              // to only one of the two
-              priority ?? cdpPriority;
+    const subscriptions = this.#channelToContextToEventMap;
+    for (const [channel, contextToEventMap] of subscriptions) {
+      for (const [contextId, eventMap] of contextToEventMap) {
+        for (const [event, priority] of eventMap) {
+          addPriority(event, contextId, channel, priority);
         }
-        return priority;
-      })
-      .filter((p) => p !== undefined) as number[];
+      }
+    }
 
-    if (priorities.length === 0) {
-      // Not subscribed, return null.
-      return null;
+    // Specific CDP events are also covered by the `cdp` module subscriptions.
+    const cdpModule = priorities.get(ChromiumBidi.BiDiModule.Cdp);
+    if (cdpModule !== undefined) {
+      for (const event of priorities.keys()) {
+        if (event === ChromiumBidi.BiDiModule.Cdp || !isCdpEvent(event)) {
+          continue;
+        }
+        for (const [contextId, channels] of cdpModule) {
+          for (const [channel, priority] of channels) {
+            addPriority(event, contextId, channel, priority);
+          }
+        }
+      }
     }
 
-    // Return minimal priority.
-    return Math.min(...priorities);
+    const index: ChannelsIndex = new Map();
+    for (const [event, contextToChannels] of priorities) {
+      // Context subscriptions are merged with the global ones.
+      const globalChannels = contextToChannels.get(null);
+      if (globalChannels !== undefined) {
+        for (const [contextId, channels] of contextToChannels) {
+          if (contextId === null) {
+            continue;
+          }
+          for (const [channel, priority] of globalChannels) {
+            channels.set(
+              channel,
+              Math.min(channels.get(channel) ?? Infinity, priority)
+            );
+          }
+        }
+      }
+
+      // Sort channels by priority.
+      const sortedChannels = new Map<
+        BrowsingContext.BrowsingContext | null,
+        (string | null)[]
+      >();
+      for (const [contextId, channels] of contextToChannels) {
+        sortedChannels.set(
+          contextId,
+          Array.from(channels.keys()).sort(
+            (a, b) => channels.get(a)! - channels.get(b)!
+          )
+        );
+      }
+      index.set(event, sortedChannels);
+    }
+    return index;
   }
 
   subscribe(
@@ -213,6 +289,7 @@ export class SubscriptionManager {
     }
 
     eventMap.set(event, this.#subscriptionPriority++);
+    this.#channelsIndex = null;
   }
 
   /**
@@ -292,10 +369,11 @@ export class SubscriptionManager {
 
     return () => {
       eventMap.delete(event);
+      this.#channelsIndex = null;
 
       // Clean up maps if empty.
       if (eventMap.size === 0) {
-        contextToEventMap.delete(event);
+        contextToEventMap.delete(contextId);
       }
       if (contextToEventMap.size === 0) {
         this.#channelToContextToEventMap.delete(channel);
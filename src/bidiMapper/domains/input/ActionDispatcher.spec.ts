@@ -0,0 +1,60 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import * as chai from 'chai';
+import {expect} from 'chai';
+import chaiAsPromised from 'chai-as-promised';
+import sinon from 'sinon';
+
+import type {BrowsingContextImpl} from '../context/BrowsingContextImpl.js';
+
+import {ActionDispatcher} from './ActionDispatcher.js';
+import {SourceType} from './InputSource.js';
+import {InputState} from './InputState.js';
+
+chai.use(chaiAsPromised);
+
+const KEYBOARD = 'KEYBOARD';
+
+describe('ActionDispatcher', () => {
+  it('stops at the tick whose input command fails', async () => {
+    const inputState = new InputState();
+    const keySource = inputState.getOrCreate(KEYBOARD, SourceType.Key);
+    const sendCommand = sinon.stub().resolves({});
+    sendCommand.onSecondCall().rejects(new Error('Input failed'));
+    const context = {
+      cdpTarget: {cdpClient: {sendCommand}},
+    } as unknown as BrowsingContextImpl;
+    const actionDispatcher = new ActionDispatcher(inputState, context, false);
+
+    await expect(
+      actionDispatcher.dispatchActions([
+        [{id: KEYBOARD, action: {type: 'keyDown', value: 'a'}}],
+        [{id: KEYBOARD, action: {type: 'keyDown', value: 'b'}}],
+        [{id: KEYBOARD, action: {type: 'keyDown', value: 'c'}}],
+      ])
+    ).to.be.rejectedWith('Input failed');
+
+    // The tick after the failed one is not dispatched, and the failed action
+    // leaves no trace in the input state.
+    sinon.assert.calledTwice(sendCommand);
+    expect([...keySource.pressed]).to.deep.equal(['a']);
+    expect(inputState.cancelList).to.deep.equal([
+      {id: KEYBOARD, action: {type: 'keyUp', value: 'a'}},
+    ]);
+  });
+});
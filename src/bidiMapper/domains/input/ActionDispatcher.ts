@@ -15,6 +15,8 @@
  * limitations under the License.
  */
 
+import type {ProtocolMapping} from 'devtools-protocol/types/protocol-mapping.js';
+
 import {
   Input,
   InvalidArgumentException,
@@ -24,6 +26,7 @@ import {
 } from '../../../protocol/protocol.js';
 import {assert} from '../../../utils/assert.js';
 import type {BrowsingContextImpl} from '../context/BrowsingContextImpl.js';
+import type {Realm} from '../script/Realm.js';
 
 import type {ActionOption} from './ActionOption.js';
 import {
@@ -49,6 +52,26 @@ const IS_MAC_DECL = (() => {
   return navigator.platform.toLowerCase().includes('mac');
 }).toString();
 
+/**
+ * Whether the platform is macOS, by the default realm it was read from. A
+ * navigation creates a new default realm, so the value is read again.
+ */
+const isMacOSByRealm = new WeakMap<Realm, Promise<boolean>>();
+
+async function readIsMacOS(realm: Realm) {
+  const result = await realm.callFunction(
+    IS_MAC_DECL,
+    {type: 'undefined'},
+    [],
+    false,
+    Script.ResultOwnership.None,
+    {}
+  );
+  assert(result.type !== 'exception');
+  assert(result.result.type === 'boolean');
+  return result.result.value;
+}
+
 async function getElementCenter(
   context: BrowsingContextImpl,
   element: Script.SharedReference
@@ -78,21 +101,23 @@ async function getElementCenter(
   return {x: x as number, y: y as number};
 }
 
+type PendingCommands = {
+  commands: Promise<unknown>[];
+  /** Whether any of the commands has failed already. */
+  failed: boolean;
+};
+
 export class ActionDispatcher {
   static isMacOS = async (context: BrowsingContextImpl) => {
-    const result = await (
-      await context.getOrCreateSandbox(undefined)
-    ).callFunction(
-      IS_MAC_DECL,
-      {type: 'undefined'},
-      [],
-      false,
-      Script.ResultOwnership.None,
-      {}
-    );
-    assert(result.type !== 'exception');
-    assert(result.result.type === 'boolean');
-    return result.result.value;
+    const realm = await context.getOrCreateSandbox(undefined);
+    let isMacOS = isMacOSByRealm.get(realm);
+    if (isMacOS === undefined) {
+      isMacOS = readIsMacOS(realm);
+      isMacOSByRealm.set(realm, isMacOS);
+      // Don't keep the failure, so that the next call reads it again.
+      isMacOS.catch(() => isMacOSByRealm.delete(realm));
+    }
+    return await isMacOS;
   };
 
   #tickStart = 0;
@@ -100,6 +125,8 @@ export class ActionDispatcher {
   #inputState: InputState;
   #context: BrowsingContextImpl;
   #isMacOS: boolean;
+  /** Input commands sent to CDP whose responses are not yet awaited. */
+  #pendingCommands: PendingCommands = {commands: [], failed: false};
   constructor(
     inputState: InputState,
     context: BrowsingContextImpl,
@@ -114,14 +141,29 @@ export class ActionDispatcher {
     optionsByTick: readonly (readonly Readonly<ActionOption>[])[]
   ) {
     await this.#inputState.queue.run(async () => {
+      // CDP is serial, so a tick can be dispatched as soon as the input state
+      // of the previous tick is updated. The responses of all the input
+      // commands are awaited once at the end, or as soon as one of them is
+      // known to have failed, so that no more ticks are dispatched.
       for (const options of optionsByTick) {
-        await this.dispatchTickActions(options);
+        if (this.#pendingCommands.failed) {
+          break;
+        }
+        await this.#dispatchTickActions(options);
       }
+      await this.#flushCommands();
     });
   }
 
   async dispatchTickActions(
     options: readonly Readonly<ActionOption>[]
+  ): Promise<void> {
+    await this.#dispatchTickActions(options);
+    await this.#flushCommands();
+  }
+
+  async #dispatchTickActions(
+    options: readonly Readonly<ActionOption>[]
   ): Promise<void> {
     this.#tickStart = performance.now();
     this.#tickDuration = 0;
@@ -130,9 +172,12 @@ export class ActionDispatcher {
         this.#tickDuration = Math.max(this.#tickDuration, action.duration);
       }
     }
-    const promises: Promise<void>[] = [
-      new Promise((resolve) => setTimeout(resolve, this.#tickDuration)),
-    ];
+    const promises: Promise<void>[] = [];
+    if (this.#tickDuration > 0) {
+      promises.push(
+        new Promise((resolve) => setTimeout(resolve, this.#tickDuration))
+      );
+    }
     for (const option of options) {
       // In theory we have to wait for each action to happen, but CDP is serial,
       // so as an optimization, we queue all CDP commands at once and await all
@@ -142,14 +187,49 @@ export class ActionDispatcher {
     await Promise.all(promises);
   }
 
+  /**
+   * Sends the given input command without waiting for its response. Later
+   * input commands are handled by CDP after this one, but not the element
+   * center lookups, which are handled by the renderer.
+   */
+  #dispatchCommand<CdpMethod extends keyof ProtocolMapping.Commands>(
+    method: CdpMethod,
+    params?: ProtocolMapping.Commands[CdpMethod]['paramsType'][0]
+  ): Promise<unknown> {
+    const promise = this.#context.cdpTarget.cdpClient.sendCommand(
+      method,
+      params
+    );
+    const pendingCommands = this.#pendingCommands;
+    // The rejection is reported by `#flushCommands`.
+    promise.catch(() => {
+      pendingCommands.failed = true;
+    });
+    pendingCommands.commands.push(promise);
+    return promise;
+  }
+
+  /**
+   * Waits for the responses of the commands sent so far. Throws if any of them
+   * failed.
+   */
+  async #flushCommands() {
+    const {commands} = this.#pendingCommands;
+    this.#pendingCommands = {commands: [], failed: false};
+    await Promise.all(commands);
+  }
+
   async #dispatchAction({id, action}: Readonly<ActionOption>) {
     const source = this.#inputState.get(id);
     const keyState = this.#inputState.getGlobalKeyState();
     switch (action.type) {
       case 'keyDown': {
         // SAFETY: The source is validated before.
-        await this.#dispatchKeyDownAction(source as KeySource, action);
-        this.#inputState.cancelList.push({
+        const command = this.#dispatchKeyDownAction(
+          source as KeySource,
+          action
+        );
+        this.#pushCancelAction(command, {
           id,
           action: {
             ...action,
@@ -160,7 +240,7 @@ export class ActionDispatcher {
       }
       case 'keyUp': {
         // SAFETY: The source is validated before.
-        await this.#dispatchKeyUpAction(source as KeySource, action);
+        this.#dispatchKeyUpAction(source as KeySource, action);
         break;
       }
       case 'pause': {
@@ -169,12 +249,12 @@ export class ActionDispatcher {
       }
       case 'pointerDown': {
         // SAFETY: The source is validated before.
-        await this.#dispatchPointerDownAction(
+        const command = this.#dispatchPointerDownAction(
           source as PointerSource,
           keyState,
           action
         );
-        this.#inputState.cancelList.push({
+        this.#pushCancelAction(command, {
           id,
           action: {
             ...action,
@@ -194,7 +274,7 @@ export class ActionDispatcher {
       }
       case 'pointerUp': {
         // SAFETY: The source is validated before.
-        await this.#dispatchPointerUpAction(
+        this.#dispatchPointerUpAction(
           source as PointerSource,
           keyState,
           action
@@ -213,14 +293,32 @@ export class ActionDispatcher {
     }
   }
 
+  /**
+   * Adds the action releasing the pressed key or button to the cancel list,
+   * and removes it again if the command pressing it fails.
+   */
+  #pushCancelAction(
+    command: Promise<unknown> | undefined,
+    cancelAction: ActionOption
+  ) {
+    const {cancelList} = this.#inputState;
+    cancelList.push(cancelAction);
+    command?.catch(() => {
+      const index = cancelList.indexOf(cancelAction);
+      if (index !== -1) {
+        cancelList.splice(index, 1);
+      }
+    });
+  }
+
   #dispatchPointerDownAction(
     source: PointerSource,
     keyState: KeySource,
     action: Readonly<Input.PointerDownAction>
-  ) {
+  ): Promise<unknown> | undefined {
     const {button} = action;
     if (source.pressed.has(button)) {
-      return;
+      return undefined;
     }
     source.pressed.add(button);
     const {x, y, subtype: pointerType} = source;
@@ -229,54 +327,53 @@ export class ActionDispatcher {
 
     // --- Platform-specific code begins here ---
     const {modifiers} = keyState;
+    let command: Promise<unknown> | undefined;
     switch (pointerType) {
       case Input.PointerType.Mouse:
       case Input.PointerType.Pen:
         // TODO: Implement width and height when available.
-        return this.#context.cdpTarget.cdpClient.sendCommand(
-          'Input.dispatchMouseEvent',
-          {
-            type: 'mousePressed',
-            x,
-            y,
-            modifiers,
-            button: getCdpButton(button),
-            buttons: source.buttons,
-            clickCount: source.setClickCount(
-              button,
-              new PointerSource.ClickContext(x, y, performance.now())
-            ),
-            pointerType,
-            tangentialPressure,
-            tiltX,
-            tiltY,
-            twist,
-            force: pressure,
-          }
-        );
+        command = this.#dispatchCommand('Input.dispatchMouseEvent', {
+          type: 'mousePressed',
+          x,
+          y,
+          modifiers,
+          button: getCdpButton(button),
+          buttons: source.buttons,
+          clickCount: source.setClickCount(
+            button,
+            new PointerSource.ClickContext(x, y, performance.now())
+          ),
+          pointerType,
+          tangentialPressure,
+          tiltX,
+          tiltY,
+          twist,
+          force: pressure,
+        });
+        break;
       case Input.PointerType.Touch:
-        return this.#context.cdpTarget.cdpClient.sendCommand(
-          'Input.dispatchTouchEvent',
-          {
-            type: 'touchStart',
-            touchPoints: [
-              {
-                x,
-                y,
-                ...getRadii(width ?? 1, height ?? 1),
-                tangentialPressure,
-                tiltX,
-                tiltY,
-                twist,
-                force: pressure,
-                id: source.pointerId,
-              },
-            ],
-            modifiers,
-          }
-        );
+        command = this.#dispatchCommand('Input.dispatchTouchEvent', {
+          type: 'touchStart',
+          touchPoints: [
+            {
+              x,
+              y,
+              ...getRadii(width ?? 1, height ?? 1),
+              tangentialPressure,
+              tiltX,
+              tiltY,
+              twist,
+              force: pressure,
+              id: source.pointerId,
+            },
+          ],
+          modifiers,
+        });
+        break;
     }
     // --- Platform-specific code ends here ---
+    command?.catch(() => source.pressed.delete(button));
+    return command;
   }
 
   #dispatchPointerUpAction(
@@ -293,40 +390,38 @@ export class ActionDispatcher {
 
     // --- Platform-specific code begins here ---
     const {modifiers} = keyState;
+    let command: Promise<unknown> | undefined;
     switch (pointerType) {
       case Input.PointerType.Mouse:
       case Input.PointerType.Pen:
         // TODO: Implement width and height when available.
-        return this.#context.cdpTarget.cdpClient.sendCommand(
-          'Input.dispatchMouseEvent',
-          {
-            type: 'mouseReleased',
-            x,
-            y,
-            modifiers,
-            button: getCdpButton(button),
-            buttons: source.buttons,
-            clickCount: source.getClickCount(button),
-            pointerType,
-          }
-        );
+        command = this.#dispatchCommand('Input.dispatchMouseEvent', {
+          type: 'mouseReleased',
+          x,
+          y,
+          modifiers,
+          button: getCdpButton(button),
+          buttons: source.buttons,
+          clickCount: source.getClickCount(button),
+          pointerType,
+        });
+        break;
       case Input.PointerType.Touch:
-        return this.#context.cdpTarget.cdpClient.sendCommand(
-          'Input.dispatchTouchEvent',
-          {
-            type: 'touchEnd',
-            touchPoints: [
-              {
-                x,
-                y,
-                id: source.pointerId,
-              },
-            ],
-            modifiers,
-          }
-        );
+        command = this.#dispatchCommand('Input.dispatchTouchEvent', {
+          type: 'touchEnd',
+          touchPoints: [
+            {
+              x,
+              y,
+              id: source.pointerId,
+            },
+          ],
+          modifiers,
+        });
+        break;
     }
     // --- Platform-specific code ends here ---
+    command?.catch(() => source.pressed.add(button));
   }
 
   async #dispatchPointerMoveAction(
@@ -379,14 +474,32 @@ export class ActionDispatcher {
       }
 
       if (source.x !== x || source.y !== y) {
+        let command: Promise<unknown> | undefined;
         // --- Platform-specific code begins here ---
         const {modifiers} = keyState;
         switch (pointerType) {
           case Input.PointerType.Mouse:
             // TODO: Implement width and height when available.
-            await this.#context.cdpTarget.cdpClient.sendCommand(
-              'Input.dispatchMouseEvent',
-              {
+            command = this.#dispatchCommand('Input.dispatchMouseEvent', {
+              type: 'mouseMoved',
+              x,
+              y,
+              modifiers,
+              clickCount: 0,
+              button: getCdpButton(source.pressed.values().next().value ?? 5),
+              buttons: source.buttons,
+              pointerType,
+              tangentialPressure,
+              tiltX,
+              tiltY,
+              twist,
+              force: pressure,
+            });
+            break;
+          case Input.PointerType.Pen:
+            if (source.pressed.size !== 0) {
+              // TODO: Implement width and height when available.
+              command = this.#dispatchCommand('Input.dispatchMouseEvent', {
                 type: 'mouseMoved',
                 x,
                 y,
@@ -400,56 +513,28 @@ export class ActionDispatcher {
                 tiltY,
                 twist,
                 force: pressure,
-              }
-            );
-            break;
-          case Input.PointerType.Pen:
-            if (source.pressed.size !== 0) {
-              // TODO: Implement width and height when available.
-              await this.#context.cdpTarget.cdpClient.sendCommand(
-                'Input.dispatchMouseEvent',
-                {
-                  type: 'mouseMoved',
-                  x,
-                  y,
-                  modifiers,
-                  clickCount: 0,
-                  button: getCdpButton(
-                    source.pressed.values().next().value ?? 5
-                  ),
-                  buttons: source.buttons,
-                  pointerType,
-                  tangentialPressure,
-                  tiltX,
-                  tiltY,
-                  twist,
-                  force: pressure,
-                }
-              );
+              });
             }
             break;
           case Input.PointerType.Touch:
             if (source.pressed.size !== 0) {
-              await this.#context.cdpTarget.cdpClient.sendCommand(
-                'Input.dispatchTouchEvent',
-                {
-                  type: 'touchMove',
-                  touchPoints: [
-                    {
-                      x,
-                      y,
-                      ...getRadii(width ?? 1, height ?? 1),
-                      tangentialPressure,
-                      tiltX,
-                      tiltY,
-                      twist,
-                      force: pressure,
-                      id: source.pointerId,
-                    },
-                  ],
-                  modifiers,
-                }
-              );
+              command = this.#dispatchCommand('Input.dispatchTouchEvent', {
+                type: 'touchMove',
+                touchPoints: [
+                  {
+                    x,
+                    y,
+                    ...getRadii(width ?? 1, height ?? 1),
+                    tangentialPressure,
+                    tiltX,
+                    tiltY,
+                    twist,
+                    force: pressure,
+                    id: source.pointerId,
+                  },
+                ],
+                modifiers,
+              });
             }
             break;
         }
@@ -457,6 +542,10 @@ export class ActionDispatcher {
 
         source.x = x;
         source.y = y;
+        // Intermediate moves are paced by the browser handling each of them.
+        if (!last) {
+          await command;
+        }
       }
     } while (!last);
   }
@@ -480,6 +569,9 @@ export class ActionDispatcher {
         targetY = startY + offsetY;
         break;
       default: {
+        // The lookup is handled by the renderer, which may get it before the
+        // input commands sent so far.
+        await this.#flushCommands();
         const {x: posX, y: posY} = await getElementCenter(
           this.#context,
           origin.element
@@ -548,29 +640,29 @@ export class ActionDispatcher {
       if (deltaX !== 0 || deltaY !== 0) {
         // --- Platform-specific code begins here ---
         const {modifiers} = keyState;
-        await this.#context.cdpTarget.cdpClient.sendCommand(
-          'Input.dispatchMouseEvent',
-          {
-            type: 'mouseWheel',
-            deltaX,
-            deltaY,
-            x: targetX,
-            y: targetY,
-            modifiers,
-          }
-        );
+        const command = this.#dispatchCommand('Input.dispatchMouseEvent', {
+          type: 'mouseWheel',
+          deltaX,
+          deltaY,
+          x: targetX,
+          y: targetY,
+          modifiers,
+        });
         // --- Platform-specific code ends here ---
 
         currentDeltaX += deltaX;
         currentDeltaY += deltaY;
+        if (!last) {
+          await command;
+        }
       }
     } while (!last);
   }
 
-  async #dispatchKeyDownAction(
+  #dispatchKeyDownAction(
     source: KeySource,
     action: Readonly<Input.KeyDownAction>
-  ) {
+  ): Promise<unknown> {
     if ([...action.value].length > 1) {
       throw new InvalidArgumentException(`Invalid key value: ${action.value}`);
     }
@@ -579,20 +671,7 @@ export class ActionDispatcher {
     const repeat = source.pressed.has(key);
     const code = getKeyCode(rawKey);
     const location = getKeyLocation(rawKey);
-    switch (key) {
-      case 'Alt':
-        source.alt = true;
-        break;
-      case 'Shift':
-        source.shift = true;
-        break;
-      case 'Control':
-        source.ctrl = true;
-        break;
-      case 'Meta':
-        source.meta = true;
-        break;
-    }
+    setModifier(source, key, true);
     source.pressed.add(key);
     const {modifiers} = source;
 
@@ -626,35 +705,37 @@ export class ActionDispatcher {
         // Intentionally empty.
       }
     }
-    const promises = [
-      this.#context.cdpTarget.cdpClient.sendCommand('Input.dispatchKeyEvent', {
-        type: text ? 'keyDown' : 'rawKeyDown',
-        windowsVirtualKeyCode: KeyToKeyCode[key],
-        key,
-        code,
-        text,
-        unmodifiedText,
-        autoRepeat: repeat,
-        isSystemKey: source.alt || undefined,
-        location: location < 3 ? location : undefined,
-        isKeypad: location === 3,
-        modifiers,
-        commands: command ? [command] : undefined,
-      }),
-    ];
+    const keyDown = this.#dispatchCommand('Input.dispatchKeyEvent', {
+      type: text ? 'keyDown' : 'rawKeyDown',
+      windowsVirtualKeyCode: KeyToKeyCode[key],
+      key,
+      code,
+      text,
+      unmodifiedText,
+      autoRepeat: repeat,
+      isSystemKey: source.alt || undefined,
+      location: location < 3 ? location : undefined,
+      isKeypad: location === 3,
+      modifiers,
+      commands: command ? [command] : undefined,
+    });
     // Drag cancelling happens on escape.
     if (key === 'Escape') {
       if (
         !source.alt &&
         ((this.#isMacOS && !source.ctrl && !source.meta) || !this.#isMacOS)
       ) {
-        promises.push(
-          this.#context.cdpTarget.cdpClient.sendCommand('Input.cancelDragging')
-        );
+        this.#dispatchCommand('Input.cancelDragging');
       }
     }
-    await Promise.all(promises);
     // --- Platform-specific code ends here ---
+    if (!repeat) {
+      keyDown.catch(() => {
+        setModifier(source, key, false);
+        source.pressed.delete(key);
+      });
+    }
+    return keyDown;
   }
 
   #dispatchKeyUpAction(source: KeySource, action: Readonly<Input.KeyUpAction>) {
@@ -668,20 +749,7 @@ export class ActionDispatcher {
     }
     const code = getKeyCode(rawKey);
     const location = getKeyLocation(rawKey);
-    switch (key) {
-      case 'Alt':
-        source.alt = false;
-        break;
-      case 'Shift':
-        source.shift = false;
-        break;
-      case 'Control':
-        source.ctrl = false;
-        break;
-      case 'Meta':
-        source.meta = false;
-        break;
-    }
+    setModifier(source, key, false);
     source.pressed.delete(key);
     const {modifiers} = source;
 
@@ -690,22 +758,41 @@ export class ActionDispatcher {
     // to measure.
     const unmodifiedText = getKeyEventUnmodifiedText(key, source);
     const text = getKeyEventText(code ?? '', source) ?? unmodifiedText;
-    return this.#context.cdpTarget.cdpClient.sendCommand(
-      'Input.dispatchKeyEvent',
-      {
-        type: 'keyUp',
-        windowsVirtualKeyCode: KeyToKeyCode[key],
-        key,
-        code,
-        text,
-        unmodifiedText,
-        location: location < 3 ? location : undefined,
-        isSystemKey: source.alt || undefined,
-        isKeypad: location === 3,
-        modifiers,
-      }
-    );
+    const keyUp = this.#dispatchCommand('Input.dispatchKeyEvent', {
+      type: 'keyUp',
+      windowsVirtualKeyCode: KeyToKeyCode[key],
+      key,
+      code,
+      text,
+      unmodifiedText,
+      location: location < 3 ? location : undefined,
+      isSystemKey: source.alt || undefined,
+      isKeypad: location === 3,
+      modifiers,
+    });
     // --- Platform-specific code ends here ---
+    keyUp.catch(() => {
+      setModifier(source, key, true);
+      source.pressed.add(key);
+    });
+  }
+}
+
+/** Updates the modifier state of the source if the key is a modifier. */
+function setModifier(source: KeySource, key: string, pressed: boolean) {
+  switch (key) {
+    case 'Alt':
+      source.alt = pressed;
+      break;
+    case 'Shift':
+      source.shift = pressed;
+      break;
+    case 'Control':
+      source.ctrl = pressed;
+      break;
+    case 'Meta':
+      source.meta = pressed;
+      break;
   }
 }
 
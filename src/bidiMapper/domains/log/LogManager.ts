@@ -22,7 +22,40 @@ import type {EventManager} from '../events/EventManager.js';
 import type {Realm} from '../script/Realm.js';
 import type {RealmStorage} from '../script/RealmStorage.js';
 
-import {getRemoteValuesText} from './logHelper.js';
+import {
+  estimateRemoteObjectsSize,
+  getRemoteValueFromCdp,
+  getRemoteValuesText,
+} from './logHelper.js';
+
+/**
+ * Fixed part of the estimated size of a `log.entryAdded` event, covering its
+ * level, source, timestamp and type.
+ */
+const LOG_ENTRY_OVERHEAD = 200;
+/** Fixed part of the estimated size of a stack frame. */
+const STACK_FRAME_OVERHEAD = 50;
+
+/**
+ * Estimates the size of a `log.entryAdded` event from the CDP event it is
+ * created from, so that it is charged to the event buffer budget before it is
+ * created.
+ */
+function estimateLogEntrySize(
+  remoteObjects: Protocol.Runtime.RemoteObject[],
+  cdpStackTrace: Protocol.Runtime.StackTrace | undefined,
+  text = ''
+): number {
+  let size =
+    LOG_ENTRY_OVERHEAD + text.length + estimateRemoteObjectsSize(remoteObjects);
+  for (const callFrame of cdpStackTrace?.callFrames ?? []) {
+    size +=
+      STACK_FRAME_OVERHEAD +
+      callFrame.url.length +
+      callFrame.functionName.length;
+  }
+  return size;
+}
 
 /** Converts CDP StackTrace object to BiDi StackTrace object. */
 function getBidiStackTrace(
@@ -90,43 +123,37 @@ export class LogManager {
           cdpSessionId: this.#cdpTarget.cdpSessionId,
           executionContextId: params.executionContextId,
         });
-        const argsPromise: Promise<Script.RemoteValue[]> =
-          realm === undefined
-            ? Promise.resolve(params.args as Script.RemoteValue[])
-            : // Properly serialize arguments if possible.
-              Promise.all(
-                params.args.map((arg) => {
-                  return realm.serializeCdpObject(
-                    arg,
-                    Script.ResultOwnership.None
-                  );
-                })
-              );
-
-        this.#eventManager.registerPromiseEvent(
-          argsPromise.then((args) => ({
-            kind: 'success',
-            value: {
-              type: 'event',
-              method: ChromiumBidi.Log.EventNames.LogEntryAdded,
-              params: {
-                level: getLogLevel(params.type),
-                source: {
-                  realm: realm?.realmId ?? 'UNKNOWN',
-                  context: realm?.browsingContextId ?? 'UNKNOWN',
+        // Serializing the arguments requires CDP round trips, so it is done
+        // only when the event is sent. Objects are serialized in their state
+        // at that time, or reduced to their type if the realm is gone.
+        this.#eventManager.registerLazyEvent(
+          async () => {
+            const args = await LogManager.#serializeArgs(params.args, realm);
+            return {
+              kind: 'success',
+              value: {
+                type: 'event',
+                method: ChromiumBidi.Log.EventNames.LogEntryAdded,
+                params: {
+                  level: getLogLevel(params.type),
+                  source: {
+                    realm: realm?.realmId ?? 'UNKNOWN',
+                    context: realm?.browsingContextId ?? 'UNKNOWN',
+                  },
+                  text: getRemoteValuesText(args, true),
+                  timestamp: Math.round(params.timestamp),
+                  stackTrace: getBidiStackTrace(params.stackTrace),
+                  type: 'console',
+                  // Console method is `warn`, not `warning`.
+                  method: params.type === 'warning' ? 'warn' : params.type,
+                  args,
                 },
-                text: getRemoteValuesText(args, true),
-                timestamp: Math.round(params.timestamp),
-                stackTrace: getBidiStackTrace(params.stackTrace),
-                type: 'console',
-                // Console method is `warn`, not `warning`.
-                method: params.type === 'warning' ? 'warn' : params.type,
-                args,
               },
-            },
-          })),
+            };
+          },
           realm?.browsingContextId ?? 'UNKNOWN',
-          ChromiumBidi.Log.EventNames.LogEntryAdded
+          ChromiumBidi.Log.EventNames.LogEntryAdded,
+          estimateLogEntrySize(params.args, params.stackTrace)
         );
       }
     );
@@ -141,8 +168,8 @@ export class LogManager {
           executionContextId: params.exceptionDetails.executionContextId,
         });
 
-        this.#eventManager.registerPromiseEvent(
-          LogManager.#getExceptionText(params, realm).then((text) => ({
+        this.#eventManager.registerLazyEvent(
+          async () => ({
             kind: 'success',
             value: {
               type: 'event',
@@ -153,7 +180,7 @@ export class LogManager {
                   realm: realm?.realmId ?? 'UNKNOWN',
                   context: realm?.browsingContextId ?? 'UNKNOWN',
                 },
-                text,
+                text: await LogManager.#getExceptionText(params, realm),
                 timestamp: Math.round(params.timestamp),
                 stackTrace: getBidiStackTrace(
                   params.exceptionDetails.stackTrace
@@ -161,14 +188,44 @@ export class LogManager {
                 type: 'javascript',
               },
             },
-          })),
+          }),
           realm?.browsingContextId ?? 'UNKNOWN',
-          ChromiumBidi.Log.EventNames.LogEntryAdded
+          ChromiumBidi.Log.EventNames.LogEntryAdded,
+          estimateLogEntrySize(
+            params.exceptionDetails.exception === undefined
+              ? []
+              : [params.exceptionDetails.exception],
+            params.exceptionDetails.stackTrace,
+            params.exceptionDetails.text
+          )
         );
       }
     );
   }
 
+  /**
+   * Serializes the console arguments in the realm, if any. Falls back to
+   * converting the CDP values if the realm is gone by the time the event is
+   * sent, e.g. after a navigation.
+   */
+  static async #serializeArgs(
+    args: Protocol.Runtime.RemoteObject[],
+    realm?: Realm
+  ): Promise<Script.RemoteValue[]> {
+    if (realm !== undefined) {
+      try {
+        return await Promise.all(
+          args.map((arg) =>
+            realm.serializeCdpObject(arg, Script.ResultOwnership.None)
+          )
+        );
+      } catch {
+        // Convert the CDP values.
+      }
+    }
+    return args.map(getRemoteValueFromCdp);
+  }
+
   /**
    * Try the best to get the exception text.
    */
@@ -179,9 +236,13 @@ export class LogManager {
     if (!params.exceptionDetails.exception) {
       return params.exceptionDetails.text;
     }
-    if (realm === undefined) {
-      return JSON.stringify(params.exceptionDetails.exception);
+    if (realm !== undefined) {
+      try {
+        return await realm.stringifyObject(params.exceptionDetails.exception);
+      } catch {
+        // The realm is gone by the time the event is sent.
+      }
     }
-    return await realm.stringifyObject(params.exceptionDetails.exception);
+    return JSON.stringify(params.exceptionDetails.exception);
   }
 }
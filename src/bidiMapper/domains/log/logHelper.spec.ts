@@ -16,10 +16,16 @@
  */
 
 import {expect} from 'chai';
+import type {Protocol} from 'devtools-protocol';
 
 import type {Script} from '../../../protocol/protocol.js';
 
-import {getRemoteValuesText, logMessageFormatter} from './logHelper.js';
+import {
+  estimateRemoteObjectsSize,
+  getRemoteValueFromCdp,
+  getRemoteValuesText,
+  logMessageFormatter,
+} from './logHelper.js';
 
 const STRING_FORMAT_TEST_CASES = [
   {
@@ -400,4 +406,82 @@ describe('logHelper', () => {
       );
     });
   });
+
+  describe('getRemoteValueFromCdp', () => {
+    it('keeps primitive values', () => {
+      expect(
+        [
+          {type: 'undefined'},
+          {type: 'string', value: 'abc'},
+          {type: 'number', value: 1},
+          {type: 'number', unserializableValue: '-0'},
+          {type: 'boolean', value: true},
+          {type: 'bigint', unserializableValue: '42n'},
+          {type: 'object', subtype: 'null', value: null},
+        ].map((remoteObject) =>
+          getRemoteValueFromCdp(remoteObject as Protocol.Runtime.RemoteObject)
+        )
+      ).to.deep.equal([
+        {type: 'undefined'},
+        {type: 'string', value: 'abc'},
+        {type: 'number', value: 1},
+        {type: 'number', value: '-0'},
+        {type: 'boolean', value: true},
+        {type: 'bigint', value: '42'},
+        {type: 'null'},
+      ]);
+    });
+
+    it('reduces objects to their type', () => {
+      expect(
+        [
+          {type: 'object', subtype: 'array', objectId: '1'},
+          {type: 'object', subtype: 'regexp', description: '/a\\/b/gi'},
+          {type: 'object', subtype: 'date', description: 'Mon Jan 01 2024'},
+          {type: 'object', className: 'Object', objectId: '2'},
+          {type: 'function', objectId: '3'},
+        ].map((remoteObject) =>
+          getRemoteValueFromCdp(remoteObject as Protocol.Runtime.RemoteObject)
+        )
+      ).to.deep.equal([
+        {type: 'array'},
+        {type: 'regexp', value: {pattern: 'a\\/b', flags: 'gi'}},
+        {type: 'object'},
+        {type: 'object'},
+        {type: 'function'},
+      ]);
+    });
+
+    it('formats the converted values', () => {
+      const args = [
+        {type: 'string', value: '%s %o'},
+        {type: 'object', objectId: '1'},
+        {type: 'object', objectId: '2'},
+      ].map((remoteObject) =>
+        getRemoteValueFromCdp(remoteObject as Protocol.Runtime.RemoteObject)
+      );
+
+      expect(getRemoteValuesText(args, true)).to.equal('object {}');
+    });
+  });
+
+  describe('estimateRemoteObjectsSize', () => {
+    it('grows with the strings retained', () => {
+      const estimate = (value: string) =>
+        estimateRemoteObjectsSize([
+          {type: 'string', value},
+          {
+            type: 'object',
+            description: 'Object',
+            preview: {
+              type: 'object',
+              overflow: false,
+              properties: [{name: 'key', type: 'string', value}],
+            },
+          },
+        ]);
+
+      expect(estimate('a'.repeat(1001)) - estimate('a')).to.equal(2000);
+    });
+  });
 });
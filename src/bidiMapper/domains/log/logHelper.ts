@@ -15,6 +15,8 @@
  * limitations under the License.
  */
 
+import type {Protocol} from 'devtools-protocol';
+
 import type {Script} from '../../../protocol/protocol.js';
 import {assert} from '../../../utils/assert.js';
 
@@ -130,7 +132,7 @@ function toJson(arg: Script.RemoteValue): string {
   }
 
   if (arg.type === 'object') {
-    return `{${(arg.value as any[][])
+    return `{${((arg.value ?? []) as any[][])
       .map((pair) => {
         return `${JSON.stringify(pair[0])}:${toJson(pair[1])}`;
       })
@@ -200,3 +202,96 @@ export function getRemoteValuesText(
     })
     .join('\u0020');
 }
+
+/** CDP object subtypes which are BiDi remote value types as well. */
+const REMOTE_VALUE_SUBTYPES = new Set<string>([
+  'array',
+  'arraybuffer',
+  'error',
+  'generator',
+  'map',
+  'node',
+  'promise',
+  'proxy',
+  'set',
+  'typedarray',
+  'weakmap',
+  'weakset',
+]);
+
+/**
+ * Converts a CDP remote object to a BiDi remote value without its realm, e.g.
+ * when the realm is already destroyed. Primitive values are kept, other
+ * objects are reduced to their type.
+ */
+export function getRemoteValueFromCdp(
+  remoteObject: Protocol.Runtime.RemoteObject
+): Script.RemoteValue {
+  switch (remoteObject.type) {
+    case 'undefined':
+    case 'symbol':
+    case 'function':
+      return {type: remoteObject.type};
+    case 'string':
+      return {type: 'string', value: remoteObject.value};
+    case 'boolean':
+      return {type: 'boolean', value: remoteObject.value};
+    case 'number':
+      return {
+        type: 'number',
+        value: remoteObject.unserializableValue ?? remoteObject.value,
+      } as Script.NumberValue;
+    case 'bigint':
+      // CDP serializes BigInts with the `n` suffix.
+      return {
+        type: 'bigint',
+        value: remoteObject.unserializableValue?.replace(/n$/, '') ?? '0',
+      };
+  }
+
+  const {subtype, description} = remoteObject;
+  if (subtype === 'null') {
+    return {type: 'null'};
+  }
+  if (subtype === 'regexp' && description !== undefined) {
+    const flagsStart = description.lastIndexOf('/');
+    return {
+      type: 'regexp',
+      value: {
+        pattern: description.slice(1, flagsStart),
+        flags: description.slice(flagsStart + 1),
+      },
+    };
+  }
+  if (subtype !== undefined && REMOTE_VALUE_SUBTYPES.has(subtype)) {
+    return {type: subtype} as Script.RemoteValue;
+  }
+  return {type: 'object'};
+}
+
+/**
+ * Fixed part of the estimated size of a CDP remote object, covering its type,
+ * subtype, class name and object ID.
+ */
+const REMOTE_OBJECT_OVERHEAD = 100;
+
+/**
+ * Estimates the size retained by the CDP remote objects, in characters, from
+ * their string fields and previews. Cheap compared to serializing them.
+ */
+export function estimateRemoteObjectsSize(
+  remoteObjects: Protocol.Runtime.RemoteObject[]
+): number {
+  let size = 0;
+  for (const remoteObject of remoteObjects) {
+    size +=
+      REMOTE_OBJECT_OVERHEAD +
+      (typeof remoteObject.value === 'string' ? remoteObject.value.length : 0) +
+      (remoteObject.description?.length ?? 0) +
+      (remoteObject.unserializableValue?.length ?? 0);
+    for (const property of remoteObject.preview?.properties ?? []) {
+      size += property.name.length + (property.value?.length ?? 0);
+    }
+  }
+  return size;
+}
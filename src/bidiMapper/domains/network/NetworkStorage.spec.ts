@@ -14,6 +14,8 @@
  * See the License for the specific language governing permissions and
  * limitations under the License.
  */
+import {readFileSync} from 'fs';
+
 import {expect} from 'chai';
 
 import {Network} from '../../../protocol/protocol.js';
@@ -633,5 +635,23 @@ describe('NetworkStorage', () => {
         ).to.be.false;
       });
     });
+
+    describe('shared corpus', () => {
+      // The same corpus is checked against the Python matcher in
+      // `tests/tools/test_url_pattern.py`, so both implementations agree.
+      const corpus: {
+        pattern: Network.UrlPattern;
+        url: string;
+        match: boolean;
+      }[] = JSON.parse(
+        readFileSync('tests/tools/url_pattern_corpus.json', 'utf8')
+      );
+
+      for (const {pattern, url, match} of corpus) {
+        it(`${JSON.stringify(pattern)} ${match ? 'matches' : 'does not match'} ${url}`, () => {
+          expect(NetworkStorage.matchUrlPattern(pattern, url)).to.equal(match);
+        });
+      }
+    });
   });
 });
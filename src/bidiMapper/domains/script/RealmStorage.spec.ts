@@ -0,0 +1,104 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import {expect} from 'chai';
+import sinon from 'sinon';
+
+import type {Realm} from './Realm.js';
+import {RealmStorage} from './RealmStorage.js';
+
+function createRealm(
+  realmId: string,
+  browsingContextId: string,
+  executionContextId: number,
+  sessionId: string,
+  sandbox?: string
+): Realm {
+  return {
+    realmId,
+    browsingContextId,
+    executionContextId,
+    sandbox,
+    origin: 'http://localhost',
+    type: 'window',
+    cdpClient: {sessionId},
+    dispose: sinon.stub(),
+  } as unknown as Realm;
+}
+
+describe('RealmStorage', () => {
+  let realmStorage: RealmStorage;
+  let realm: Realm;
+  let sandbox: Realm;
+  let anotherRealm: Realm;
+
+  beforeEach(() => {
+    realmStorage = new RealmStorage();
+    realm = createRealm('realm', 'context', 1, 'session');
+    sandbox = createRealm('sandbox', 'context', 2, 'session', 'foo');
+    anotherRealm = createRealm('anotherRealm', 'anotherContext', 1, 'another');
+    realmStorage.addRealm(realm);
+    realmStorage.addRealm(sandbox);
+    realmStorage.addRealm(anotherRealm);
+  });
+
+  it('should find realms by indexed keys', () => {
+    expect(
+      realmStorage.findRealms({browsingContextId: 'context'})
+    ).to.deep.equal([realm, sandbox]);
+    expect(realmStorage.findRealms({executionContextId: 1})).to.deep.equal([
+      realm,
+      anotherRealm,
+    ]);
+    expect(
+      realmStorage.findRealm({cdpSessionId: 'another', executionContextId: 1})
+    ).to.equal(anotherRealm);
+    expect(realmStorage.findRealm({realmId: 'sandbox'})).to.equal(sandbox);
+  });
+
+  it('should combine indexed and not indexed keys', () => {
+    expect(
+      realmStorage.findRealms({browsingContextId: 'context', sandbox: 'foo'})
+    ).to.deep.equal([sandbox]);
+    expect(
+      realmStorage.findRealms({browsingContextId: 'unknown'})
+    ).to.deep.equal([]);
+    expect(realmStorage.findRealms({})).to.deep.equal([
+      realm,
+      sandbox,
+      anotherRealm,
+    ]);
+  });
+
+  it('should remove deleted realms from the indexes', () => {
+    realmStorage.knownHandlesToRealmMap.set('handle', 'realm');
+    realmStorage.knownHandlesToRealmMap.set('anotherHandle', 'anotherRealm');
+
+    realmStorage.deleteRealms({browsingContextId: 'context'});
+
+    sinon.assert.calledOnce(realm.dispose as sinon.SinonStub);
+    expect(realmStorage.findRealms({executionContextId: 1})).to.deep.equal([
+      anotherRealm,
+    ]);
+    expect(realmStorage.findRealms({cdpSessionId: 'session'})).to.deep.equal(
+      []
+    );
+    expect([...realmStorage.knownHandlesToRealmMap.keys()]).to.deep.equal([
+      'anotherHandle',
+    ]);
+  });
+});
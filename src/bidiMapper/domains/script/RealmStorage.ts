@@ -35,6 +35,75 @@ type RealmFilter = {
   cdpSessionId?: Protocol.Target.SessionID;
 };
 
+const EMPTY_SET: ReadonlySet<Realm> = new Set();
+
+function addToIndex<K>(index: Map<K, Set<Realm>>, key: K, realm: Realm) {
+  let realms = index.get(key);
+  if (realms === undefined) {
+    realms = new Set();
+    index.set(key, realms);
+  }
+  realms.add(realm);
+}
+
+function lookUpIndex<K>(
+  index: Map<K, Set<Realm>>,
+  key: K | undefined
+): ReadonlySet<Realm> | undefined {
+  if (key === undefined) {
+    return undefined;
+  }
+  return index.get(key) ?? EMPTY_SET;
+}
+
+function removeFromIndex<K>(index: Map<K, Set<Realm>>, key: K, realm: Realm) {
+  const realms = index.get(key);
+  realms?.delete(realm);
+  if (realms?.size === 0) {
+    index.delete(key);
+  }
+}
+
+function matchesFilter(realm: Realm, filter: RealmFilter): boolean {
+  if (filter.realmId !== undefined && filter.realmId !== realm.realmId) {
+    return false;
+  }
+  if (
+    filter.browsingContextId !== undefined &&
+    filter.browsingContextId !== realm.browsingContextId
+  ) {
+    return false;
+  }
+  if (
+    filter.navigableId !== undefined &&
+    filter.navigableId !== realm.navigableId
+  ) {
+    return false;
+  }
+  if (
+    filter.executionContextId !== undefined &&
+    filter.executionContextId !== realm.executionContextId
+  ) {
+    return false;
+  }
+  if (filter.origin !== undefined && filter.origin !== realm.origin) {
+    return false;
+  }
+  if (filter.type !== undefined && filter.type !== realm.type) {
+    return false;
+  }
+  if (filter.sandbox !== undefined && filter.sandbox !== realm.sandbox) {
+    return false;
+  }
+  if (
+    filter.cdpSessionId !== undefined &&
+    filter.cdpSessionId !== realm.cdpClient.sessionId
+  ) {
+    return false;
+  }
+  return true;
+}
+
 /** Container class for browsing realms. */
 export class RealmStorage {
   /** Tracks handles and their realms sent to the client. */
@@ -46,55 +115,94 @@ export class RealmStorage {
   /** Map from realm ID to Realm. */
   readonly #realmMap = new Map<Script.Realm, Realm>();
 
+  /**
+   * Secondary indexes of the realms by the most common filter keys. The keys
+   * of a realm never change, so the indexes are maintained on add and delete.
+   */
+  readonly #realmsByBrowsingContextId = new Map<
+    BrowsingContext.BrowsingContext,
+    Set<Realm>
+  >();
+  readonly #realmsByExecutionContextId = new Map<
+    Protocol.Runtime.ExecutionContextId,
+    Set<Realm>
+  >();
+  readonly #realmsByCdpSessionId = new Map<
+    Protocol.Target.SessionID | undefined,
+    Set<Realm>
+  >();
+
   get knownHandlesToRealmMap() {
     return this.#knownHandlesToRealmMap;
   }
 
   addRealm(realm: Realm) {
     this.#realmMap.set(realm.realmId, realm);
+    addToIndex(
+      this.#realmsByBrowsingContextId,
+      realm.browsingContextId,
+      realm
+    );
+    addToIndex(
+      this.#realmsByExecutionContextId,
+      realm.executionContextId,
+      realm
+    );
+    addToIndex(this.#realmsByCdpSessionId, realm.cdpClient.sessionId, realm);
+  }
+
+  #removeRealm(realm: Realm) {
+    this.#realmMap.delete(realm.realmId);
+    removeFromIndex(
+      this.#realmsByBrowsingContextId,
+      realm.browsingContextId,
+      realm
+    );
+    removeFromIndex(
+      this.#realmsByExecutionContextId,
+      realm.executionContextId,
+      realm
+    );
+    removeFromIndex(
+      this.#realmsByCdpSessionId,
+      realm.cdpClient.sessionId,
+      realm
+    );
+  }
+
+  /**
+   * Returns the realms which can match the given filter, using the most
+   * selective index available for it.
+   */
+  #getCandidates(filter: RealmFilter): Iterable<Realm> {
+    if (filter.realmId !== undefined) {
+      const realm = this.#realmMap.get(filter.realmId);
+      return realm === undefined ? [] : [realm];
+    }
+    let candidates: Iterable<Realm> = this.#realmMap.values();
+    let candidatesCount = this.#realmMap.size;
+    for (const realms of [
+      lookUpIndex(this.#realmsByExecutionContextId, filter.executionContextId),
+      lookUpIndex(this.#realmsByBrowsingContextId, filter.browsingContextId),
+      lookUpIndex(this.#realmsByCdpSessionId, filter.cdpSessionId),
+    ]) {
+      if (realms !== undefined && realms.size < candidatesCount) {
+        candidates = realms;
+        candidatesCount = realms.size;
+      }
+    }
+    return candidates;
   }
 
   /** Finds all realms that match the given filter. */
   findRealms(filter: RealmFilter): Realm[] {
-    return Array.from(this.#realmMap.values()).filter((realm) => {
-      if (filter.realmId !== undefined && filter.realmId !== realm.realmId) {
-        return false;
-      }
-      if (
-        filter.browsingContextId !== undefined &&
-        filter.browsingContextId !== realm.browsingContextId
-      ) {
-        return false;
-      }
-      if (
-        filter.navigableId !== undefined &&
-        filter.navigableId !== realm.navigableId
-      ) {
-        return false;
+    const result: Realm[] = [];
+    for (const realm of this.#getCandidates(filter)) {
+      if (matchesFilter(realm, filter)) {
+        result.push(realm);
       }
-      if (
-        filter.executionContextId !== undefined &&
-        filter.executionContextId !== realm.executionContextId
-      ) {
-        return false;
-      }
-      if (filter.origin !== undefined && filter.origin !== realm.origin) {
-        return false;
-      }
-      if (filter.type !== undefined && filter.type !== realm.type) {
-        return false;
-      }
-      if (filter.sandbox !== undefined && filter.sandbox !== realm.sandbox) {
-        return false;
-      }
-      if (
-        filter.cdpSessionId !== undefined &&
-        filter.cdpSessionId !== realm.cdpClient.sessionId
-      ) {
-        return false;
-      }
-      return true;
-    });
+    }
+    return result;
   }
 
   findRealm(filter: RealmFilter): Realm | undefined {
@@ -118,12 +226,19 @@ export class RealmStorage {
 
   /** Deletes all realms that match the given filter. */
   deleteRealms(filter: RealmFilter) {
-    this.findRealms(filter).map((realm) => {
+    const deletedRealmIds = new Set<Script.Realm>();
+    for (const realm of this.findRealms(filter)) {
       realm.dispose();
-      this.#realmMap.delete(realm.realmId);
-      Array.from(this.knownHandlesToRealmMap.entries())
-        .filter(([, r]) => r === realm.realmId)
-        .map(([handle]) => this.knownHandlesToRealmMap.delete(handle));
-    });
+      this.#removeRealm(realm);
+      deletedRealmIds.add(realm.realmId);
+    }
+    if (deletedRealmIds.size === 0) {
+      return;
+    }
+    for (const [handle, realmId] of this.#knownHandlesToRealmMap) {
+      if (deletedRealmIds.has(realmId)) {
+        this.#knownHandlesToRealmMap.delete(handle);
+      }
+    }
   }
 }
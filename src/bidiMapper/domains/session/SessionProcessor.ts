@@ -20,28 +20,45 @@ import type {
   EmptyResult,
   Session,
 } from '../../../protocol/protocol.js';
+import type {BrowsingContextStorage} from '../context/BrowsingContextStorage.js';
+import type {CdpTarget} from '../context/CdpTarget.js';
 import type {EventManager} from '../events/EventManager.js';
 
 export class SessionProcessor {
   #eventManager: EventManager;
+  #browsingContextStorage: BrowsingContextStorage;
 
-  constructor(eventManager: EventManager) {
+  constructor(
+    eventManager: EventManager,
+    browsingContextStorage: BrowsingContextStorage
+  ) {
     this.#eventManager = eventManager;
+    this.#browsingContextStorage = browsingContextStorage;
   }
 
   status(): Session.StatusResult {
     return {ready: false, message: 'already connected'};
   }
 
-  subscribe(
+  async subscribe(
     params: Session.SubscriptionRequest,
     channel: string | null = null
-  ): EmptyResult {
+  ): Promise<EmptyResult> {
     this.#eventManager.subscribe(
       params.events as ChromiumBidi.EventNames[],
       params.contexts ?? [null],
       channel
     );
+    // The CDP domains required by the new subscriptions have to be enabled
+    // before the events are expected.
+    const cdpTargets = new Set<CdpTarget>(
+      this.#browsingContextStorage
+        .getAllContexts()
+        .map((context) => context.cdpTarget)
+    );
+    await Promise.all(
+      [...cdpTargets].map((cdpTarget) => cdpTarget.enableNetworkIfNeeded())
+    );
     return {};
   }
 
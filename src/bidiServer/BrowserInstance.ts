@@ -41,7 +41,7 @@ import type {SimpleTransport} from './SimpleTransport.js';
 
 const debugInternal = debug('bidi:mapper:internal');
 
-type ChromeOptions = {
+export type ChromeOptions = {
   chromeArgs: string[];
   chromeBinary?: string;
   channel: ChromeReleaseChannel;
@@ -87,7 +87,9 @@ export class BrowserInstance {
       '--no-default-browser-check',
       '--no-first-run',
       '--password-store=basic',
-      '--remote-debugging-port=9222',
+      // Let the browser pick a free port, so that several browsers can run
+      // at the same time. The endpoint is read from the browser output.
+      '--remote-debugging-port=0',
       '--use-mock-keychain',
       `--user-data-dir=${profileDir}`,
       // keep-sorted end
@@ -158,6 +160,10 @@ export class BrowserInstance {
     return this.#mapperCdpConnection.bidiSession();
   }
 
+  getMapperInFlightCount(): number {
+    return this.#mapperCdpConnection.getInFlightCount();
+  }
+
   static #establishCdpConnection(cdpUrl: string): Promise<CdpConnection> {
     return new Promise((resolve, reject) => {
       debugInternal('Establishing session with cdpUrl: ', cdpUrl);
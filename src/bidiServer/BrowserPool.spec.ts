@@ -0,0 +1,139 @@
+/*
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import {ChromeReleaseChannel} from '@puppeteer/browsers';
+import {expect} from 'chai';
+import sinon from 'sinon';
+
+import type {BrowserInstance} from './BrowserInstance.js';
+import {BrowserPool, type BrowserOptions} from './BrowserPool.js';
+
+function createOptions(chromeArgs: string[] = []): BrowserOptions {
+  return {
+    chromeOptions: {
+      chromeArgs,
+      channel: ChromeReleaseChannel.DEV,
+      headless: true,
+    },
+    mapperOptions: {acceptInsecureCerts: false},
+    verbose: false,
+  };
+}
+
+function createFakeBrowserInstance(): BrowserInstance {
+  return {close: sinon.fake.resolves(undefined)} as unknown as BrowserInstance;
+}
+
+describe('BrowserPool', () => {
+  it('should launch a browser for every request if the size is 0', async () => {
+    const launchBrowser = sinon.fake(async () => createFakeBrowserInstance());
+    const browserPool = new BrowserPool(0, launchBrowser);
+
+    browserPool.prewarm(createOptions());
+    await browserPool.acquire(createOptions());
+    await browserPool.acquire(createOptions());
+
+    sinon.assert.calledTwice(launchBrowser);
+    expect(browserPool.getStats()).to.deep.equal({
+      hits: 0,
+      misses: 2,
+      idle: 0,
+    });
+  });
+
+  it('should serve a warm browser and replace it', async () => {
+    const warmInstance = createFakeBrowserInstance();
+    const launchBrowser = sinon.stub();
+    launchBrowser.onFirstCall().resolves(warmInstance);
+    launchBrowser.resolves(createFakeBrowserInstance());
+    const browserPool = new BrowserPool(1, launchBrowser);
+
+    browserPool.prewarm(createOptions());
+    sinon.assert.calledOnce(launchBrowser);
+
+    expect(await browserPool.acquire(createOptions())).to.equal(warmInstance);
+    sinon.assert.calledTwice(launchBrowser);
+    expect(browserPool.getStats()).to.deep.equal({
+      hits: 1,
+      misses: 0,
+      idle: 1,
+    });
+  });
+
+  it('should launch a browser for other options', async () => {
+    const launchBrowser = sinon.fake(async () => createFakeBrowserInstance());
+    const browserPool = new BrowserPool(1, launchBrowser);
+
+    browserPool.prewarm(createOptions());
+    await browserPool.acquire(createOptions(['--some-arg']));
+
+    expect(browserPool.getStats()).to.deep.include({hits: 0, misses: 1});
+    expect(launchBrowser.lastCall.args[0]).to.deep.equal(
+      createOptions(['--some-arg'])
+    );
+  });
+
+  it('should not keep one-off options warm', async () => {
+    const warmInstance = createFakeBrowserInstance();
+    const launchBrowser = sinon.stub();
+    launchBrowser.onFirstCall().resolves(warmInstance);
+    launchBrowser.resolves(createFakeBrowserInstance());
+    const browserPool = new BrowserPool(1, launchBrowser);
+
+    browserPool.prewarm(createOptions());
+    await browserPool.acquire(createOptions(['--some-arg']));
+
+    sinon.assert.calledTwice(launchBrowser);
+    sinon.assert.notCalled(warmInstance.close as sinon.SinonSpy);
+    expect(await browserPool.acquire(createOptions())).to.equal(warmInstance);
+  });
+
+  it('should keep the options requested again warm', async () => {
+    const warmInstance = createFakeBrowserInstance();
+    const launchBrowser = sinon.stub();
+    launchBrowser.resolves(createFakeBrowserInstance());
+    launchBrowser.onSecondCall().resolves(warmInstance);
+    const browserPool = new BrowserPool(1, launchBrowser);
+
+    await browserPool.acquire(createOptions(['--some-arg']));
+    expect(browserPool.getStats().idle).to.equal(0);
+    await browserPool.acquire(createOptions(['--some-arg']));
+    expect(browserPool.getStats().idle).to.equal(1);
+
+    expect(await browserPool.acquire(createOptions(['--some-arg']))).to.equal(
+      warmInstance
+    );
+    expect(browserPool.getStats()).to.deep.equal({
+      hits: 1,
+      misses: 2,
+      idle: 1,
+    });
+  });
+
+  it('should launch a browser if the warm one failed', async () => {
+    const instance = createFakeBrowserInstance();
+    const launchBrowser = sinon.stub();
+    launchBrowser.onFirstCall().rejects(new Error('Launch failed'));
+    launchBrowser.resolves(instance);
+    const browserPool = new BrowserPool(1, launchBrowser);
+
+    browserPool.prewarm(createOptions());
+
+    expect(await browserPool.acquire(createOptions())).to.equal(instance);
+    expect(browserPool.getStats()).to.deep.include({hits: 0, misses: 1});
+  });
+});
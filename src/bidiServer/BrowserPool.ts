@@ -0,0 +1,161 @@
+/*
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import debug from 'debug';
+
+import type {MapperOptions} from '../bidiMapper/BidiServer.js';
+
+import {BrowserInstance, type ChromeOptions} from './BrowserInstance.js';
+
+const debugInfo = debug('bidi:server:info');
+const debugInternal = debug('bidi:server:internal');
+
+export type BrowserOptions = {
+  readonly chromeOptions: ChromeOptions;
+  readonly mapperOptions: MapperOptions;
+  readonly verbose: boolean;
+};
+
+export type BrowserPoolStats = {
+  /** Number of requests served by a warm browser instance. */
+  hits: number;
+  /** Number of requests which launched a browser instance. */
+  misses: number;
+  /** Number of warm browser instances, including the ones being launched. */
+  idle: number;
+};
+
+type LaunchBrowser = (options: BrowserOptions) => Promise<BrowserInstance>;
+
+/** Number of options which were requested once remembered by the pool. */
+const MAX_REQUESTED_ONCE = 100;
+
+/**
+ * Keeps browser instances with the BiDi Mapper already running, so that new
+ * sessions do not wait for the browser launch. Instances are launched per
+ * browser options, for the prewarmed options and the options requested more
+ * than once. One-off options, e.g. with unique browser arguments, launch a
+ * browser per request and never take the place of warm instances.
+ */
+export class BrowserPool {
+  readonly #size: number;
+  readonly #launchBrowser: LaunchBrowser;
+  /** Maps the serialized options which are kept warm to their instances. */
+  readonly #idle = new Map<string, Promise<BrowserInstance>[]>();
+  /** Serialized options requested once, from the least recent. */
+  readonly #requestedOnce = new Set<string>();
+  #idleCount = 0;
+  #hits = 0;
+  #misses = 0;
+
+  /**
+   * @param size The maximum number of warm browser instances. If 0, every
+   * request launches a browser instance.
+   * @param launchBrowser Launches a browser instance with the given options.
+   */
+  constructor(
+    size: number,
+    launchBrowser: LaunchBrowser = (options) =>
+      BrowserInstance.run(
+        options.chromeOptions,
+        options.mapperOptions,
+        options.verbose
+      )
+  ) {
+    this.#size = size;
+    this.#launchBrowser = launchBrowser;
+  }
+
+  /** Launches warm instances with the given options ahead of the requests. */
+  prewarm(options: BrowserOptions): void {
+    this.#keepWarm(BrowserPool.#getKey(options), options);
+  }
+
+  /**
+   * Returns a warm browser instance with the given options if there is one,
+   * and launches a new one otherwise. The taken instance is replaced in the
+   * background.
+   */
+  async acquire(options: BrowserOptions): Promise<BrowserInstance> {
+    const key = BrowserPool.#getKey(options);
+    const instances = this.#idle.get(key);
+    const warmInstance = instances?.shift();
+    if (warmInstance !== undefined) {
+      this.#idleCount--;
+    }
+    if (instances !== undefined || this.#requestedOnce.delete(key)) {
+      this.#keepWarm(key, options);
+    } else {
+      this.#rememberRequest(key);
+    }
+
+    if (warmInstance !== undefined) {
+      try {
+        const browserInstance = await warmInstance;
+        this.#hits++;
+        debugInfo('Browser pool hit', this.getStats());
+        return browserInstance;
+      } catch {
+        // The failure is logged in `#keepWarm`. Fall back to a new instance.
+      }
+    }
+
+    this.#misses++;
+    debugInfo('Browser pool miss', this.getStats());
+    return await this.#launchBrowser(options);
+  }
+
+  getStats(): BrowserPoolStats {
+    return {hits: this.#hits, misses: this.#misses, idle: this.#idleCount};
+  }
+
+  /**
+   * Launches warm instances with the given options while the pool has room.
+   * Warm instances of other options are never closed to make room.
+   */
+  #keepWarm(key: string, options: BrowserOptions) {
+    if (this.#size === 0) {
+      return;
+    }
+    let instances = this.#idle.get(key);
+    if (instances === undefined) {
+      instances = [];
+      this.#idle.set(key, instances);
+    }
+
+    while (this.#idleCount < this.#size) {
+      const browserInstance = this.#launchBrowser(options);
+      browserInstance.catch((error) => {
+        debugInternal('Failed to launch a warm browser instance', error);
+      });
+      instances.push(browserInstance);
+      this.#idleCount++;
+    }
+  }
+
+  #rememberRequest(key: string) {
+    this.#requestedOnce.add(key);
+    if (this.#requestedOnce.size > MAX_REQUESTED_ONCE) {
+      const [leastRecent] = this.#requestedOnce;
+      this.#requestedOnce.delete(leastRecent!);
+    }
+  }
+
+  static #getKey(options: BrowserOptions): string {
+    return JSON.stringify(options);
+  }
+}
@@ -23,6 +23,7 @@ import type {CdpClient} from '../cdp/CdpClient.js';
 import type {CdpConnection} from '../cdp/CdpConnection.js';
 import type {LogPrefix, LogType} from '../utils/log.js';
 
+import {metrics} from './Metrics.js';
 import {SimpleTransport} from './SimpleTransport.js';
 
 const debugInternal = debug('bidi:mapper:internal');
@@ -40,9 +41,26 @@ const getLogger = (type: LogPrefix) => {
   return logger;
 };
 
+/**
+ * Calls the `onBidiMessage` function of the mapper tab, which is passed as
+ * `this`. Evaluated in the mapper tab.
+ */
+function callOnBidiMessage(this: (message: string) => void, message: string) {
+  this(message);
+}
+/** The source is the same for every message, so V8 compiles it only once. */
+const CALL_ON_BIDI_MESSAGE = String(callOnBidiMessage);
+
+type MapperInstance = {
+  mapperCdpClient: CdpClient;
+  /** Remote object ID of the `onBidiMessage` function in the mapper tab. */
+  onBidiMessageObjectId: Protocol.Runtime.RemoteObjectId;
+};
+
 export class MapperCdpConnection {
   #cdpConnection: CdpConnection;
   #mapperCdpClient: CdpClient;
+  #onBidiMessageObjectId: Protocol.Runtime.RemoteObjectId;
   #bidiSession: SimpleTransport;
 
   static async create(
@@ -52,13 +70,13 @@ export class MapperCdpConnection {
     mapperOptions: MapperOptions
   ): Promise<MapperCdpConnection> {
     try {
-      const mapperCdpClient = await this.#initMapper(
+      const mapperInstance = await this.#initMapper(
         cdpConnection,
         mapperTabSource,
         verbose,
         mapperOptions
       );
-      return new MapperCdpConnection(cdpConnection, mapperCdpClient);
+      return new MapperCdpConnection(cdpConnection, mapperInstance);
     } catch (e) {
       cdpConnection.close();
       throw e;
@@ -67,10 +85,11 @@ export class MapperCdpConnection {
 
   private constructor(
     cdpConnection: CdpConnection,
-    mapperCdpClient: CdpClient
+    mapperInstance: MapperInstance
   ) {
     this.#cdpConnection = cdpConnection;
-    this.#mapperCdpClient = mapperCdpClient;
+    this.#mapperCdpClient = mapperInstance.mapperCdpClient;
+    this.#onBidiMessageObjectId = mapperInstance.onBidiMessageObjectId;
     this.#bidiSession = new SimpleTransport(
       async (message) => await this.#sendMessage(message)
     );
@@ -88,10 +107,16 @@ export class MapperCdpConnection {
   }
 
   async #sendMessage(message: string): Promise<void> {
+    const start = performance.now();
     try {
-      await this.#mapperCdpClient.sendCommand('Runtime.evaluate', {
-        expression: `onBidiMessage(${JSON.stringify(message)})`,
+      // The message is passed as an argument, so it is neither embedded into
+      // a script nor compiled.
+      await this.#mapperCdpClient.sendCommand('Runtime.callFunctionOn', {
+        functionDeclaration: CALL_ON_BIDI_MESSAGE,
+        objectId: this.#onBidiMessageObjectId,
+        arguments: [{value: message}],
       });
+      metrics.observeMapperRoundTrip((performance.now() - start) / 1000);
     } catch (error) {
       debugInternal('Call to onBidiMessage failed', error);
     }
@@ -101,6 +126,13 @@ export class MapperCdpConnection {
     this.#cdpConnection.close();
   }
 
+  /** Returns the number of messages being delivered to the mapper tab. */
+  getInFlightCount(): number {
+    return this.#cdpConnection.getInFlightCount(
+      this.#mapperCdpClient.sessionId
+    );
+  }
+
   bidiSession(): SimpleTransport {
     return this.#bidiSession;
   }
@@ -149,7 +181,7 @@ export class MapperCdpConnection {
     mapperTabSource: string,
     verbose: boolean,
     mapperOptions: MapperOptions
-  ): Promise<CdpClient> {
+  ): Promise<MapperInstance> {
     debugInternal('Initializing Mapper.', mapperOptions);
 
     const browserClient = await cdpConnection.createBrowserSession();
@@ -167,28 +199,31 @@ export class MapperCdpConnection {
 
     const mapperCdpClient = cdpConnection.getCdpClient(mapperSessionId);
 
-    await mapperCdpClient.sendCommand('Runtime.enable');
-
-    await browserClient.sendCommand('Target.exposeDevToolsProtocol', {
-      bindingName: 'cdp',
-      targetId: mapperTabTargetId,
-    });
-
-    await mapperCdpClient.sendCommand('Runtime.addBinding', {
-      name: 'sendBidiResponse',
-    });
-
-    if (verbose) {
+    await Promise.all([
+      mapperCdpClient.sendCommand('Runtime.enable'),
+      // Needed before the Mapper Tab sources are evaluated.
+      browserClient.sendCommand('Target.exposeDevToolsProtocol', {
+        bindingName: 'cdp',
+        targetId: mapperTabTargetId,
+      }),
+    ]);
+
+    // Commands of a CDP session are handled in order, so the bindings are
+    // added before the sources are evaluated without waiting for each of them.
+    await Promise.all([
+      mapperCdpClient.sendCommand('Runtime.addBinding', {
+        name: 'sendBidiResponse',
+      }),
       // Needed to request verbose logs from Mapper.
-      await mapperCdpClient.sendCommand('Runtime.addBinding', {
-        name: 'sendDebugMessage',
-      });
-    }
-
-    // Evaluate Mapper Tab sources in the tab.
-    await mapperCdpClient.sendCommand('Runtime.evaluate', {
-      expression: mapperTabSource,
-    });
+      verbose &&
+        mapperCdpClient.sendCommand('Runtime.addBinding', {
+          name: 'sendDebugMessage',
+        }),
+      // Evaluate Mapper Tab sources in the tab.
+      mapperCdpClient.sendCommand('Runtime.evaluate', {
+        expression: mapperTabSource,
+      }),
+    ]);
 
     await mapperCdpClient.sendCommand('Runtime.evaluate', {
       expression: `window.runMapperInstance('${mapperTabTargetId}', ${JSON.stringify(
@@ -197,7 +232,17 @@ export class MapperCdpConnection {
       awaitPromise: true,
     });
 
+    const {result: onBidiMessage} = await mapperCdpClient.sendCommand(
+      'Runtime.evaluate',
+      {
+        expression: 'window.onBidiMessage',
+      }
+    );
+    if (onBidiMessage.objectId === undefined) {
+      throw new Error('Mapper does not expose onBidiMessage');
+    }
+
     debugInternal('Mapper is launched!');
-    return mapperCdpClient;
+    return {mapperCdpClient, onBidiMessageObjectId: onBidiMessage.objectId};
   }
 }
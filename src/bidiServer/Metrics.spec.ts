@@ -0,0 +1,133 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import {expect} from 'chai';
+import sinon from 'sinon';
+
+import {Histogram, Metrics} from './Metrics.js';
+
+describe('Histogram', () => {
+  it('formats cumulative buckets', () => {
+    const histogram = new Histogram();
+    histogram.observe(0.001);
+    histogram.observe(0.003);
+    histogram.observe(60);
+
+    const lines = histogram.format('duration', {method: 'a'});
+
+    expect(lines).to.include('duration_bucket{method="a",le="0.001"} 1');
+    expect(lines).to.include('duration_bucket{method="a",le="0.0025"} 1');
+    expect(lines).to.include('duration_bucket{method="a",le="0.005"} 2');
+    expect(lines).to.include('duration_bucket{method="a",le="30"} 2');
+    expect(lines).to.include('duration_bucket{method="a",le="+Inf"} 3');
+    expect(lines).to.include('duration_sum{method="a"} 60.004');
+    expect(lines).to.include('duration_count{method="a"} 3');
+  });
+});
+
+describe('Metrics', () => {
+  let metrics: Metrics;
+  const connection = {};
+
+  beforeEach(() => {
+    metrics = new Metrics();
+  });
+
+  it('measures command responses', () => {
+    metrics.onCommandReceived(connection, 1, 'script.evaluate');
+    metrics.onCommandReceived(connection, 2, 'script.evaluate');
+
+    metrics.onMessageSent(
+      connection,
+      '{"type":"event","method":"log.entryAdded","params":{}}'
+    );
+    metrics.onMessageSent(connection, '{"type":"success","id":1,"result":{}}');
+    metrics.onMessageSent(connection, '{"type":"error","id":2,"error":"x"}');
+    // Already answered.
+    metrics.onMessageSent(connection, '{"type":"success","id":1,"result":{}}');
+
+    const output = metrics.format();
+    expect(output).to.include(
+      'bidi_command_duration_seconds_count{method="script.evaluate"} 2'
+    );
+    expect(output).to.include(
+      'bidi_command_errors_total{method="script.evaluate"} 1'
+    );
+  });
+
+  it('measures responses with the ID before the type', () => {
+    metrics.onCommandReceived(connection, 1, 'session.new');
+    metrics.onCommandReceived(connection, 2, 'browser.close');
+
+    metrics.onMessageSent(connection, '{"id":1,"type":"success","result":{}}');
+    metrics.onMessageSent(connection, '{"id":2,"type":"error","error":"x"}');
+
+    const output = metrics.format();
+    expect(output).to.include(
+      'bidi_command_duration_seconds_count{method="session.new"} 1'
+    );
+    expect(output).to.include(
+      'bidi_command_errors_total{method="browser.close"} 1'
+    );
+  });
+
+  it('does not mix up connections', () => {
+    metrics.onCommandReceived(connection, 1, 'script.evaluate');
+
+    metrics.onMessageSent({}, '{"type":"success","id":1,"result":{}}');
+
+    expect(metrics.format()).not.to.include('method="script.evaluate"');
+  });
+
+  it('ignores commands without ID or method', () => {
+    metrics.onCommandReceived(connection, '1', 'script.evaluate');
+    metrics.onCommandReceived(connection, 1, undefined);
+
+    metrics.onMessageSent(connection, '{"type":"success","id":1,"result":{}}');
+
+    expect(metrics.format()).not.to.include('bidi_command_duration_seconds_');
+  });
+
+  it('escapes label values', () => {
+    metrics.onCommandReceived(connection, 1, 'a"b\\c');
+    metrics.onMessageSent(connection, '{"type":"success","id":1,"result":{}}');
+
+    expect(metrics.format()).to.include(
+      'bidi_command_duration_seconds_count{method="a\\"b\\\\c"} 1'
+    );
+  });
+
+  it('reads gauges when formatting', () => {
+    const read = sinon.stub().returns(3);
+    metrics.registerGauge('bidi_test', 'Test gauge.', read);
+
+    expect(read.called).to.be.false;
+    expect(metrics.format()).to.include(
+      '# HELP bidi_test Test gauge.\n# TYPE bidi_test gauge\nbidi_test 3\n'
+    );
+  });
+
+  it('reads counters when formatting', () => {
+    const read = sinon.stub().returns(5);
+    metrics.registerCounter('bidi_test_total', 'Test counter.', read);
+
+    expect(read.called).to.be.false;
+    expect(metrics.format()).to.include(
+      '# HELP bidi_test_total Test counter.\n# TYPE bidi_test_total counter\nbidi_test_total 5\n'
+    );
+  });
+});
@@ -0,0 +1,224 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/**
+ * Upper bounds of the duration histogram buckets, in seconds. An implicit
+ * `+Inf` bucket follows.
+ */
+const BUCKETS = [
+  0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30,
+];
+
+/**
+ * Extracts the type and the ID of a command response without parsing the
+ * whole message, which can be megabytes long. Responses serialize `type` and
+ * `id` first, in either order.
+ */
+const RESPONSE_PREFIX =
+  /^\{(?:"type":"(success|error)","id":(\d+)|"id":(\d+),"type":"(success|error)")[,}]/;
+
+/** A value read when the metrics are formatted. */
+type ReadMetric = {
+  type: 'counter' | 'gauge';
+  help: string;
+  read: () => number;
+};
+
+type PendingCommand = {
+  method: string;
+  start: number;
+};
+
+export class Histogram {
+  /** Non-cumulative count per bucket, the last one being `+Inf`. */
+  readonly #counts = new Array<number>(BUCKETS.length + 1).fill(0);
+  #sum = 0;
+
+  observe(seconds: number) {
+    let i = 0;
+    while (i < BUCKETS.length && seconds > BUCKETS[i]!) {
+      i++;
+    }
+    this.#counts[i]!++;
+    this.#sum += seconds;
+  }
+
+  /** Formats the samples in the Prometheus text exposition format. */
+  format(name: string, labels: Record<string, string> = {}): string[] {
+    const lines: string[] = [];
+    let cumulative = 0;
+    for (let i = 0; i <= BUCKETS.length; i++) {
+      cumulative += this.#counts[i]!;
+      const le = i < BUCKETS.length ? String(BUCKETS[i]) : '+Inf';
+      lines.push(
+        `${name}_bucket${formatLabels({...labels, le})} ${cumulative}`
+      );
+    }
+    lines.push(`${name}_sum${formatLabels(labels)} ${this.#sum}`);
+    lines.push(`${name}_count${formatLabels(labels)} ${cumulative}`);
+    return lines;
+  }
+}
+
+/**
+ * Collects the BiDi server metrics, exposed on `/metrics` in the Prometheus
+ * text format.
+ */
+export class Metrics {
+  readonly #commandDurations = new Map<string, Histogram>();
+  readonly #commandErrors = new Map<string, number>();
+  readonly #browserLaunchDurations = new Histogram();
+  readonly #mapperRoundTripDurations = new Histogram();
+  readonly #readMetrics = new Map<string, ReadMetric>();
+  /** Commands waiting for a response, by connection and command ID. */
+  readonly #pendingCommands = new WeakMap<
+    object,
+    Map<number, PendingCommand>
+  >();
+
+  /** Registers a value read when the metrics are formatted. */
+  registerGauge(name: string, help: string, read: () => number) {
+    this.#readMetrics.set(name, {type: 'gauge', help, read});
+  }
+
+  /**
+   * Registers a total read when the metrics are formatted. The total must only
+   * ever grow, and its name should end with `_total`.
+   */
+  registerCounter(name: string, help: string, read: () => number) {
+    this.#readMetrics.set(name, {type: 'counter', help, read});
+  }
+
+  /** Called when a command is received from the client. */
+  onCommandReceived(connection: object, id: unknown, method: unknown) {
+    if (typeof id !== 'number' || typeof method !== 'string') {
+      return;
+    }
+    let pending = this.#pendingCommands.get(connection);
+    if (pending === undefined) {
+      pending = new Map();
+      this.#pendingCommands.set(connection, pending);
+    }
+    pending.set(id, {method, start: performance.now()});
+  }
+
+  /** Called when a message is sent to the client. */
+  onMessageSent(connection: object, message: string) {
+    const pending = this.#pendingCommands.get(connection);
+    if (pending === undefined || pending.size === 0) {
+      return;
+    }
+    const match = RESPONSE_PREFIX.exec(message);
+    if (match === null) {
+      return;
+    }
+    const type = match[1] ?? match[4];
+    const id = Number(match[2] ?? match[3]);
+    const command = pending.get(id);
+    if (command === undefined) {
+      return;
+    }
+    pending.delete(id);
+
+    let histogram = this.#commandDurations.get(command.method);
+    if (histogram === undefined) {
+      histogram = new Histogram();
+      this.#commandDurations.set(command.method, histogram);
+    }
+    histogram.observe((performance.now() - command.start) / 1000);
+    if (type === 'error') {
+      this.#commandErrors.set(
+        command.method,
+        (this.#commandErrors.get(command.method) ?? 0) + 1
+      );
+    }
+  }
+
+  /** Called when the connection is closed, to drop its pending commands. */
+  onConnectionClosed(connection: object) {
+    this.#pendingCommands.delete(connection);
+  }
+
+  observeBrowserLaunch(seconds: number) {
+    this.#browserLaunchDurations.observe(seconds);
+  }
+
+  observeMapperRoundTrip(seconds: number) {
+    this.#mapperRoundTripDurations.observe(seconds);
+  }
+
+  format(): string {
+    const lines: string[] = [];
+
+    lines.push(
+      '# HELP bidi_command_duration_seconds Time from receiving a command to sending its response.',
+      '# TYPE bidi_command_duration_seconds histogram'
+    );
+    for (const [method, histogram] of this.#commandDurations) {
+      lines.push(
+        ...histogram.format('bidi_command_duration_seconds', {method})
+      );
+    }
+
+    lines.push(
+      '# HELP bidi_command_errors_total Number of commands which failed.',
+      '# TYPE bidi_command_errors_total counter'
+    );
+    for (const [method, count] of this.#commandErrors) {
+      lines.push(`bidi_command_errors_total${formatLabels({method})} ${count}`);
+    }
+
+    lines.push(
+      '# HELP bidi_browser_launch_duration_seconds Time to get a browser instance for a new session.',
+      '# TYPE bidi_browser_launch_duration_seconds histogram',
+      ...this.#browserLaunchDurations.format(
+        'bidi_browser_launch_duration_seconds'
+      ),
+      '# HELP bidi_mapper_round_trip_duration_seconds Time of the CDP command delivering a message to the Mapper tab.',
+      '# TYPE bidi_mapper_round_trip_duration_seconds histogram',
+      ...this.#mapperRoundTripDurations.format(
+        'bidi_mapper_round_trip_duration_seconds'
+      )
+    );
+
+    for (const [name, {type, help, read}] of this.#readMetrics) {
+      lines.push(
+        `# HELP ${name} ${help}`,
+        `# TYPE ${name} ${type}`,
+        `${name} ${read()}`
+      );
+    }
+
+    return `${lines.join('\n')}\n`;
+  }
+}
+
+function formatLabels(labels: Record<string, string>): string {
+  const entries = Object.entries(labels).map(
+    ([name, value]) => `${name}="${escapeLabelValue(value)}"`
+  );
+  return entries.length === 0 ? '' : `{${entries.join(',')}}`;
+}
+
+function escapeLabelValue(value: string): string {
+  return value
+    .replaceAll('\\', '\\\\')
+    .replaceAll('"', '\\"')
+    .replaceAll('\n', '\\n');
+}
+
+export const metrics = new Metrics();
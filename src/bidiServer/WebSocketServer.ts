@@ -24,7 +24,9 @@ import type {MapperOptions} from '../bidiMapper/BidiServer.js';
 import {ErrorCode} from '../protocol/webdriver-bidi.js';
 import {uuidv4} from '../utils/uuid.js';
 
-import {BrowserInstance} from './BrowserInstance.js';
+import type {BrowserInstance} from './BrowserInstance.js';
+import {BrowserPool} from './BrowserPool.js';
+import {metrics} from './Metrics.js';
 
 export const debugInfo = debug('bidi:server:info');
 const debugInternal = debug('bidi:server:internal');
@@ -56,19 +58,34 @@ type SessionOptions = {
 
 export class WebSocketServer {
   static #sessions = new Map<string, Session>();
+  static #browserPool = new BrowserPool(0);
+  static #connections = new Set<websocket.connection>();
+  static #browserInstances = new Set<BrowserInstance>();
 
   /**
    * @param bidiPort Port to start ws server on.
    * @param channel
    * @param headless
    * @param verbose
+   * @param browserPoolSize Number of browser instances to keep launched ahead
+   * of the new sessions.
    */
   static run(
     bidiPort: number,
     channel: ChromeReleaseChannel,
     headless: boolean,
-    verbose: boolean
+    verbose: boolean,
+    browserPoolSize = 0
   ) {
+    this.#browserPool = new BrowserPool(browserPoolSize);
+    // Warm up the instances for the sessions without capabilities.
+    this.#browserPool.prewarm({
+      chromeOptions: this.#getChromeOptions(undefined, channel, headless),
+      mapperOptions: this.#getMapperOptions(undefined),
+      verbose,
+    });
+    this.#registerReadMetrics();
+
     const server = http.createServer(
       async (request: http.IncomingMessage, response: http.ServerResponse) => {
         debugInternal(
@@ -80,6 +97,14 @@ export class WebSocketServer {
           return response.end(404);
         }
 
+        if (request.url === '/metrics') {
+          response.writeHead(200, {
+            'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+            'Cache-Control': 'no-cache',
+          });
+          return response.end(metrics.format());
+        }
+
         // https://w3c.github.io/webdriver-bidi/#transport, step 2.
         if (request.url === '/session') {
           const body: Uint8Array[] = [];
@@ -197,6 +222,7 @@ export class WebSocketServer {
       }
 
       const connection = request.accept();
+      this.#connections.add(connection);
 
       session = this.#sessions.get(requestSessionId ?? '');
       if (session !== undefined) {
@@ -255,6 +281,11 @@ export class WebSocketServer {
           );
           return;
         }
+        metrics.onCommandReceived(
+          connection,
+          parsedCommandData.id,
+          parsedCommandData.method
+        );
 
         // Handle creating new session.
         if (parsedCommandData.method === 'session.new') {
@@ -310,8 +341,8 @@ export class WebSocketServer {
           // TODO: extend with capabilities.
           this.#sendClientMessage(
             {
-              id: parsedCommandData.id,
               type: 'success',
+              id: parsedCommandData.id,
               result: {
                 sessionId: session.sessionId,
                 capabilities: {},
@@ -350,11 +381,12 @@ export class WebSocketServer {
 
         // Handle `browser.close` command.
         if (parsedCommandData.method === 'browser.close') {
+          this.#browserInstances.delete(browserInstance);
           await browserInstance.close();
           this.#sendClientMessage(
             {
-              id: parsedCommandData.id,
               type: 'success',
+              id: parsedCommandData.id,
               result: {},
             },
             connection
@@ -372,6 +404,8 @@ export class WebSocketServer {
             connection.remoteAddress
           } disconnected.`
         );
+        this.#connections.delete(connection);
+        metrics.onConnectionClosed(connection);
 
         // TODO: don't close Browser instance to allow re-connecting to the session.
         await this.#closeBrowserInstanceIfLaunched(session);
@@ -388,9 +422,60 @@ export class WebSocketServer {
 
     const browserInstance = await session.browserInstancePromise;
     session.browserInstancePromise = undefined;
+    this.#browserInstances.delete(browserInstance);
     void browserInstance.close();
   }
 
+  static #registerReadMetrics() {
+    metrics.registerGauge(
+      'bidi_sessions_active',
+      'Number of connections with a launched browser instance.',
+      () => this.#browserInstances.size
+    );
+    metrics.registerGauge(
+      'bidi_websocket_connections',
+      'Number of open WebSocket connections.',
+      () => this.#connections.size
+    );
+    metrics.registerGauge(
+      'bidi_websocket_send_buffer_bytes',
+      'Bytes queued to be sent to the clients, over all the connections.',
+      () => {
+        let bytes = 0;
+        for (const connection of this.#connections) {
+          bytes += connection.socket.writableLength;
+        }
+        return bytes;
+      }
+    );
+    metrics.registerGauge(
+      'bidi_mapper_commands_in_flight',
+      'Number of messages being delivered to the Mapper tabs.',
+      () => {
+        let count = 0;
+        for (const browserInstance of this.#browserInstances) {
+          count += browserInstance.getMapperInFlightCount();
+        }
+        return count;
+      }
+    );
+    metrics.registerCounter(
+      'bidi_browser_pool_hits_total',
+      'Number of sessions served by a warm browser instance.',
+      () => this.#browserPool.getStats().hits
+    );
+    metrics.registerCounter(
+      'bidi_browser_pool_misses_total',
+      'Number of sessions which launched a browser instance.',
+      () => this.#browserPool.getStats().misses
+    );
+    metrics.registerGauge(
+      'bidi_browser_pool_idle',
+      'Number of warm browser instances.',
+      () => this.#browserPool.getStats().idle
+    );
+  }
+
   static #getMapperOptions(capabilities: any): MapperOptions {
     const acceptInsecureCerts =
       capabilities?.alwaysMatch?.acceptInsecureCerts ?? false;
@@ -417,11 +502,10 @@ export class WebSocketServer {
     sessionOptions: SessionOptions
   ): Promise<BrowserInstance> {
     debugInfo('Scheduling browser launch...');
-    const browserInstance = await BrowserInstance.run(
-      sessionOptions.chromeOptions,
-      sessionOptions.mapperOptions,
-      sessionOptions.verbose
-    );
+    const start = performance.now();
+    const browserInstance = await this.#browserPool.acquire(sessionOptions);
+    metrics.observeBrowserLaunch((performance.now() - start) / 1000);
+    this.#browserInstances.add(browserInstance);
 
     // Forward messages from BiDi Mapper to the client unconditionally.
     browserInstance.bidiSession().on('message', (message) => {
@@ -443,6 +527,7 @@ export class WebSocketServer {
         debugSend(message);
       }
     }
+    metrics.onMessageSent(connection, message);
     connection.sendUTF(message);
   }
 
@@ -21,6 +21,7 @@ import {ArgumentParser} from 'argparse';
 import {debugInfo, WebSocketServer} from './WebSocketServer.js';
 
 function parseArguments(): {
+  browserPoolSize: number;
   channel: ChromeReleaseChannel;
   headless: string;
   port: number;
@@ -31,6 +32,15 @@ function parseArguments(): {
     exit_on_error: true,
   });
 
+  parser.add_argument('--browser-pool-size', {
+    help:
+      'Number of browsers with the Mapper to keep launched ahead of new ' +
+      'sessions. Default is 0.',
+    dest: 'browserPoolSize',
+    type: 'int',
+    default: process.env['BROWSER_POOL_SIZE'] ?? 0,
+  });
+
   parser.add_argument('-c', '--channel', {
     help:
       'If set, the given installed Chrome Release Channel will be used ' +
@@ -62,13 +72,13 @@ function parseArguments(): {
 (() => {
   try {
     const args = parseArguments();
-    const {channel, port} = args;
+    const {browserPoolSize, channel, port} = args;
     const headless = args.headless !== 'false';
     const verbose = args.verbose === true;
 
     debugInfo('Launching BiDi server...');
 
-    WebSocketServer.run(port, channel, headless, verbose);
+    WebSocketServer.run(port, channel, headless, verbose, browserPoolSize);
     debugInfo('BiDi server launched');
   } catch (e) {
     debugInfo('Error launching BiDi server', e);
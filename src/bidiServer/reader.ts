@@ -15,12 +15,48 @@
  * limitations under the License.
  */
 
+import {createHash} from 'crypto';
 import fs from 'fs/promises';
 import path from 'path';
 
+import debug from 'debug';
+
+const debugInternal = debug('bidi:server:internal');
+
+const MAPPER_TAB_PATH = path.join(__dirname, '../../iife/mapperTab.js');
+
+type CachedSource = {
+  source: string;
+  /** SHA-256 of the source. */
+  hash: string;
+  mtimeMs: number;
+  size: number;
+};
+
+let cachedMapperTabSource: CachedSource | undefined;
+
+/**
+ * Returns the Mapper tab bundle. The source is cached in memory and validated
+ * on its SHA-256 when the file is modified: a rebuild which produces the same
+ * bundle keeps the cached source.
+ */
 export async function getMapperTabSource(): Promise<string> {
-  return await fs.readFile(
-    path.join(__dirname, '../../iife/mapperTab.js'),
-    'utf8'
-  );
+  const {mtimeMs, size} = await fs.stat(MAPPER_TAB_PATH);
+  if (
+    cachedMapperTabSource?.mtimeMs === mtimeMs &&
+    cachedMapperTabSource.size === size
+  ) {
+    return cachedMapperTabSource.source;
+  }
+
+  const source = await fs.readFile(MAPPER_TAB_PATH, 'utf8');
+  const hash = createHash('sha256').update(source).digest('hex');
+  if (cachedMapperTabSource?.hash === hash) {
+    cachedMapperTabSource = {...cachedMapperTabSource, mtimeMs, size};
+    return cachedMapperTabSource.source;
+  }
+
+  debugInternal('Mapper tab source loaded, SHA-256:', hash);
+  cachedMapperTabSource = {source, hash, mtimeMs, size};
+  return source;
 }
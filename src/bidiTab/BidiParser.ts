@@ -33,7 +33,7 @@ export class BidiParser implements IBidiParser {
   }
   parseCaptureScreenshotParams(
     params: unknown
-  ): BrowsingContext.CaptureScreenshotParameters {
+  ): BrowsingContext.CaptureScreenshotParameters & Cdp.StreamParameters {
     return Parser.BrowsingContext.parseCaptureScreenshotParams(params);
   }
   parseCloseParams(params: unknown): BrowsingContext.CloseParameters {
@@ -53,7 +53,9 @@ export class BidiParser implements IBidiParser {
   parseNavigateParams(params: unknown): BrowsingContext.NavigateParameters {
     return Parser.BrowsingContext.parseNavigateParams(params);
   }
-  parsePrintParams(params: unknown): BrowsingContext.PrintParameters {
+  parsePrintParams(
+    params: unknown
+  ): BrowsingContext.PrintParameters & Cdp.StreamParameters {
     return Parser.BrowsingContext.parsePrintParams(params);
   }
   parseReloadParams(params: unknown): BrowsingContext.ReloadParameters {
@@ -73,9 +75,15 @@ export class BidiParser implements IBidiParser {
 
   // CDP domain
   // keep-sorted start block=yes
+  parseCloseStreamParams(params: unknown): Cdp.CloseStreamParameters {
+    return Parser.Cdp.parseCloseStreamRequest(params);
+  }
   parseGetSessionParams(params: unknown): Cdp.GetSessionParameters {
     return Parser.Cdp.parseGetSessionRequest(params);
   }
+  parseReadStreamParams(params: unknown): Cdp.ReadStreamParameters {
+    return Parser.Cdp.parseReadStreamRequest(params);
+  }
   parseSendCommandParams(params: unknown): Cdp.SendCommandParameters {
     return Parser.Cdp.parseSendCommandRequest(params);
   }
@@ -55,6 +55,11 @@ export class WindowBidiTransport implements BidiTransport {
     window.sendBidiResponse(json);
   }
 
+  sendSerializedMessage(json: string) {
+    log(WindowBidiTransport.LOGGER_PREFIX_SEND, json);
+    window.sendBidiResponse(json);
+  }
+
   close() {
     this.#onMessage = null;
     window.onBidiMessage = null;
@@ -43,7 +43,9 @@ declare global {
     // `window.sendBidiResponse` is exposed by `Runtime.addBinding` from the server side.
     sendBidiResponse: (response: string) => void;
 
-    // `window.onBidiMessage` is called via `Runtime.evaluate` from the server side.
+    // `window.onBidiMessage` is resolved once and then called via
+    // `Runtime.callFunctionOn` on its object id from the server side, so it
+    // must not be reassigned after the Mapper is launched.
     onBidiMessage: ((message: string) => void) | null;
 
     // Set from the server side if verbose logging is required.
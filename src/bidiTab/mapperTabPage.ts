@@ -14,8 +14,27 @@
  * See the License for the specific language governing permissions and
  * limitations under the License.
  */
+import {Buffer} from '../utils/Buffer.js';
 import {type LogPrefix, LogType} from '../utils/log.js';
 
+/** Maximum number of log entries kept in memory per log type. */
+const MAX_LOG_ENTRIES = 1000;
+/** Maximum number of the most recent log entries rendered per log type. */
+const MAX_RENDERED_ENTRIES = 100;
+
+type LogEntry = {
+  logPrefix: LogPrefix;
+  messages: unknown[];
+  /** Set once the entry is rendered for the first time. */
+  text?: string;
+};
+
+/** Maps log type to its most recent entries. */
+const logEntries = new Map<string, Buffer<LogEntry>>();
+/** Log types with entries added since the last render. */
+const dirtyLogTypes = new Set<string>();
+let renderScheduled = false;
+
 /** HTML source code for the user-facing Mapper tab. */
 const mapperPageSource =
   '<!DOCTYPE html><title>BiDi-CDP Mapper</title><style>body{font-family: Roboto, serif; font-size: 13px; color: #202124;}.log{padding: 12px; font-family: Menlo, Consolas, Monaco, Liberation Mono, Lucida Console, monospace; font-size: 11px; line-height: 180%; background: #f1f3f4; border-radius: 4px;}.pre{overflow-wrap: break-word; padding: 10px;}.card{margin: 60px auto; padding: 2px 0; max-width: 900px; box-shadow: 0 1px 4px rgba(0, 0, 0, 0.15), 0 1px 6px rgba(0, 0, 0, 0.2); border-radius: 8px;}.divider{height: 1px; background: #f0f0f0;}.item{padding: 16px 20px;}</style><div class="card"><div class="item"><h1>BiDi-CDP Mapper is controlling this tab</h1><p>Closing or reloading it will stop the BiDi process. <a target="_blank" title="BiDi-CDP Mapper GitHub Repository" href="https://github.com/GoogleChromeLabs/chromium-bidi">Details.</a></p></div><div class="divider"></div><details id="details"><summary class="item">Debug information</summary></details></div>';
@@ -28,7 +47,7 @@ const mapperPageSource =
  * <h3>${name}</h3>
  * <div id="${name}_log" class="log">
  */
-function findOrCreateTypeLogContainer(logPrefix: LogPrefix): HTMLElement {
+function findOrCreateTypeLogContainer(logPrefix: string): HTMLElement {
   const logType = logPrefix.split(':')[0];
   const containerId = `${logType}_log`;
 
@@ -51,6 +70,10 @@ function findOrCreateTypeLogContainer(logPrefix: LogPrefix): HTMLElement {
   return document.getElementById(containerId)!;
 }
 
+function getDetailsElement(): HTMLDetailsElement | null {
+  return document.getElementById('details') as HTMLDetailsElement | null;
+}
+
 export function generatePage() {
   // If run not in browser (e.g. unit test), do nothing.
   if (!globalThis.document.documentElement) {
@@ -62,6 +85,14 @@ export function generatePage() {
   findOrCreateTypeLogContainer(LogType.debugInfo);
   findOrCreateTypeLogContainer(LogType.bidi);
   findOrCreateTypeLogContainer(LogType.cdp);
+
+  // Logs are rendered only while the debug information is shown.
+  getDetailsElement()?.addEventListener('toggle', () => {
+    for (const logType of logEntries.keys()) {
+      dirtyLogTypes.add(logType);
+    }
+    scheduleRender();
+  });
 }
 
 function stringify(message: unknown) {
@@ -71,6 +102,44 @@ function stringify(message: unknown) {
   return message;
 }
 
+function scheduleRender() {
+  if (renderScheduled || !getDetailsElement()?.open) {
+    return;
+  }
+  renderScheduled = true;
+  requestAnimationFrame(renderLogs);
+}
+
+function renderLogs() {
+  renderScheduled = false;
+  if (!getDetailsElement()?.open) {
+    return;
+  }
+
+  for (const logType of dirtyLogTypes) {
+    const typeLogContainer = findOrCreateTypeLogContainer(logType);
+    const renderedEntries = logEntries
+      .get(logType)!
+      .get()
+      .slice(-MAX_RENDERED_ENTRIES);
+    const fragment = document.createDocumentFragment();
+    for (const entry of renderedEntries) {
+      // This piece of HTML should be added:
+      // <div class="pre">...log message...</div>
+      const lineElement = document.createElement('div');
+      lineElement.className = 'pre';
+      // Stringify lazily, as most of the entries are never displayed.
+      entry.text ??= [entry.logPrefix, ...entry.messages]
+        .map(stringify)
+        .join(' ');
+      lineElement.textContent = entry.text;
+      fragment.appendChild(lineElement);
+    }
+    typeLogContainer.replaceChildren(fragment);
+  }
+  dirtyLogTypes.clear();
+}
+
 export function log(logPrefix: LogPrefix, ...messages: unknown[]) {
   // If run not in browser (e.g. unit test), do nothing.
   if (!globalThis.document.documentElement) {
@@ -85,12 +154,13 @@ export function log(logPrefix: LogPrefix, ...messages: unknown[]) {
     );
   }
 
-  const typeLogContainer = findOrCreateTypeLogContainer(logPrefix);
-
-  // This piece of HTML should be added:
-  // <div class="pre">...log message...</div>
-  const lineElement = document.createElement('div');
-  lineElement.className = 'pre';
-  lineElement.textContent = [logPrefix, ...messages].map(stringify).join(' ');
-  typeLogContainer.appendChild(lineElement);
+  const logType = logPrefix.split(':')[0]!;
+  let entries = logEntries.get(logType);
+  if (entries === undefined) {
+    entries = new Buffer(MAX_LOG_ENTRIES);
+    logEntries.set(logType, entries);
+  }
+  entries.add({logPrefix, messages});
+  dirtyLogTypes.add(logType);
+  scheduleRender();
 }
@@ -95,6 +95,35 @@ describe('CdpConnection', () => {
     );
   });
 
+  it('forgets the commands in flight of a detached session', async () => {
+    const mockCdpServer = new StubTransport();
+    const cdpConnection = new CdpConnection(mockCdpServer);
+
+    void cdpConnection.sendCommand(
+      'Runtime.enable',
+      undefined,
+      SOME_SESSION_ID
+    );
+    void cdpConnection.sendCommand(
+      'Runtime.enable',
+      undefined,
+      ANOTHER_SESSION_ID
+    );
+    expect(cdpConnection.getInFlightCount(SOME_SESSION_ID)).to.equal(1);
+
+    await mockCdpServer.emulateIncomingMessage({
+      method: 'Target.detachedFromTarget',
+      params: {sessionId: SOME_SESSION_ID},
+    });
+
+    expect(cdpConnection.getInFlightCount(SOME_SESSION_ID)).to.equal(0);
+    expect(cdpConnection.getInFlightCount(ANOTHER_SESSION_ID)).to.equal(1);
+
+    // A late response does not make the count negative.
+    await mockCdpServer.emulateIncomingMessage({id: 0, result: {}});
+    expect(cdpConnection.getInFlightCount(SOME_SESSION_ID)).to.equal(0);
+  });
+
   it('routes event messages to the correct handler based on sessionId', async () => {
     const mockCdpServer = new StubTransport();
     const cdpConnection = new CdpConnection(mockCdpServer);
@@ -144,6 +173,62 @@ describe('CdpConnection', () => {
     otherSessionCallback.resetHistory();
   });
 
+  it('dedupes identical enable commands in flight', async () => {
+    const mockCdpServer = new StubTransport();
+    const cdpConnection = new CdpConnection(mockCdpServer);
+
+    const first = cdpConnection.sendCommand(
+      'Runtime.enable',
+      undefined,
+      SOME_SESSION_ID
+    );
+    const second = cdpConnection.sendCommand(
+      'Runtime.enable',
+      undefined,
+      SOME_SESSION_ID
+    );
+    // Another session is enabled separately.
+    void cdpConnection.sendCommand(
+      'Runtime.enable',
+      undefined,
+      ANOTHER_SESSION_ID
+    );
+
+    expect(second).to.equal(first);
+    sinon.assert.calledTwice(mockCdpServer.sendMessage);
+    expect(cdpConnection.getInFlightCount(SOME_SESSION_ID)).to.equal(1);
+    expect(cdpConnection.getInFlightCount(ANOTHER_SESSION_ID)).to.equal(1);
+
+    await mockCdpServer.emulateIncomingMessage({id: 0, result: {}});
+    await expect(second).to.eventually.deep.equal({});
+    expect(cdpConnection.getInFlightCount(SOME_SESSION_ID)).to.equal(0);
+
+    // Once the response is received, the domain is enabled again.
+    void cdpConnection.sendCommand(
+      'Runtime.enable',
+      undefined,
+      SOME_SESSION_ID
+    );
+    sinon.assert.calledThrice(mockCdpServer.sendMessage);
+  });
+
+  it('does not dedupe enable commands with different params or after disable', () => {
+    const mockCdpServer = new StubTransport();
+    const cdpConnection = new CdpConnection(mockCdpServer);
+
+    void cdpConnection.sendCommand('Fetch.enable', {patterns: []});
+    void cdpConnection.sendCommand('Fetch.enable', {
+      patterns: [{urlPattern: '*'}],
+    });
+    void cdpConnection.sendCommand('Fetch.disable');
+    void cdpConnection.sendCommand('Fetch.enable', {
+      patterns: [{urlPattern: '*'}],
+    });
+
+    sinon.assert.callCount(mockCdpServer.sendMessage, 4);
+    expect(cdpConnection.getInFlightCount()).to.equal(4);
+  });
+
   it('closes the transport connection when closed', () => {
     const mockCdpServer = new StubTransport();
     const cdpConnection = new CdpConnection(mockCdpServer);
@@ -28,6 +28,12 @@ interface CdpCallbacks {
   resolve: (result: CdpMessage<any>['result']) => void;
   reject: (error: object) => void;
   error: Error;
+  sessionId: Protocol.Target.SessionID | undefined;
+}
+
+interface InFlightEnable {
+  params: string;
+  result: Promise<object>;
 }
 
 export interface ICdpConnection {
@@ -54,6 +60,21 @@ export class CdpConnection implements ICdpConnection {
     CdpClient
   >();
   readonly #commandCallbacks = new Map<number, CdpCallbacks>();
+  /**
+   * Map from session ID to the number of commands waiting for a response.
+   * `undefined` points to the main browser session.
+   */
+  readonly #inFlightCounts = new Map<
+    Protocol.Target.SessionID | undefined,
+    number
+  >();
+  /**
+   * Map from session ID and domain to the last `<Domain>.enable` command in
+   * flight. Enabling a domain is idempotent, so an identical enable sent
+   * while the previous one is in flight shares its result instead of being
+   * sent again.
+   */
+  readonly #inFlightEnables = new Map<string, InFlightEnable>();
   readonly #logger?: LoggerFn;
   #nextId = 0;
 
@@ -73,6 +94,8 @@ export class CdpConnection implements ICdpConnection {
       reject(error);
     }
     this.#commandCallbacks.clear();
+    this.#inFlightCounts.clear();
+    this.#inFlightEnables.clear();
     this.#sessionCdpClients.clear();
   }
 
@@ -95,10 +118,48 @@ export class CdpConnection implements ICdpConnection {
     return cdpClient;
   }
 
+  /** Returns the number of commands waiting for a response in the session. */
+  getInFlightCount(sessionId?: Protocol.Target.SessionID): number {
+    return this.#inFlightCounts.get(sessionId) ?? 0;
+  }
+
   sendCommand<CdpMethod extends keyof ProtocolMapping.Commands>(
     method: CdpMethod,
     params?: ProtocolMapping.Commands[CdpMethod]['paramsType'][0],
     sessionId?: Protocol.Target.SessionID
+  ): Promise<object> {
+    const [domain, command] = method.split('.');
+    if (command !== 'enable' && command !== 'disable') {
+      return this.#sendCommand(method, params, sessionId);
+    }
+
+    const enableKey = `${sessionId ?? ''}:${domain}`;
+    if (command === 'disable') {
+      this.#inFlightEnables.delete(enableKey);
+      return this.#sendCommand(method, params, sessionId);
+    }
+
+    const serializedParams = JSON.stringify(params ?? {});
+    const inFlight = this.#inFlightEnables.get(enableKey);
+    if (inFlight?.params === serializedParams) {
+      return inFlight.result;
+    }
+    const result = this.#sendCommand(method, params, sessionId);
+    const enable = {params: serializedParams, result};
+    this.#inFlightEnables.set(enableKey, enable);
+    const cleanUp = () => {
+      if (this.#inFlightEnables.get(enableKey) === enable) {
+        this.#inFlightEnables.delete(enableKey);
+      }
+    };
+    result.then(cleanUp, cleanUp);
+    return result;
+  }
+
+  #sendCommand<CdpMethod extends keyof ProtocolMapping.Commands>(
+    method: CdpMethod,
+    params?: ProtocolMapping.Commands[CdpMethod]['paramsType'][0],
+    sessionId?: Protocol.Target.SessionID
   ): Promise<object> {
     return new Promise((resolve, reject) => {
       const id = this.#nextId++;
@@ -110,7 +171,12 @@ export class CdpConnection implements ICdpConnection {
             sessionId ?? ''
           } call rejected because the connection has been closed.`
         ),
+        sessionId,
       });
+      this.#inFlightCounts.set(
+        sessionId,
+        (this.#inFlightCounts.get(sessionId) ?? 0) + 1
+      );
       const cdpMessage: CdpMessage<CdpMethod> = {id, method, params};
       if (sessionId) {
         cdpMessage.sessionId = sessionId;
@@ -142,6 +208,7 @@ export class CdpConnection implements ICdpConnection {
       const callbacks = this.#commandCallbacks.get(message.id);
       this.#commandCallbacks.delete(message.id);
       if (callbacks) {
+        this.#decrementInFlightCount(callbacks.sessionId);
         if (message.result) {
           callbacks.resolve(message.result);
         } else if (message.error) {
@@ -163,10 +230,26 @@ export class CdpConnection implements ICdpConnection {
           this.#sessionCdpClients.delete(sessionId);
           client.removeAllListeners();
         }
+        // Responses to the commands of a detached session may never arrive.
+        this.#inFlightCounts.delete(sessionId);
+        for (const key of this.#inFlightEnables.keys()) {
+          if (key.startsWith(`${sessionId}:`)) {
+            this.#inFlightEnables.delete(key);
+          }
+        }
       }
     }
   };
 
+  #decrementInFlightCount(sessionId: Protocol.Target.SessionID | undefined) {
+    const count = (this.#inFlightCounts.get(sessionId) ?? 1) - 1;
+    if (count === 0) {
+      this.#inFlightCounts.delete(sessionId);
+    } else {
+      this.#inFlightCounts.set(sessionId, count);
+    }
+  }
+
   /**
    * Creates a new CdpClient instance for the given session ID.
    * @param sessionId either a string, or undefined for the main browser session.
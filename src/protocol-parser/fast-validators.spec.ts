@@ -0,0 +1,441 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+import {isDeepStrictEqual} from 'util';
+
+import {expect} from 'chai';
+import type {ZodType} from 'zod';
+
+import * as FastValidators from './fast-validators.js';
+import * as WebDriverBidi from './webdriver-bidi.js';
+
+const SAMPLE_COUNT = 2000;
+
+const STRINGS = ['', 'a', 'context', 'handle', 'Ω', 'pause', 'viewport'];
+const NUMBERS = [0, 1, 42, -1, 0.5, 359, 360, 1.6, 6.3, 2 ** 53, -(2 ** 53)];
+const KEYS = [
+  'type',
+  'value',
+  'handle',
+  'sharedId',
+  'context',
+  'realm',
+  'sandbox',
+  'duration',
+  'origin',
+  'unknown',
+];
+
+type Json = null | boolean | number | string | Json[] | {[key: string]: Json};
+type JsonObject = {[key: string]: Json};
+
+/** Generates random values from a seed, so that failures are reproducible. */
+class RandomGenerator {
+  #state: number;
+
+  constructor(seed: number) {
+    this.#state = seed;
+  }
+
+  /** Returns a number in [0, 1). Mulberry32. */
+  next(): number {
+    this.#state = (this.#state + 0x6d2b79f5) | 0;
+    let t = this.#state;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  }
+
+  int(max: number): number {
+    return Math.floor(this.next() * max);
+  }
+
+  bool(): boolean {
+    return this.next() < 0.5;
+  }
+
+  pick<T>(items: readonly T[]): T {
+    return items[this.int(items.length)]!;
+  }
+
+  string(): string {
+    return this.pick(STRINGS);
+  }
+
+  array<T>(generate: () => T, maxLength = 4): T[] {
+    return Array.from({length: this.int(maxLength + 1)}, generate);
+  }
+
+  /** Returns an object with the given entries, skipping the undefined ones. */
+  object(entries: Record<string, Json | undefined>): JsonObject {
+    const object: JsonObject = {};
+    for (const [key, value] of Object.entries(entries)) {
+      if (value !== undefined) {
+        object[key] = value;
+      }
+    }
+    return object;
+  }
+
+  optional<T>(generate: () => T): T | undefined {
+    return this.bool() ? generate() : undefined;
+  }
+
+  junk(): Json {
+    return this.pick<() => Json>([
+      () => null,
+      () => this.bool(),
+      () => this.string(),
+      () => this.pick(NUMBERS),
+      () => [],
+      () => ({}),
+      () => ({type: 'pause'}),
+      () => this.localValue(1),
+    ])();
+  }
+
+  target(): JsonObject {
+    return this.bool()
+      ? {realm: this.string()}
+      : this.object({
+          context: this.string(),
+          sandbox: this.optional(() => this.string()),
+        });
+  }
+
+  serializationOptions(): JsonObject {
+    return this.object({
+      maxDomDepth: this.optional(() => this.pick([0, 1, null])),
+      maxObjectDepth: this.optional(() => this.pick([0, 10, null])),
+      includeShadowTree: this.optional(() =>
+        this.pick(['none', 'open', 'all'])
+      ),
+    });
+  }
+
+  localValue(depth: number): JsonObject {
+    const generators: (() => JsonObject)[] = [
+      () => ({type: this.pick(['undefined', 'null'])}),
+      () => ({
+        type: this.pick(['string', 'bigint', 'date']),
+        value: this.string(),
+      }),
+      () => ({
+        type: 'number',
+        value: this.pick<Json>([...NUMBERS, 'NaN', '-0', 'Infinity']),
+      }),
+      () => ({type: 'boolean', value: this.bool()}),
+      () => ({type: 'regexp', value: this.object({pattern: this.string()})}),
+      () =>
+        this.object({
+          sharedId: this.string(),
+          handle: this.optional(() => this.string()),
+        }),
+      () => ({handle: this.string()}),
+      () => ({
+        type: 'channel',
+        value: this.object({
+          channel: this.string(),
+          serializationOptions: this.optional(() =>
+            this.serializationOptions()
+          ),
+          ownership: this.optional(() => this.pick(['root', 'none'])),
+        }),
+      }),
+    ];
+    if (depth > 0) {
+      generators.push(
+        () => ({
+          type: this.pick(['array', 'set']),
+          value: this.array(() => this.localValue(depth - 1)),
+        }),
+        () => ({
+          type: this.pick(['map', 'object']),
+          value: this.array(() => [
+            this.bool() ? this.string() : this.localValue(depth - 1),
+            this.localValue(depth - 1),
+          ]),
+        })
+      );
+    }
+    return this.pick(generators)();
+  }
+
+  evaluateParameters(): JsonObject {
+    return this.object({
+      expression: this.string(),
+      target: this.target(),
+      awaitPromise: this.bool(),
+      resultOwnership: this.optional(() => this.pick(['root', 'none'])),
+      serializationOptions: this.optional(() => this.serializationOptions()),
+      userActivation: this.optional(() => this.bool()),
+    });
+  }
+
+  callFunctionParameters(): JsonObject {
+    return this.object({
+      functionDeclaration: this.string(),
+      awaitPromise: this.bool(),
+      target: this.target(),
+      arguments: this.optional(() => this.array(() => this.localValue(2))),
+      resultOwnership: this.optional(() => this.pick(['root', 'none'])),
+      serializationOptions: this.optional(() => this.serializationOptions()),
+      this: this.optional(() => this.localValue(2)),
+      userActivation: this.optional(() => this.bool()),
+    });
+  }
+
+  continueRequestParameters(): JsonObject {
+    const bytesValue = () => ({
+      type: this.pick(['string', 'base64']),
+      value: this.string(),
+    });
+    const header = () => ({name: this.string(), value: bytesValue()});
+    return this.object({
+      request: this.string(),
+      body: this.optional(bytesValue),
+      cookies: this.optional(() => this.array(header)),
+      headers: this.optional(() => this.array(header)),
+      method: this.optional(() => this.string()),
+      url: this.optional(() => this.string()),
+    });
+  }
+
+  performActionsParameters(): JsonObject {
+    const pause = () =>
+      this.object({
+        type: 'pause',
+        duration: this.optional(() => this.pick([0, 10])),
+      });
+    const origin = () =>
+      this.pick<() => Json>([
+        () => 'viewport',
+        () => 'pointer',
+        () => ({type: 'element', element: {sharedId: this.string()}}),
+      ])();
+    const pointerCommonProperties = () => ({
+      width: this.optional(() => this.pick([0, 1, 2])),
+      pressure: this.optional(() => this.pick([0, 0.5])),
+      twist: this.optional(() => this.pick([0, 359])),
+      altitudeAngle: this.optional(() => this.pick([0, 1.5])),
+      azimuthAngle: this.optional(() => this.pick([0, 6.2])),
+    });
+    const pointerAction = () =>
+      this.pick<() => JsonObject>([
+        pause,
+        () =>
+          this.object({
+            type: this.pick(['pointerDown', 'pointerUp']),
+            button: this.pick([0, 1, 2]),
+            ...pointerCommonProperties(),
+          }),
+        () =>
+          this.object({
+            type: 'pointerMove',
+            x: this.pick([0, -10, 100]),
+            y: this.pick([0, 10]),
+            duration: this.optional(() => this.pick([0, 100])),
+            origin: this.optional(origin),
+            ...pointerCommonProperties(),
+          }),
+      ])();
+    const sourceActions = () =>
+      this.pick<() => JsonObject>([
+        () => ({type: 'none', id: this.string(), actions: this.array(pause)}),
+        () => ({
+          type: 'key',
+          id: this.string(),
+          actions: this.array(() =>
+            this.bool()
+              ? pause()
+              : {type: this.pick(['keyDown', 'keyUp']), value: this.string()}
+          ),
+        }),
+        () =>
+          this.object({
+            type: 'pointer',
+            id: this.string(),
+            parameters: this.optional(() =>
+              this.object({
+                pointerType: this.optional(() =>
+                  this.pick(['mouse', 'pen', 'touch'])
+                ),
+              })
+            ),
+            actions: this.array(pointerAction),
+          }),
+        () => ({
+          type: 'wheel',
+          id: this.string(),
+          actions: this.array(() =>
+            this.bool()
+              ? pause()
+              : this.object({
+                  type: 'scroll',
+                  x: this.pick([0, 10]),
+                  y: this.pick([0, -10]),
+                  deltaX: this.pick([0, 5]),
+                  deltaY: this.pick([0, -5]),
+                  duration: this.optional(() => this.pick([0, 100])),
+                  origin: this.optional(origin),
+                })
+          ),
+        }),
+      ])();
+    return {context: this.string(), actions: this.array(sourceActions)};
+  }
+
+  /** Applies a random change to a random object or array in the value. */
+  mutate(value: Json): Json {
+    const containers: (Json[] | JsonObject)[] = [];
+    const collect = (node: Json) => {
+      if (typeof node === 'object' && node !== null) {
+        containers.push(node);
+        Object.values(node).forEach(collect);
+      }
+    };
+    collect(value);
+    if (containers.length === 0) {
+      return this.junk();
+    }
+
+    const container = this.pick(containers);
+    if (Array.isArray(container)) {
+      if (container.length > 0 && this.bool()) {
+        container[this.int(container.length)] = this.junk();
+      } else if (container.length > 0 && this.bool()) {
+        container.pop();
+      } else {
+        container.push(this.junk());
+      }
+      return value;
+    }
+
+    const keys = Object.keys(container);
+    if (keys.length > 0 && this.bool()) {
+      const key = this.pick(keys);
+      if (this.bool()) {
+        delete container[key];
+      } else {
+        container[key] = this.junk();
+      }
+    } else {
+      container[this.pick(KEYS)] = this.junk();
+    }
+    return value;
+  }
+}
+
+/**
+ * Remote references are extensible, so zod accepts them with extra keys, and
+ * the fast path does not.
+ */
+function hasExtendedReference(value: unknown): boolean {
+  if (typeof value !== 'object' || value === null) {
+    return false;
+  }
+  const keys = Object.keys(value);
+  if (
+    keys.some((key) => key !== 'sharedId' && key !== 'handle') &&
+    ('sharedId' in value || 'handle' in value)
+  ) {
+    return true;
+  }
+  return Object.values(value).some(hasExtendedReference);
+}
+
+function testEquivalence(
+  schema: ZodType,
+  isValid: (value: unknown) => boolean,
+  generate: (random: RandomGenerator) => JsonObject
+) {
+  it('should accept the valid values', () => {
+    const random = new RandomGenerator(1);
+    for (let i = 0; i < SAMPLE_COUNT; i++) {
+      const value = generate(random);
+      const result = schema.safeParse(value);
+      expect(result.success, JSON.stringify(value)).to.be.true;
+      expect(isValid(value), JSON.stringify(value)).to.be.true;
+    }
+  });
+
+  it('should match zod on the mutated values', () => {
+    const random = new RandomGenerator(2);
+    let rejected = 0;
+    for (let i = 0; i < SAMPLE_COUNT; i++) {
+      let value: Json = generate(random);
+      for (let j = random.int(3); j >= 0; j--) {
+        value = random.mutate(value);
+      }
+      const result = schema.safeParse(value);
+      const exactMatch =
+        result.success && isDeepStrictEqual(result.data, value);
+      if (isValid(value)) {
+        expect(result.success, JSON.stringify(value)).to.be.true;
+        expect(result.data, JSON.stringify(value)).to.deep.equal(value);
+      } else {
+        rejected++;
+        expect(
+          exactMatch && !hasExtendedReference(value),
+          JSON.stringify(value)
+        ).to.be.false;
+      }
+    }
+    // Make sure the mutations are not all harmless.
+    expect(rejected).to.be.greaterThan(SAMPLE_COUNT / 4);
+  });
+}
+
+describe('FastValidators', () => {
+  describe('Script.isEvaluateParameters', () => {
+    testEquivalence(
+      WebDriverBidi.Script.EvaluateParametersSchema,
+      FastValidators.Script.isEvaluateParameters,
+      (random) => random.evaluateParameters()
+    );
+  });
+
+  describe('Script.isCallFunctionParameters', () => {
+    testEquivalence(
+      WebDriverBidi.Script.CallFunctionParametersSchema,
+      FastValidators.Script.isCallFunctionParameters,
+      (random) => random.callFunctionParameters()
+    );
+  });
+
+  describe('Network.isContinueRequestParameters', () => {
+    testEquivalence(
+      WebDriverBidi.Network.ContinueRequestParametersSchema,
+      FastValidators.Network.isContinueRequestParameters,
+      (random) => random.continueRequestParameters()
+    );
+  });
+
+  describe('Input.isPerformActionsParameters', () => {
+    testEquivalence(
+      WebDriverBidi.Input.PerformActionsParametersSchema,
+      FastValidators.Input.isPerformActionsParameters,
+      (random) => random.performActionsParameters()
+    );
+  });
+
+  it('should reject values which are not plain objects', () => {
+    for (const value of [null, undefined, 'a', 1, [], new Date()]) {
+      expect(FastValidators.Script.isEvaluateParameters(value)).to.be.false;
+    }
+  });
+});
@@ -0,0 +1,476 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/**
+ * @fileoverview Hand-specialized validators for the parameters of the hot
+ * commands, mirroring the schemas in `./webdriver-bidi.ts`.
+ *
+ * A validator returns true only if the zod schema accepts the value and
+ * returns a value deeply equal to it, i.e. the value has no unknown keys to be
+ * stripped. In that case the value can be used as is. Otherwise, the value has
+ * to be parsed by zod, which also provides the error messages.
+ */
+
+type Validator = (value: unknown) => boolean;
+
+function isKnownObject(
+  value: unknown,
+  keys: ReadonlySet<string>
+): value is Record<string, unknown> {
+  if (
+    typeof value !== 'object' ||
+    value === null ||
+    Object.getPrototypeOf(value) !== Object.prototype
+  ) {
+    return false;
+  }
+  for (const key in value) {
+    if (!keys.has(key)) {
+      return false;
+    }
+  }
+  return true;
+}
+
+function isArrayOf(value: unknown, isItem: Validator): boolean {
+  if (!Array.isArray(value)) {
+    return false;
+  }
+  for (const item of value) {
+    if (!isItem(item)) {
+      return false;
+    }
+  }
+  return true;
+}
+
+function isOptional(value: unknown, isValue: Validator): boolean {
+  return value === undefined || isValue(value);
+}
+
+function isString(value: unknown): value is string {
+  return typeof value === 'string';
+}
+
+function isBoolean(value: unknown): value is boolean {
+  return typeof value === 'boolean';
+}
+
+function isNumber(value: unknown): value is number {
+  // `z.number()` rejects NaN.
+  return typeof value === 'number' && !Number.isNaN(value);
+}
+
+function isNumberInRange(value: unknown, min: number, max: number): boolean {
+  return isNumber(value) && value >= min && value <= max;
+}
+
+function isJsInt(value: unknown): boolean {
+  return Number.isSafeInteger(value);
+}
+
+function isJsUint(value: unknown): boolean {
+  return Number.isSafeInteger(value) && (value as number) >= 0;
+}
+
+export namespace Script {
+  const REALM_TARGET_KEYS = new Set(['realm']);
+  const CONTEXT_TARGET_KEYS = new Set(['context', 'sandbox']);
+  const SERIALIZATION_OPTIONS_KEYS = new Set([
+    'maxDomDepth',
+    'maxObjectDepth',
+    'includeShadowTree',
+  ]);
+  const REFERENCE_KEYS = new Set(['sharedId', 'handle']);
+  const TYPE_KEYS = new Set(['type']);
+  const TYPE_AND_VALUE_KEYS = new Set(['type', 'value']);
+  const CHANNEL_PROPERTIES_KEYS = new Set([
+    'channel',
+    'serializationOptions',
+    'ownership',
+  ]);
+  const REGEXP_VALUE_KEYS = new Set(['pattern', 'flags']);
+  const SPECIAL_NUMBERS = new Set(['NaN', '-0', 'Infinity', '-Infinity']);
+  const SHADOW_TREES = new Set(['none', 'open', 'all']);
+  const EVALUATE_PARAMETERS_KEYS = new Set([
+    'expression',
+    'target',
+    'awaitPromise',
+    'resultOwnership',
+    'serializationOptions',
+    'userActivation',
+  ]);
+  const CALL_FUNCTION_PARAMETERS_KEYS = new Set([
+    'functionDeclaration',
+    'awaitPromise',
+    'target',
+    'arguments',
+    'resultOwnership',
+    'serializationOptions',
+    'this',
+    'userActivation',
+  ]);
+
+  function isTarget(value: unknown): boolean {
+    if (isKnownObject(value, REALM_TARGET_KEYS)) {
+      return isString(value['realm']);
+    }
+    return (
+      isKnownObject(value, CONTEXT_TARGET_KEYS) &&
+      isString(value['context']) &&
+      isOptional(value['sandbox'], isString)
+    );
+  }
+
+  function isResultOwnership(value: unknown): boolean {
+    return value === 'root' || value === 'none';
+  }
+
+  function isDepth(value: unknown): boolean {
+    return value === null || isJsUint(value);
+  }
+
+  function isSerializationOptions(value: unknown): boolean {
+    return (
+      isKnownObject(value, SERIALIZATION_OPTIONS_KEYS) &&
+      isOptional(value['maxDomDepth'], isDepth) &&
+      isOptional(value['maxObjectDepth'], isDepth) &&
+      isOptional(value['includeShadowTree'], (includeShadowTree) =>
+        SHADOW_TREES.has(includeShadowTree as string)
+      )
+    );
+  }
+
+  /**
+   * Remote references are extensible, so only the ones without extra keys
+   * are accepted.
+   */
+  export function isSharedReference(value: unknown): boolean {
+    return (
+      isKnownObject(value, REFERENCE_KEYS) &&
+      isString(value['sharedId']) &&
+      isOptional(value['handle'], isString)
+    );
+  }
+
+  function isRemoteReference(value: unknown): boolean {
+    return (
+      isKnownObject(value, REFERENCE_KEYS) &&
+      ((isString(value['sharedId']) &&
+        isOptional(value['handle'], isString)) ||
+        (isString(value['handle']) && isOptional(value['sharedId'], isString)))
+    );
+  }
+
+  function isChannelProperties(value: unknown): boolean {
+    return (
+      isKnownObject(value, CHANNEL_PROPERTIES_KEYS) &&
+      isString(value['channel']) &&
+      isOptional(value['serializationOptions'], isSerializationOptions) &&
+      isOptional(value['ownership'], isResultOwnership)
+    );
+  }
+
+  function isRegExpValue(value: unknown): boolean {
+    return (
+      isKnownObject(value, REGEXP_VALUE_KEYS) &&
+      isString(value['pattern']) &&
+      isOptional(value['flags'], isString)
+    );
+  }
+
+  function isMappingEntry(value: unknown): boolean {
+    return (
+      Array.isArray(value) &&
+      value.length === 2 &&
+      (isString(value[0]) || isLocalValue(value[0])) &&
+      isLocalValue(value[1])
+    );
+  }
+
+  export function isLocalValue(value: unknown): boolean {
+    if (!isKnownObject(value, TYPE_AND_VALUE_KEYS)) {
+      return isRemoteReference(value);
+    }
+    switch (value['type']) {
+      case 'undefined':
+      case 'null':
+        return isKnownObject(value, TYPE_KEYS);
+      case 'string':
+      case 'bigint':
+      case 'date':
+        return isString(value['value']);
+      case 'number':
+        return (
+          isNumber(value['value']) ||
+          SPECIAL_NUMBERS.has(value['value'] as string)
+        );
+      case 'boolean':
+        return isBoolean(value['value']);
+      case 'channel':
+        return isChannelProperties(value['value']);
+      case 'array':
+      case 'set':
+        return isArrayOf(value['value'], isLocalValue);
+      case 'map':
+      case 'object':
+        return isArrayOf(value['value'], isMappingEntry);
+      case 'regexp':
+        return isRegExpValue(value['value']);
+    }
+    return false;
+  }
+
+  export function isEvaluateParameters(value: unknown): boolean {
+    return (
+      isKnownObject(value, EVALUATE_PARAMETERS_KEYS) &&
+      isString(value['expression']) &&
+      isTarget(value['target']) &&
+      isBoolean(value['awaitPromise']) &&
+      isOptional(value['resultOwnership'], isResultOwnership) &&
+      isOptional(value['serializationOptions'], isSerializationOptions) &&
+      isOptional(value['userActivation'], isBoolean)
+    );
+  }
+
+  export function isCallFunctionParameters(value: unknown): boolean {
+    return (
+      isKnownObject(value, CALL_FUNCTION_PARAMETERS_KEYS) &&
+      isString(value['functionDeclaration']) &&
+      isBoolean(value['awaitPromise']) &&
+      isTarget(value['target']) &&
+      isOptional(value['arguments'], (args) => isArrayOf(args, isLocalValue)) &&
+      isOptional(value['resultOwnership'], isResultOwnership) &&
+      isOptional(value['serializationOptions'], isSerializationOptions) &&
+      isOptional(value['this'], isLocalValue) &&
+      isOptional(value['userActivation'], isBoolean)
+    );
+  }
+}
+
+export namespace Network {
+  const BYTES_VALUE_KEYS = new Set(['type', 'value']);
+  const HEADER_KEYS = new Set(['name', 'value']);
+  const CONTINUE_REQUEST_PARAMETERS_KEYS = new Set([
+    'request',
+    'body',
+    'cookies',
+    'headers',
+    'method',
+    'url',
+  ]);
+
+  function isBytesValue(value: unknown): boolean {
+    return (
+      isKnownObject(value, BYTES_VALUE_KEYS) &&
+      (value['type'] === 'string' || value['type'] === 'base64') &&
+      isString(value['value'])
+    );
+  }
+
+  /** Matches both `network.Header` and `network.CookieHeader`. */
+  function isHeader(value: unknown): boolean {
+    return (
+      isKnownObject(value, HEADER_KEYS) &&
+      isString(value['name']) &&
+      isBytesValue(value['value'])
+    );
+  }
+
+  function isHeaders(value: unknown): boolean {
+    return isArrayOf(value, isHeader);
+  }
+
+  export function isContinueRequestParameters(value: unknown): boolean {
+    return (
+      isKnownObject(value, CONTINUE_REQUEST_PARAMETERS_KEYS) &&
+      isString(value['request']) &&
+      isOptional(value['body'], isBytesValue) &&
+      isOptional(value['cookies'], isHeaders) &&
+      isOptional(value['headers'], isHeaders) &&
+      isOptional(value['method'], isString) &&
+      isOptional(value['url'], isString)
+    );
+  }
+}
+
+export namespace Input {
+  const PERFORM_ACTIONS_PARAMETERS_KEYS = new Set(['context', 'actions']);
+  const SOURCE_ACTIONS_KEYS = new Set(['type', 'id', 'actions']);
+  const POINTER_SOURCE_ACTIONS_KEYS = new Set([
+    'type',
+    'id',
+    'parameters',
+    'actions',
+  ]);
+  const POINTER_PARAMETERS_KEYS = new Set(['pointerType']);
+  const POINTER_TYPES = new Set(['mouse', 'pen', 'touch']);
+  const PAUSE_ACTION_KEYS = new Set(['type', 'duration']);
+  const KEY_ACTION_KEYS = new Set(['type', 'value']);
+  const POINTER_COMMON_PROPERTIES_KEYS = [
+    'width',
+    'height',
+    'pressure',
+    'tangentialPressure',
+    'twist',
+    'altitudeAngle',
+    'azimuthAngle',
+  ];
+  const POINTER_BUTTON_ACTION_KEYS = new Set([
+    'type',
+    'button',
+    ...POINTER_COMMON_PROPERTIES_KEYS,
+  ]);
+  const POINTER_MOVE_ACTION_KEYS = new Set([
+    'type',
+    'x',
+    'y',
+    'duration',
+    'origin',
+    ...POINTER_COMMON_PROPERTIES_KEYS,
+  ]);
+  const SCROLL_ACTION_KEYS = new Set([
+    'type',
+    'x',
+    'y',
+    'deltaX',
+    'deltaY',
+    'duration',
+    'origin',
+  ]);
+  const ELEMENT_ORIGIN_KEYS = new Set(['type', 'element']);
+
+  function isOrigin(value: unknown): boolean {
+    if (value === 'viewport' || value === 'pointer') {
+      return true;
+    }
+    return (
+      isKnownObject(value, ELEMENT_ORIGIN_KEYS) &&
+      value['type'] === 'element' &&
+      Script.isSharedReference(value['element'])
+    );
+  }
+
+  function isPointerCommonProperties(value: Record<string, unknown>): boolean {
+    return (
+      isOptional(value['width'], isJsUint) &&
+      isOptional(value['height'], isJsUint) &&
+      isOptional(value['pressure'], isNumber) &&
+      isOptional(value['tangentialPressure'], isNumber) &&
+      isOptional(
+        value['twist'],
+        (twist) => Number.isInteger(twist) && isNumberInRange(twist, 0, 359)
+      ) &&
+      isOptional(value['altitudeAngle'], (angle) =>
+        isNumberInRange(angle, 0, Math.PI / 2)
+      ) &&
+      isOptional(value['azimuthAngle'], (angle) =>
+        isNumberInRange(angle, 0, 2 * Math.PI)
+      )
+    );
+  }
+
+  function isPauseAction(value: unknown): boolean {
+    return (
+      isKnownObject(value, PAUSE_ACTION_KEYS) &&
+      value['type'] === 'pause' &&
+      isOptional(value['duration'], isJsUint)
+    );
+  }
+
+  function isKeySourceAction(value: unknown): boolean {
+    if (isKnownObject(value, KEY_ACTION_KEYS)) {
+      if (value['type'] === 'keyDown' || value['type'] === 'keyUp') {
+        return isString(value['value']);
+      }
+    }
+    return isPauseAction(value);
+  }
+
+  function isPointerSourceAction(value: unknown): boolean {
+    if (isKnownObject(value, POINTER_BUTTON_ACTION_KEYS)) {
+      if (value['type'] === 'pointerDown' || value['type'] === 'pointerUp') {
+        return isJsUint(value['button']) && isPointerCommonProperties(value);
+      }
+    }
+    if (isKnownObject(value, POINTER_MOVE_ACTION_KEYS)) {
+      if (value['type'] === 'pointerMove') {
+        return (
+          isJsInt(value['x']) &&
+          isJsInt(value['y']) &&
+          isOptional(value['duration'], isJsUint) &&
+          isOptional(value['origin'], isOrigin) &&
+          isPointerCommonProperties(value)
+        );
+      }
+    }
+    return isPauseAction(value);
+  }
+
+  function isWheelSourceAction(value: unknown): boolean {
+    if (isKnownObject(value, SCROLL_ACTION_KEYS)) {
+      if (value['type'] === 'scroll') {
+        return (
+          isJsInt(value['x']) &&
+          isJsInt(value['y']) &&
+          isJsInt(value['deltaX']) &&
+          isJsInt(value['deltaY']) &&
+          isOptional(value['duration'], isJsUint) &&
+          isOptional(value['origin'], isOrigin)
+        );
+      }
+    }
+    return isPauseAction(value);
+  }
+
+  function isPointerParameters(value: unknown): boolean {
+    return (
+      isKnownObject(value, POINTER_PARAMETERS_KEYS) &&
+      isOptional(value['pointerType'], (pointerType) =>
+        POINTER_TYPES.has(pointerType as string)
+      )
+    );
+  }
+
+  function isSourceActions(value: unknown): boolean {
+    if (isKnownObject(value, SOURCE_ACTIONS_KEYS) && isString(value['id'])) {
+      switch (value['type']) {
+        case 'none':
+          return isArrayOf(value['actions'], isPauseAction);
+        case 'key':
+          return isArrayOf(value['actions'], isKeySourceAction);
+        case 'wheel':
+          return isArrayOf(value['actions'], isWheelSourceAction);
+      }
+    }
+    return (
+      isKnownObject(value, POINTER_SOURCE_ACTIONS_KEYS) &&
+      value['type'] === 'pointer' &&
+      isString(value['id']) &&
+      isOptional(value['parameters'], isPointerParameters) &&
+      isArrayOf(value['actions'], isPointerSourceAction)
+    );
+  }
+
+  export function isPerformActionsParameters(value: unknown): boolean {
+    return (
+      isKnownObject(value, PERFORM_ACTIONS_PARAMETERS_KEYS) &&
+      isString(value['context']) &&
+      isArrayOf(value['actions'], isSourceActions)
+    );
+  }
+}
@@ -24,12 +24,21 @@ import {z, type ZodType} from 'zod';
 import type * as Protocol from '../protocol/protocol.js';
 import {InvalidArgumentException} from '../protocol/protocol.js';
 
+import * as FastValidators from './fast-validators.js';
 import * as WebDriverBidi from './webdriver-bidi.js';
 
+/**
+ * @param isValid Optional fast path. If it accepts the object, zod would
+ * return an equal object, so the object is returned as is.
+ */
 export function parseObject<T extends ZodType>(
   obj: unknown,
-  schema: T
+  schema: T,
+  isValid?: (obj: unknown) => boolean
 ): z.infer<T> {
+  if (isValid?.(obj)) {
+    return obj as z.infer<T>;
+  }
   const parseResult = schema.safeParse(obj);
   if (parseResult.success) {
     return parseResult.data;
@@ -57,7 +66,8 @@ export namespace Network {
   export function parseContinueRequestParameters(params: unknown) {
     return parseObject(
       params,
-      WebDriverBidi.Network.ContinueRequestParametersSchema
+      WebDriverBidi.Network.ContinueRequestParametersSchema,
+      FastValidators.Network.isContinueRequestParameters
     );
   }
 
@@ -108,7 +118,8 @@ export namespace Script {
   export function parseEvaluateParams(params: unknown) {
     return parseObject(
       params,
-      WebDriverBidi.Script.EvaluateParametersSchema
+      WebDriverBidi.Script.EvaluateParametersSchema,
+      FastValidators.Script.isEvaluateParameters
     ) as Protocol.Script.EvaluateParameters;
   }
 
@@ -135,7 +146,8 @@ export namespace Script {
   export function parseCallFunctionParams(params: unknown) {
     return parseObject(
       params,
-      WebDriverBidi.Script.CallFunctionParametersSchema
+      WebDriverBidi.Script.CallFunctionParametersSchema,
+      FastValidators.Script.isCallFunctionParameters
     ) as Protocol.Script.CallFunctionParameters;
   }
 }
@@ -190,19 +202,24 @@ export namespace BrowsingContext {
 
   export function parseCaptureScreenshotParams(
     params: unknown
-  ): Protocol.BrowsingContext.CaptureScreenshotParameters {
+  ): Protocol.BrowsingContext.CaptureScreenshotParameters &
+    Protocol.Cdp.StreamParameters {
     return parseObject(
       params,
-      WebDriverBidi.BrowsingContext.CaptureScreenshotParametersSchema
+      WebDriverBidi.BrowsingContext.CaptureScreenshotParametersSchema.and(
+        Cdp.StreamParametersSchema
+      )
     );
   }
 
   export function parsePrintParams(
     params: unknown
-  ): Protocol.BrowsingContext.PrintParameters {
+  ): Protocol.BrowsingContext.PrintParameters & Protocol.Cdp.StreamParameters {
     return parseObject(
       params,
-      WebDriverBidi.BrowsingContext.PrintParametersSchema
+      WebDriverBidi.BrowsingContext.PrintParametersSchema.and(
+        Cdp.StreamParametersSchema
+      )
     );
   }
 
@@ -247,7 +264,8 @@ export namespace Input {
   export function parsePerformActionsParams(params: unknown) {
     return parseObject(
       params,
-      WebDriverBidi.Input.PerformActionsParametersSchema
+      WebDriverBidi.Input.PerformActionsParametersSchema,
+      FastValidators.Input.isPerformActionsParameters
     ) as Protocol.Input.PerformActionsParameters;
   }
 
@@ -275,6 +293,19 @@ export namespace Cdp {
     context: WebDriverBidi.BrowsingContext.BrowsingContextSchema,
   });
 
+  export const StreamParametersSchema = z.object({
+    'goog:stream': z.boolean().optional(),
+  });
+
+  const ReadStreamRequestSchema = z.object({
+    stream: z.string(),
+    size: WebDriverBidi.JsUintSchema.optional(),
+  });
+
+  const CloseStreamRequestSchema = z.object({
+    stream: z.string(),
+  });
+
   export function parseSendCommandRequest(
     params: unknown
   ): Protocol.Cdp.SendCommandParameters {
@@ -289,4 +320,16 @@ export namespace Cdp {
   ): Protocol.Cdp.GetSessionParameters {
     return parseObject(params, GetSessionRequestSchema);
   }
+
+  export function parseReadStreamRequest(
+    params: unknown
+  ): Protocol.Cdp.ReadStreamParameters {
+    return parseObject(params, ReadStreamRequestSchema);
+  }
+
+  export function parseCloseStreamRequest(
+    params: unknown
+  ): Protocol.Cdp.CloseStreamParameters {
+    return parseObject(params, CloseStreamRequestSchema);
+  }
 }
@@ -17,7 +17,12 @@
 import type {Protocol} from 'devtools-protocol';
 import type {ProtocolMapping} from 'devtools-protocol/types/protocol-mapping.js';
 
-import type {BrowsingContext, JsUint} from './webdriver-bidi.js';
+import type {
+  BrowsingContext,
+  EmptyParams,
+  EmptyResult,
+  JsUint,
+} from './webdriver-bidi.js';
 
 export type EventNames = Event['method'];
 
@@ -26,14 +31,24 @@ export type Message = CommandResponse | Event;
 export type Command = {
   id: JsUint;
 } & CommandData;
-export type CommandData = SendCommandCommand | GetSessionCommand;
+export type CommandData =
+  | SendCommandCommand
+  | GetSessionCommand
+  | ReadStreamCommand
+  | CloseStreamCommand
+  | GetEventBufferStatsCommand;
 
 export type CommandResponse = {
   type: 'success';
   id: JsUint;
   result: ResultData;
 };
-export type ResultData = SendCommandResult | GetSessionResult;
+export type ResultData =
+  | SendCommandResult
+  | GetSessionResult
+  | ReadStreamResult
+  | GetEventBufferStatsResult
+  | EmptyResult;
 
 export type SendCommandCommand = {
   method: 'cdp.sendCommand';
@@ -67,6 +82,65 @@ export type GetSessionResult = {
   session?: Protocol.Target.SessionID;
 };
 
+/**
+ * Chromium-specific parameter of `browsingContext.print` and
+ * `browsingContext.captureScreenshot`. If set, the command returns an empty
+ * `data` and a stream to read the data from in chunks.
+ */
+export type StreamParameters = {
+  'goog:stream'?: boolean;
+};
+
+export type StreamResult = {
+  'goog:stream'?: StreamHandle;
+};
+
+export type StreamHandle = string;
+
+export type ReadStreamCommand = {
+  method: 'cdp.readStream';
+  params: ReadStreamParameters;
+};
+
+export type ReadStreamParameters = {
+  stream: StreamHandle;
+  /** Maximum number of bytes to read. */
+  size?: JsUint;
+};
+
+/** Mirrors the result of CDP `IO.read`. */
+export type ReadStreamResult = {
+  data: string;
+  base64Encoded?: boolean;
+  eof: boolean;
+};
+
+export type CloseStreamCommand = {
+  method: 'cdp.closeStream';
+  params: CloseStreamParameters;
+};
+
+export type CloseStreamParameters = {
+  stream: StreamHandle;
+};
+
+export type GetEventBufferStatsCommand = {
+  method: 'cdp.getEventBufferStats';
+  params: EmptyParams;
+};
+
+/** Occupancy of the buffers of the events sent on subscription. */
+export type GetEventBufferStatsResult = {
+  /** Number of buffered events. */
+  events: JsUint;
+  /** Size of the buffered events, in characters of their JSON. */
+  size: JsUint;
+  /** Budget for the size of all the buffered events. */
+  maxSize: JsUint;
+  /** Number of browsing contexts with buffered events. */
+  contexts: JsUint;
+};
+
 export type Event = {
   type: 'event';
 } & EventData;
@@ -42,4 +42,14 @@ describe('Buffer', () => {
     buffer.add(3);
     sinon.assert.calledOnceWithExactly(onRemoved, 1);
   });
+
+  it('should shift the oldest value without calling `onItemRemoved`', () => {
+    const onRemoved = sinon.mock();
+    const buffer = new Buffer<number>(2, onRemoved);
+    buffer.add(1);
+    buffer.add(2);
+    expect(buffer.shift()).to.equal(1);
+    expect(buffer.get()).to.deep.equal([2]);
+    sinon.assert.notCalled(onRemoved);
+  });
 });
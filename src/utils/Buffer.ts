@@ -15,10 +15,11 @@
  * limitations under the License.
  */
 
+import {RingBuffer} from './RingBuffer.js';
+
 /** Implements a FIFO buffer with a fixed size. */
-export class Buffer<T> {
-  readonly #capacity: number;
-  readonly #entries: T[] = [];
+export class Buffer<T> implements Iterable<T> {
+  readonly #entries: RingBuffer<T>;
   readonly #onItemRemoved?: (value: T) => void;
 
   /**
@@ -26,21 +27,36 @@ export class Buffer<T> {
    * @param onItemRemoved Delegate called for each removed element.
    */
   constructor(capacity: number, onItemRemoved?: (value: T) => void) {
-    this.#capacity = capacity;
+    this.#entries = new RingBuffer(capacity);
     this.#onItemRemoved = onItemRemoved;
   }
 
+  get length(): number {
+    return this.#entries.length;
+  }
+
+  /** Returns a copy of the buffered values, from the oldest to the newest. */
   get(): T[] {
-    return this.#entries;
+    return this.#entries.toArray();
   }
 
   add(value: T) {
-    this.#entries.push(value);
-    while (this.#entries.length > this.#capacity) {
-      const item = this.#entries.shift();
-      if (item !== undefined) {
-        this.#onItemRemoved?.(item);
-      }
+    const full = this.#entries.length === this.#entries.capacity;
+    const item = this.#entries.push(value);
+    if (full) {
+      this.#onItemRemoved?.(item as T);
     }
   }
+
+  /**
+   * Removes and returns the oldest value, if any. The removal delegate is not
+   * called.
+   */
+  shift(): T | undefined {
+    return this.#entries.shift();
+  }
+
+  [Symbol.iterator](): Iterator<T> {
+    return this.#entries[Symbol.iterator]();
+  }
 }
@@ -0,0 +1,58 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+import {expect} from 'chai';
+
+import {Deque} from './Deque.js';
+
+describe('Deque', () => {
+  it('should be FIFO', () => {
+    const deque = new Deque<number>();
+    expect(deque.shift()).to.equal(undefined);
+    deque.push(1);
+    deque.push(2);
+    expect(deque.peek()).to.equal(1);
+    expect(deque.shift()).to.equal(1);
+    expect(deque.shift()).to.equal(2);
+    expect(deque.length).to.equal(0);
+  });
+
+  it('should support both ends', () => {
+    const deque = new Deque<number>();
+    deque.push(2);
+    deque.unshift(1);
+    deque.push(3);
+    expect([...deque]).to.deep.equal([1, 2, 3]);
+    expect(deque.pop()).to.equal(3);
+    expect(deque.shift()).to.equal(1);
+    expect([...deque]).to.deep.equal([2]);
+  });
+
+  it('should keep the order when growing around the end', () => {
+    const deque = new Deque<number>();
+    const expected: number[] = [];
+    // Move the head forward, so the entries wrap around before growing.
+    for (let i = 0; i < 10; i++) {
+      deque.push(-1);
+      deque.shift();
+    }
+    for (let i = 0; i < 100; i++) {
+      deque.push(i);
+      expected.push(i);
+    }
+    expect([...deque]).to.deep.equal(expected);
+  });
+});
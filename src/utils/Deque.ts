@@ -0,0 +1,100 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+const INITIAL_CAPACITY = 16;
+
+/**
+ * Implements a double-ended queue backed by a growable circular array.
+ * Operations at both ends are amortized O(1), unlike `Array.shift` which is
+ * O(n).
+ */
+export class Deque<T> implements Iterable<T> {
+  #entries: (T | undefined)[] = new Array(INITIAL_CAPACITY);
+  /** Index of the first entry. The capacity is always a power of 2. */
+  #head = 0;
+  #length = 0;
+
+  get length(): number {
+    return this.#length;
+  }
+
+  /** Adds the value at the end. */
+  push(value: T) {
+    if (this.#length === this.#entries.length) {
+      this.#grow();
+    }
+    this.#entries[(this.#head + this.#length) & (this.#entries.length - 1)] =
+      value;
+    this.#length++;
+  }
+
+  /** Adds the value at the beginning. */
+  unshift(value: T) {
+    if (this.#length === this.#entries.length) {
+      this.#grow();
+    }
+    this.#head = (this.#head - 1) & (this.#entries.length - 1);
+    this.#entries[this.#head] = value;
+    this.#length++;
+  }
+
+  /** Removes and returns the first value. */
+  shift(): T | undefined {
+    if (this.#length === 0) {
+      return undefined;
+    }
+    const value = this.#entries[this.#head];
+    this.#entries[this.#head] = undefined;
+    this.#head = (this.#head + 1) & (this.#entries.length - 1);
+    this.#length--;
+    return value;
+  }
+
+  /** Removes and returns the last value. */
+  pop(): T | undefined {
+    if (this.#length === 0) {
+      return undefined;
+    }
+    this.#length--;
+    const index = (this.#head + this.#length) & (this.#entries.length - 1);
+    const value = this.#entries[index];
+    this.#entries[index] = undefined;
+    return value;
+  }
+
+  /** Returns the first value without removing it. */
+  peek(): T | undefined {
+    return this.#length === 0 ? undefined : this.#entries[this.#head];
+  }
+
+  *[Symbol.iterator](): Iterator<T> {
+    const mask = this.#entries.length - 1;
+    for (let i = 0; i < this.#length; i++) {
+      yield this.#entries[(this.#head + i) & mask] as T;
+    }
+  }
+
+  #grow() {
+    const entries = new Array<T | undefined>(this.#entries.length * 2);
+    const mask = this.#entries.length - 1;
+    for (let i = 0; i < this.#length; i++) {
+      entries[i] = this.#entries[(this.#head + i) & mask];
+    }
+    this.#entries = entries;
+    this.#head = 0;
+  }
+}
@@ -61,6 +61,27 @@ describe('ProcessingQueue', () => {
     expect(processedValues).to.deep.equal([1, 2, 3]);
   });
 
+  it('should only keep order within the same ordering key', async () => {
+    const processor = sinon.stub().returns(Promise.resolve());
+    const queue = new ProcessingQueue<number>(processor);
+    const slow = new Deferred<Result<number>>();
+
+    queue.add(slow, '', ['a']);
+    queue.add(Promise.resolve({kind: 'success', value: 2}), '', ['a', 'b']);
+    queue.add(Promise.resolve({kind: 'success', value: 3}), '', ['b']);
+    queue.add(Promise.resolve({kind: 'success', value: 4}), '', ['c']);
+    await wait(1);
+
+    expect(processor.getCalls().map((c) => c.firstArg)).to.deep.equal([4]);
+
+    slow.resolve({kind: 'success', value: 1});
+    await wait(1);
+
+    expect(processor.getCalls().map((c) => c.firstArg)).to.deep.equal([
+      4, 1, 2, 3,
+    ]);
+  });
+
   it('rejects should not stop processing with rejects from processor', async () => {
     const error = new Error('Processor reject');
     const processor = sinon.stub().returns(Promise.reject(error));
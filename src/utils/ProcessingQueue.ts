@@ -15,15 +15,36 @@
  * limitations under the License.
  */
 
+import {Deque} from './Deque.js';
 import {LogType, type LoggerFn} from './log.js';
 import type {Result} from './result.js';
 
+type Outcome<T> = Result<T> | {kind: 'rejected'; error: unknown};
+
+interface QueueEntry<T> {
+  name: string;
+  orderingKeys: readonly string[];
+  addedAt: number;
+  settledAt?: number;
+  outcome?: Outcome<T>;
+}
+
+/**
+ * Processes the added entries once they are resolved. Entries sharing an
+ * ordering key are processed in the order they were added, so a slow entry only
+ * holds back the entries which have to be ordered after it. By default all
+ * entries share the same key, i.e. they are processed strictly in order.
+ */
 export class ProcessingQueue<T> {
   static readonly LOGGER_PREFIX = `${LogType.debug}:queue` as const;
+  static readonly DEFAULT_ORDERING_KEY = '';
 
   readonly #logger?: LoggerFn;
   readonly #processor: (arg: T) => Promise<void>;
-  readonly #queue: [Promise<Result<T>>, string][] = [];
+  /** Maps ordering key to the entries which are not released yet. */
+  readonly #lanes = new Map<string, Deque<QueueEntry<T>>>();
+  /** Entries released in their lanes, in the order of processing. */
+  readonly #ready = new Deque<QueueEntry<T>>();
 
   // Flag to keep only 1 active processor.
   #isProcessing = false;
@@ -33,8 +54,65 @@ export class ProcessingQueue<T> {
     this.#logger = logger;
   }
 
-  add(entry: Promise<Result<T>>, name: string) {
-    this.#queue.push([entry, name]);
+  add(
+    entry: Promise<Result<T>>,
+    name: string,
+    orderingKeys: readonly string[] = [ProcessingQueue.DEFAULT_ORDERING_KEY]
+  ) {
+    const queueEntry: QueueEntry<T> = {
+      name,
+      orderingKeys: [...new Set(orderingKeys)],
+      addedAt: performance.now(),
+    };
+    for (const key of queueEntry.orderingKeys) {
+      let lane = this.#lanes.get(key);
+      if (lane === undefined) {
+        lane = new Deque();
+        this.#lanes.set(key, lane);
+      }
+      lane.push(queueEntry);
+    }
+
+    void entry
+      .then(
+        (result): Outcome<T> => result,
+        (error): Outcome<T> => ({kind: 'rejected', error})
+      )
+      .then((outcome) => {
+        queueEntry.outcome = outcome;
+        queueEntry.settledAt = performance.now();
+        this.#release(queueEntry);
+      });
+  }
+
+  /**
+   * Moves the entry to the ready ones if it is settled and first in all its
+   * lanes. Then does the same for the entries which were waiting for it.
+   */
+  #release(queueEntry: QueueEntry<T>) {
+    const candidates = [queueEntry];
+    while (candidates.length > 0) {
+      const candidate = candidates.pop()!;
+      if (
+        candidate.outcome === undefined ||
+        !candidate.orderingKeys.every(
+          (key) => this.#lanes.get(key)?.peek() === candidate
+        )
+      ) {
+        continue;
+      }
+      for (const key of candidate.orderingKeys) {
+        const lane = this.#lanes.get(key)!;
+        lane.shift();
+        const next = lane.peek();
+        if (next === undefined) {
+          this.#lanes.delete(key);
+        } else {
+          candidates.push(next);
+        }
+      }
+      this.#ready.push(candidate);
+    }
     // No need in waiting. Just initialize processor if needed.
     void this.#processIfNeeded();
   }
@@ -44,34 +122,46 @@ export class ProcessingQueue<T> {
       return;
     }
     this.#isProcessing = true;
-    while (this.#queue.length > 0) {
-      const arrayEntry = this.#queue.shift();
-      if (!arrayEntry) {
+    while (this.#ready.length > 0) {
+      const {name, addedAt, settledAt, outcome} = this.#ready.shift()!;
+      const now = performance.now();
+      this.#logger?.(
+        ProcessingQueue.LOGGER_PREFIX,
+        'Processing event:',
+        name,
+        `(queued for ${(now - addedAt).toFixed(1)}ms, ` +
+          `blocked by earlier entries for ${(now - settledAt!).toFixed(1)}ms)`
+      );
+
+      if (outcome === undefined) {
         continue;
       }
-      const [entryPromise, name] = arrayEntry;
-      this.#logger?.(ProcessingQueue.LOGGER_PREFIX, 'Processing event:', name);
-
-      await entryPromise
-        .then((entry) => {
-          if (entry.kind === 'error') {
-            this.#logger?.(
-              LogType.debugError,
-              'Event threw before sending:',
-              entry.error.message,
-              entry.error.stack
-            );
-            return;
-          }
-          return this.#processor(entry.value);
-        })
-        .catch((error) => {
-          this.#logger?.(
-            LogType.debugError,
-            'Event was not processed:',
-            error?.message
-          );
-        });
+      if (outcome.kind === 'rejected') {
+        this.#logger?.(
+          LogType.debugError,
+          'Event was not processed:',
+          (outcome.error as Error | undefined)?.message
+        );
+        continue;
+      }
+      if (outcome.kind === 'error') {
+        this.#logger?.(
+          LogType.debugError,
+          'Event threw before sending:',
+          outcome.error.message,
+          outcome.error.stack
+        );
+        continue;
+      }
+      try {
+        await this.#processor(outcome.value);
+      } catch (error) {
+        this.#logger?.(
+          LogType.debugError,
+          'Event was not processed:',
+          (error as Error | undefined)?.message
+        );
+      }
     }
 
     this.#isProcessing = false;
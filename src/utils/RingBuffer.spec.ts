@@ -0,0 +1,52 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+import {expect} from 'chai';
+
+import {RingBuffer} from './RingBuffer.js';
+
+describe('RingBuffer', () => {
+  it('should keep the newest values', () => {
+    const buffer = new RingBuffer<number>(2);
+    expect(buffer.toArray()).to.deep.equal([]);
+    expect(buffer.push(1)).to.equal(undefined);
+    expect(buffer.push(2)).to.equal(undefined);
+    expect(buffer.toArray()).to.deep.equal([1, 2]);
+    expect(buffer.push(3)).to.equal(1);
+    expect(buffer.push(4)).to.equal(2);
+    expect(buffer.push(5)).to.equal(3);
+    expect(buffer.toArray()).to.deep.equal([4, 5]);
+    expect(buffer.length).to.equal(2);
+  });
+
+  it('should shift the oldest value', () => {
+    const buffer = new RingBuffer<number>(3);
+    buffer.push(1);
+    buffer.push(2);
+    buffer.push(3);
+    buffer.push(4);
+    expect(buffer.shift()).to.equal(2);
+    buffer.push(5);
+    expect([...buffer]).to.deep.equal([3, 4, 5]);
+    buffer.clear();
+    expect(buffer.shift()).to.equal(undefined);
+    expect(buffer.length).to.equal(0);
+  });
+
+  it('should reject invalid capacity', () => {
+    expect(() => new RingBuffer(0)).to.throw(RangeError);
+  });
+});
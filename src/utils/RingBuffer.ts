@@ -0,0 +1,89 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+
+/**
+ * Implements a fixed-capacity circular buffer. Adding to a full buffer
+ * overwrites the oldest entry. All the operations are O(1).
+ */
+export class RingBuffer<T> implements Iterable<T> {
+  readonly #entries: (T | undefined)[];
+  /** Index of the oldest entry. */
+  #head = 0;
+  #length = 0;
+
+  constructor(capacity: number) {
+    if (!Number.isInteger(capacity) || capacity < 1) {
+      throw new RangeError(`Invalid capacity: ${capacity}`);
+    }
+    this.#entries = new Array(capacity);
+  }
+
+  get capacity(): number {
+    return this.#entries.length;
+  }
+
+  get length(): number {
+    return this.#length;
+  }
+
+  /**
+   * Adds the value at the end. Returns the evicted oldest value if the buffer
+   * was full, `undefined` otherwise.
+   */
+  push(value: T): T | undefined {
+    const capacity = this.#entries.length;
+    if (this.#length < capacity) {
+      this.#entries[(this.#head + this.#length) % capacity] = value;
+      this.#length++;
+      return undefined;
+    }
+    const evicted = this.#entries[this.#head];
+    this.#entries[this.#head] = value;
+    this.#head = (this.#head + 1) % capacity;
+    return evicted;
+  }
+
+  /** Removes and returns the oldest value. */
+  shift(): T | undefined {
+    if (this.#length === 0) {
+      return undefined;
+    }
+    const value = this.#entries[this.#head];
+    this.#entries[this.#head] = undefined;
+    this.#head = (this.#head + 1) % this.#entries.length;
+    this.#length--;
+    return value;
+  }
+
+  clear() {
+    this.#entries.fill(undefined);
+    this.#head = 0;
+    this.#length = 0;
+  }
+
+  /** Returns the values from the oldest to the newest. */
+  toArray(): T[] {
+    return Array.from(this);
+  }
+
+  *[Symbol.iterator](): Iterator<T> {
+    const capacity = this.#entries.length;
+    for (let i = 0; i < this.#length; i++) {
+      yield this.#entries[(this.#head + i) % capacity] as T;
+    }
+  }
+}
@@ -0,0 +1,85 @@
+/**
+ * Copyright 2023 Google LLC.
+ * Copyright (c) Microsoft Corporation.
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ */
+import {expect} from 'chai';
+
+import {Buffer} from './Buffer.js';
+import {Deque} from './Deque.js';
+import {ProcessingQueue} from './ProcessingQueue.js';
+import {RingBuffer} from './RingBuffer.js';
+
+/**
+ * With `RUN_BENCHMARKS` set, pushes a million items through each queue. With
+ * O(n) eviction or dequeuing these take minutes, so they would hit the
+ * timeout. Otherwise only checks the queues with a few items.
+ */
+const RUN_BENCHMARKS = Boolean(process.env['RUN_BENCHMARKS']);
+const ITEM_COUNT = RUN_BENCHMARKS ? 1_000_000 : 1_000;
+
+describe(RUN_BENCHMARKS ? 'queues benchmark' : 'queues', function () {
+  if (RUN_BENCHMARKS) {
+    this.timeout(10_000);
+  }
+
+  it('RingBuffer', () => {
+    const buffer = new RingBuffer<number>(100);
+    let evicted = 0;
+    for (let i = 0; i < ITEM_COUNT; i++) {
+      evicted += buffer.push(i) ?? 0;
+    }
+    expect(buffer.length).to.equal(100);
+    expect(evicted).to.equal(((ITEM_COUNT - 100) * (ITEM_COUNT - 101)) / 2);
+  });
+
+  it('Buffer', () => {
+    let removed = 0;
+    const buffer = new Buffer<number>(ITEM_COUNT / 2, () => removed++);
+    for (let i = 0; i < ITEM_COUNT; i++) {
+      buffer.add(i);
+    }
+    expect(removed).to.equal(ITEM_COUNT / 2);
+    expect(buffer.get()[0]).to.equal(ITEM_COUNT / 2);
+  });
+
+  it('Deque', () => {
+    const deque = new Deque<number>();
+    for (let i = 0; i < ITEM_COUNT; i++) {
+      deque.push(i);
+    }
+    let sum = 0;
+    while (deque.length > 0) {
+      sum += deque.shift()!;
+    }
+    expect(sum).to.equal((ITEM_COUNT * (ITEM_COUNT - 1)) / 2);
+  });
+
+  it('ProcessingQueue', async () => {
+    let processed = 0;
+    let done!: () => void;
+    const finished = new Promise<void>((resolve) => (done = resolve));
+    const queue = new ProcessingQueue<number>(async () => {
+      if (++processed === ITEM_COUNT) {
+        done();
+      }
+    });
+    const entry = Promise.resolve({kind: 'success', value: 0} as const);
+    for (let i = 0; i < ITEM_COUNT; i++) {
+      queue.add(entry, '');
+    }
+    await finished;
+    expect(processed).to.equal(ITEM_COUNT);
+  });
+});
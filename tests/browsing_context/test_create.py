@@ -12,10 +12,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import statistics
+import time
+
 import pytest
 from anys import ANY_DICT, ANY_STR
 from test_helpers import (ANY_TIMESTAMP, AnyExtending, get_tree, goto_url,
-                          read_JSON_message, send_JSON_command, subscribe)
+                          logger, read_JSON_message, send_JSON_command,
+                          subscribe)
 
 
 @pytest.mark.asyncio
@@ -259,3 +263,37 @@ async def test_browsingContext_create_withUserGesture_eventsEmitted(
             "url": blank_url
         }
     }
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(60)
+async def test_browsingContext_create_latency(websocket, create_context):
+    tab_count = 20
+    # Generous bounds, so that only a regression, not a slow bot, fails the
+    # test.
+    max_median_latency_ms = 1000
+    max_slowdown = 3
+
+    latencies = []
+    context_ids = set()
+    for _ in range(tab_count):
+        start = time.perf_counter()
+        context_ids.add(await create_context())
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    logger.info(f"Created {tab_count} tabs: "
+                f"p50 {statistics.median(latencies):.1f}ms, "
+                f"max {max(latencies):.1f}ms, first {latencies[0]:.1f}ms")
+
+    assert statistics.median(latencies) < max_median_latency_ms
+    # Bookkeeping of the commands in flight must not slow down the later tabs.
+    quarter = tab_count // 4
+    assert statistics.median(latencies[-quarter:]) < max_slowdown * max(
+        statistics.median(latencies[:quarter]), 1)
+
+    result = await get_tree(websocket)
+    assert context_ids <= {
+        context["context"]
+        for context in result["contexts"]
+    }
@@ -13,10 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+import time
+
 import pytest
 from anys import ANY_STR
 from test_helpers import (ANY_TIMESTAMP, execute_command, get_tree, goto_url,
-                          read_JSON_message, send_JSON_command, subscribe)
+                          logger, read_JSON_message, send_JSON_command,
+                          subscribe)
+
+NESTING_DEPTH = 20
+IFRAMES_PER_LEVEL = 3
+GET_TREE_COUNT = 100
 
 
 @pytest.mark.asyncio
@@ -349,3 +357,98 @@ async def test_browsingContext_addAndRemoveNestedContext_contextAddedAndRemoved(
             "url": page_with_nested_iframe
         }]
     } == result
+
+
+def count_contexts(contexts: list[dict] | None) -> int:
+    return sum(1 + count_contexts(c["children"]) for c in contexts or [])
+
+
+def get_depth(contexts: list[dict] | None) -> int:
+    return max((1 + get_depth(c["children"]) for c in contexts or []),
+               default=0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(60)
+async def test_nestedBrowsingContext_deeplyNested_getTreeAndEvents(
+        websocket, context_id, html):
+    await goto_url(websocket, context_id, html("<h1>MAIN_PAGE</h1>"))
+
+    # Each level has `IFRAMES_PER_LEVEL` iframes, and the first one is nested
+    # further.
+    await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": f"""
+                    let doc = document;
+                    for (let depth = 0; depth < {NESTING_DEPTH}; depth++) {{
+                        const iframes = [];
+                        for (let i = 0; i < {IFRAMES_PER_LEVEL}; i++) {{
+                            iframes.push(doc.body.appendChild(
+                                doc.createElement('iframe')));
+                        }}
+                        doc = iframes[0].contentDocument;
+                    }}""",
+                "awaitPromise": False,
+                "target": {
+                    "context": context_id
+                }
+            }
+        })
+
+    expected_count = 1 + NESTING_DEPTH * IFRAMES_PER_LEVEL
+    while True:
+        result = await get_tree(websocket, context_id)
+        if count_contexts(result["contexts"]) == expected_count:
+            break
+        await asyncio.sleep(0.1)
+    assert get_depth(result["contexts"]) == NESTING_DEPTH + 1
+
+    # Limited depth.
+    result = await execute_command(websocket, {
+        "method": "browsingContext.getTree",
+        "params": {
+            "maxDepth": 2
+        }
+    })
+    assert count_contexts(result["contexts"]) == 1 + 2 * IFRAMES_PER_LEVEL
+
+    result = await get_tree(websocket, context_id)
+    deepest = result["contexts"][0]
+    while deepest["children"]:
+        deepest = deepest["children"][0]
+    deepest_context_id = deepest["context"]
+
+    start = time.perf_counter()
+    for _ in range(GET_TREE_COUNT):
+        await get_tree(websocket)
+    elapsed = time.perf_counter() - start
+
+    # Events in the deepest context are sent to the top-level context
+    # subscription.
+    await subscribe(websocket, ["browsingContext.load"], [context_id])
+    url = html("<h2>DEEPEST</h2>")
+    command_id = await send_JSON_command(
+        websocket, {
+            "method": "browsingContext.navigate",
+            "params": {
+                "url": url,
+                "context": deepest_context_id,
+                "wait": "complete"
+            }
+        })
+    load_received = False
+    while True:
+        response = await read_JSON_message(websocket)
+        if response.get("method") == "browsingContext.load":
+            assert response["params"]["context"] == deepest_context_id
+            load_received = True
+        if response.get("id") == command_id:
+            break
+    assert load_received
+
+    logger.info(f"browsingContext.getTree with {expected_count} contexts "
+                f"nested {NESTING_DEPTH} levels deep took "
+                f"{elapsed * 1000 / GET_TREE_COUNT:.2f}ms on average")
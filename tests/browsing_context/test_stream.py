@@ -0,0 +1,142 @@
+# Copyright 2023 Google LLC.
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import time
+import tracemalloc
+
+import pytest
+from test_helpers import execute_command, goto_url, logger
+
+from tools.stream_reader import save_stream
+
+# A 20,000px tall page of text.
+TALL_PAGE = "<body style='margin: 0'>" + "".join(
+    f"<div style='height: 20px'>Line {i} of a tall page.</div>"
+    for i in range(1000)) + "</body>"
+
+
+@pytest.mark.asyncio
+async def test_stream_screenshot_matches_data(websocket, context_id, html,
+                                              tmp_path):
+    await goto_url(websocket, context_id, html("<h1>Streamed</h1>"))
+
+    expected = await execute_command(
+        websocket, {
+            "method": "browsingContext.captureScreenshot",
+            "params": {
+                "context": context_id
+            }
+        })
+    result = await execute_command(
+        websocket, {
+            "method": "browsingContext.captureScreenshot",
+            "params": {
+                "context": context_id,
+                "goog:stream": True
+            }
+        })
+    assert result["data"] == ""
+
+    path = tmp_path / "screenshot.png"
+    # A small size to read several chunks.
+    size = await save_stream(websocket, result["goog:stream"], path, 1000)
+
+    assert path.read_bytes() == base64.b64decode(expected["data"])
+    assert size == path.stat().st_size
+
+
+@pytest.mark.asyncio
+async def test_stream_print(websocket, context_id, html, tmp_path):
+    await goto_url(websocket, context_id, html("<h1>Streamed</h1>"))
+
+    result = await execute_command(
+        websocket, {
+            "method": "browsingContext.print",
+            "params": {
+                "context": context_id,
+                "goog:stream": True
+            }
+        })
+    assert result["data"] == ""
+
+    path = tmp_path / "page.pdf"
+    await save_stream(websocket, result["goog:stream"], path, 1000)
+
+    content = path.read_bytes()
+    assert content.startswith(b"%PDF-")
+    assert content.rstrip().endswith(b"%%EOF")
+
+
+@pytest.mark.asyncio
+async def test_stream_closed(websocket, context_id, html, tmp_path):
+    await goto_url(websocket, context_id, html("<h1>Streamed</h1>"))
+    result = await execute_command(
+        websocket, {
+            "method": "browsingContext.print",
+            "params": {
+                "context": context_id,
+                "goog:stream": True
+            }
+        })
+    await save_stream(websocket, result["goog:stream"], tmp_path / "page.pdf")
+
+    with pytest.raises(Exception) as exception_info:
+        await execute_command(
+            websocket, {
+                "method": "cdp.readStream",
+                "params": {
+                    "stream": result["goog:stream"]
+                }
+            })
+
+    assert exception_info.value.args[0] == {
+        "error": "no such handle",
+        "message": f"Unknown stream {result['goog:stream']}"
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_stream_print_tall_page_memory(websocket, context_id, html,
+                                             tmp_path):
+    await goto_url(websocket, context_id, html(TALL_PAGE))
+
+    async def print_page(stream):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = await execute_command(
+            websocket, {
+                "method": "browsingContext.print",
+                "params": {
+                    "context": context_id,
+                    "goog:stream": stream
+                }
+            })
+        path = tmp_path / f"stream-{stream}.pdf"
+        if stream:
+            size = await save_stream(websocket, result["goog:stream"], path)
+        else:
+            size = path.write_bytes(base64.b64decode(result["data"]))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        logger.info(f"Printed {size} bytes with stream={stream} in "
+                    f"{elapsed:.2f}s, peak client memory {peak} bytes")
+        return size
+
+    assert await print_page(True) > 0
+    assert await print_page(False) > 0
@@ -23,12 +23,23 @@ import pytest
 import pytest_asyncio
 import websockets
 from pytest_httpserver import HTTPServer
-from test_helpers import (execute_command, get_tree, goto_url,
+from test_helpers import (execute_command, get_tree, goto_url, logger,
                           read_JSON_message, wait_for_event, wait_for_events)
 
+from tools.handle_registry import HandleRegistry
 from tools.local_http_server import LocalHttpServer
 
 
+def pytest_collection_modifyitems(items):
+    """Skips the long-running benchmarks unless `RUN_BENCHMARKS` is set."""
+    if os.getenv("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="Set RUN_BENCHMARKS=1 to run benchmarks.")
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)
+
+
 @pytest_asyncio.fixture
 def local_server(httpserver) -> LocalHttpServer:
     """ Returns an instance of a LocalHttpServer. It can be used for testing
@@ -129,6 +140,16 @@ async def sandbox_realm(websocket, context_id: str):
     return result["realm"]
 
 
+@pytest_asyncio.fixture
+async def handle_registry(request, websocket):
+    """Return a registry which disowns the tracked handles in batches, and
+    report the peak number of live handles of the test."""
+    async with HandleRegistry(websocket) as registry:
+        yield registry
+    logger.info(f"Peak live handles in {request.node.name}: {registry.peak}, "
+                f"script.disown calls: {registry.disown_calls}")
+
+
 @pytest.fixture
 def url_same_origin():
     """Return a same-origin URL."""
@@ -301,6 +322,43 @@ def get_cdp_session_id(websocket):
     return get_cdp_session_id
 
 
+@pytest.fixture
+def get_mapper_heap_usage(websocket):
+    """Return the JS heap used by the BiDi mapper tab, in bytes."""
+    session_id = None
+
+    async def send_cdp_command(method: str,
+                               params: dict,
+                               session: str | None = None) -> dict:
+        command = {"method": method, "params": params}
+        if session is not None:
+            command["session"] = session
+        result = await execute_command(websocket, {
+            "method": "cdp.sendCommand",
+            "params": command
+        })
+        return result["result"]
+
+    async def get_mapper_heap_usage() -> int:
+        nonlocal session_id
+        if session_id is None:
+            targets = await send_cdp_command("Target.getTargets", {})
+            mapper_target = next(target for target in targets["targetInfos"]
+                                 if target["title"] == "BiDi-CDP Mapper")
+            session_id = (await send_cdp_command(
+                "Target.attachToTarget", {
+                    "targetId": mapper_target["targetId"],
+                    "flatten": True
+                }))["sessionId"]
+
+        await send_cdp_command("HeapProfiler.collectGarbage", {}, session_id)
+        heap_usage = await send_cdp_command("Runtime.getHeapUsage", {},
+                                            session_id)
+        return heap_usage["usedSize"]
+
+    return get_mapper_heap_usage
+
+
 @pytest.fixture
 def query_selector(websocket, context_id):
     """Return an element matching the given selector"""
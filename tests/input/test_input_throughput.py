@@ -0,0 +1,83 @@
+# Copyright 2023 Google LLC.
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+from test_helpers import execute_command, goto_url, logger
+
+MOVE_COUNT = 1000
+
+SCRIPT = """
+<div id="target" style="height: 200px; width: 200px"></div>
+<script>
+    var moves = 0;
+    window.addEventListener("mousemove", () => moves++);
+</script>
+"""
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+@pytest.mark.parametrize("origin_type", ["viewport", "element"])
+async def test_input_pointer_move_throughput(websocket, context_id, html,
+                                             query_selector, origin_type):
+    await goto_url(websocket, context_id, html(SCRIPT))
+    origin = origin_type
+    if origin_type == "element":
+        origin = {
+            "type": "element",
+            "element": await query_selector("#target")
+        }
+
+    # Alternates between two points, so that each move emits an event.
+    actions = [{
+        "type": "pointerMove",
+        "x": i % 2,
+        "y": 10,
+        "origin": origin,
+    } for i in range(MOVE_COUNT)]
+
+    start = time.perf_counter()
+    await execute_command(
+        websocket, {
+            "method": "input.performActions",
+            "params": {
+                "context": context_id,
+                "actions": [{
+                    "type": "pointer",
+                    "id": "main_mouse",
+                    "actions": actions
+                }]
+            }
+        })
+    elapsed = time.perf_counter() - start
+
+    result = await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": "moves",
+                "awaitPromise": False,
+                "target": {
+                    "context": context_id
+                }
+            }
+        })
+    assert result["result"] == {"type": "number", "value": MOVE_COUNT}
+
+    logger.info(f"{MOVE_COUNT} pointerMove actions with {origin_type} origin: "
+                f"{MOVE_COUNT / elapsed:.0f} actions/s")
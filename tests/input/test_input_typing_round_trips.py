@@ -0,0 +1,120 @@
+# Copyright 2023 Google LLC.
+# Copyright (c) Microsoft Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+from test_helpers import (execute_command, goto_url, logger, read_JSON_message,
+                          send_JSON_command)
+
+CHARACTER_COUNT = 10000
+
+# Counts the page round trips made to read the platform, and the typed keys.
+SCRIPT = """
+<script>
+    var platformReads = 0;
+    var keys = 0;
+    const {get} = Object.getOwnPropertyDescriptor(
+        Navigator.prototype, "platform");
+    Object.defineProperty(Navigator.prototype, "platform", {
+        get() {
+            platformReads++;
+            return get.call(this);
+        }
+    });
+    window.addEventListener("keydown", () => keys++);
+</script>
+"""
+
+
+async def get_counter(websocket, context_id, name):
+    result = await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": name,
+                "awaitPromise": False,
+                "target": {
+                    "context": context_id
+                }
+            }
+        })
+    return result["result"]["value"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(300)
+async def test_input_typing_reads_platform_once_per_document(
+        websocket, context_id, html):
+    await goto_url(websocket, context_id, html(SCRIPT))
+
+    # One command per character, as keyboard-heavy clients send them.
+    start = time.perf_counter()
+    command_ids = set()
+    for i in range(CHARACTER_COUNT):
+        character = chr(ord("a") + i % 26)
+        command_ids.add(await send_JSON_command(
+            websocket, {
+                "method": "input.performActions",
+                "params": {
+                    "context": context_id,
+                    "actions": [{
+                        "type": "key",
+                        "id": "main_keyboard",
+                        "actions": [{
+                            "type": "keyDown",
+                            "value": character,
+                        }, {
+                            "type": "keyUp",
+                            "value": character,
+                        }]
+                    }]
+                }
+            }))
+    while command_ids:
+        message = await read_JSON_message(websocket)
+        if message.get("id") in command_ids:
+            assert message["type"] == "success", message
+            command_ids.remove(message["id"])
+    elapsed = time.perf_counter() - start
+
+    assert await get_counter(websocket, context_id, "keys") == CHARACTER_COUNT
+    platform_reads = await get_counter(websocket, context_id, "platformReads")
+    logger.info(f"Typed {CHARACTER_COUNT} characters in {elapsed:.2f}s "
+                f"with {platform_reads} platform round trips")
+    assert platform_reads == 1
+
+    # A navigation reads the platform again.
+    await goto_url(websocket, context_id, html(SCRIPT))
+    await execute_command(
+        websocket, {
+            "method": "input.performActions",
+            "params": {
+                "context": context_id,
+                "actions": [{
+                    "type": "key",
+                    "id": "main_keyboard",
+                    "actions": [{
+                        "type": "keyDown",
+                        "value": "a",
+                    }, {
+                        "type": "keyUp",
+                        "value": "a",
+                    }]
+                }]
+            }
+        })
+    assert await get_counter(websocket, context_id, "platformReads") == 1
@@ -0,0 +1,87 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+
+import pytest
+from test_helpers import execute_command, logger
+
+WARM_UP_TAB_COUNT = 100
+TAB_COUNT = 5000
+LOG_COUNT = 100
+# Buffered `log.entryAdded` events of a tab alone take more than that, so a
+# leak of any of them fails the test.
+MAX_HEAP_GROWTH_PER_TAB = 1024
+
+
+async def get_event_buffer_stats(websocket) -> dict:
+    return await execute_command(websocket, {
+        "method": "cdp.getEventBufferStats",
+        "params": {}
+    })
+
+
+async def open_log_and_close_tabs(websocket, create_context, tab_count: int):
+    """Opens tabs one by one, fills their `log.entryAdded` buffers and closes
+    them."""
+    for _ in range(tab_count):
+        context_id = await create_context()
+        await execute_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": f"""
+                        for (let i = 0; i < {LOG_COUNT}; i++) {{
+                            console.log('message', i, 'from a short-lived tab');
+                        }}""",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            })
+        await execute_command(websocket, {
+            "method": "browsingContext.close",
+            "params": {
+                "context": context_id
+            }
+        })
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(1800)
+async def test_log_buffer_soak_openAndCloseTabs_heapDoesNotGrow(
+        websocket, create_context, get_mapper_heap_usage):
+    # Let the lazily initialized state settle.
+    await open_log_and_close_tabs(websocket, create_context, WARM_UP_TAB_COUNT)
+    heap_before = await get_mapper_heap_usage()
+    buffer_stats_before = await get_event_buffer_stats(websocket)
+
+    start = time.perf_counter()
+    await open_log_and_close_tabs(websocket, create_context, TAB_COUNT)
+    elapsed = time.perf_counter() - start
+
+    heap_after = await get_mapper_heap_usage()
+    buffer_stats_after = await get_event_buffer_stats(websocket)
+
+    logger.info(f"Opened, logged in and closed {TAB_COUNT} tabs in "
+                f"{elapsed:.0f}s; mapper heap {heap_before / 1024:.0f}KiB "
+                f"before, {heap_after / 1024:.0f}KiB after; event buffers "
+                f"{buffer_stats_before} before, {buffer_stats_after} after")
+
+    # The buffers of the closed tabs are purged.
+    assert buffer_stats_after == buffer_stats_before
+
+    assert heap_after - heap_before < TAB_COUNT * MAX_HEAP_GROWTH_PER_TAB
@@ -17,8 +17,9 @@ from unittest.mock import ANY
 
 import pytest
 from anys import ANY_STR
-from test_helpers import (ANY_TIMESTAMP, read_JSON_message, send_JSON_command,
-                          subscribe, wait_for_event)
+from test_helpers import (ANY_TIMESTAMP, execute_command, goto_url,
+                          read_JSON_message, send_JSON_command, subscribe,
+                          wait_for_event)
 
 
 @pytest.mark.asyncio
@@ -409,6 +410,91 @@ async def test_buffer_bufferedEventsReturned(websocket, context_id):
     assert resp["id"] == 16
 
 
+@pytest.mark.asyncio
+async def test_buffer_argsSerializedAfterNavigation(websocket, context_id,
+                                                    html):
+    await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": "console.log('text', 1, null, 2n, [1, 2], /a/g)",
+                "target": {
+                    "context": context_id
+                },
+                "awaitPromise": True
+            }
+        })
+    # The realm of the entry is destroyed before it is serialized.
+    await goto_url(websocket, context_id, html())
+
+    await send_JSON_command(websocket, {
+        "method": "session.subscribe",
+        "params": {
+            "events": ["log.entryAdded"]
+        }
+    })
+
+    resp = await read_JSON_message(websocket)
+    assert resp["method"] == "log.entryAdded"
+    args = resp["params"]["args"]
+    assert args[:4] == [{
+        "type": "string",
+        "value": "text"
+    }, {
+        "type": "number",
+        "value": 1
+    }, {
+        "type": "null"
+    }, {
+        "type": "bigint",
+        "value": "2"
+    }]
+    assert args[4]["type"] == "array"
+    assert args[5] == {
+        "type": "regexp",
+        "value": {
+            "pattern": "a",
+            "flags": "g"
+        }
+    }
+    assert resp["params"]["text"].startswith("text 1 null 2 ")
+    assert resp["params"]["text"].endswith(" /a/g")
+
+
+@pytest.mark.asyncio
+async def test_buffer_argsSerializedInStateWhenSent(websocket, context_id):
+    await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": "const obj = {key: 'logged'}; console.log(obj); "
+                              "obj.key = 'mutated';",
+                "target": {
+                    "context": context_id
+                },
+                "awaitPromise": True
+            }
+        })
+
+    await send_JSON_command(websocket, {
+        "method": "session.subscribe",
+        "params": {
+            "events": ["log.entryAdded"]
+        }
+    })
+
+    resp = await read_JSON_message(websocket)
+    assert resp["method"] == "log.entryAdded"
+    # The arguments are serialized when the buffered entry is sent.
+    assert resp["params"]["args"] == [{
+        "type": "object",
+        "value": [["key", {
+            "type": "string",
+            "value": "mutated"
+        }]]
+    }]
+
+
 @pytest.mark.asyncio
 async def test_runtimeException_emitted(websocket, context_id):
     error_message = "SOME_ERROR_MESSAGE"
@@ -0,0 +1,71 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+
+import pytest
+from test_helpers import (logger, read_JSON_message, send_JSON_command,
+                          subscribe)
+
+LOG_COUNT = 10_000
+LOG_SCRIPT = f"""
+    for (let i = 0; i < {LOG_COUNT}; i++) {{
+        console.log({{i, nested: {{list: [i, {{deep: i}}]}}}});
+    }}"""
+
+
+async def log_and_measure(websocket, context_id: str) -> tuple[float, int]:
+    """Logs `LOG_COUNT` objects, and returns the time in milliseconds until
+    a subsequent `script.evaluate` in the same context is done, and the number
+    of `log.entryAdded` events received meanwhile."""
+    start = time.perf_counter()
+    for expression in (LOG_SCRIPT, "1 + 1"):
+        command_id = await send_JSON_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": expression,
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            })
+    entries = 0
+    while True:
+        message = await read_JSON_message(websocket)
+        if message.get("method") == "log.entryAdded":
+            entries += 1
+        if message.get("id") == command_id:
+            break
+    return (time.perf_counter() - start) * 1000, entries
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_log_serialization_evaluateLatency(websocket, context_id):
+    latency_unsubscribed, entries = await log_and_measure(
+        websocket, context_id)
+    assert entries == 0
+
+    await subscribe(websocket, ["log.entryAdded"])
+
+    latency_subscribed, entries = await log_and_measure(websocket, context_id)
+    assert entries == LOG_COUNT
+
+    logger.info(f"script.evaluate after logging {LOG_COUNT} objects took "
+                f"{latency_unsubscribed:.0f}ms without subscriptions and "
+                f"{latency_subscribed:.0f}ms with a log.entryAdded "
+                f"subscription")
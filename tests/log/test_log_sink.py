@@ -0,0 +1,91 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import gzip
+import json
+import time
+
+import pytest
+from test_helpers import (logger, read_JSON_message, send_JSON_command,
+                          subscribe)
+
+from tools.log_sink import LogEntrySink
+
+LOG_COUNT = 5000
+# The entries compress to about 20 KB, so they span several files.
+MAX_FILE_BYTES = 4 * 1024
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(60)
+async def test_log_sink_throughput(websocket, context_id, tmp_path):
+    await subscribe(websocket, ["log.entryAdded"])
+
+    with LogEntrySink(tmp_path, max_file_bytes=MAX_FILE_BYTES) as sink:
+        command_id = await send_JSON_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": f"""
+                        for (let i = 0; i < {LOG_COUNT}; i++) {{
+                            console.log('message', i, 'from a chatty page');
+                        }}""",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            })
+
+        received = 0
+        processing_time = 0.0
+        start = time.perf_counter()
+        while received < LOG_COUNT:
+            message = await read_JSON_message(websocket)
+            if message.get("id") == command_id:
+                continue
+            if message.get("method") == "log.entryAdded":
+                received += 1
+            process_start = time.perf_counter()
+            sink.process_event(message)
+            processing_time += time.perf_counter() - process_start
+        elapsed = time.perf_counter() - start
+
+    logger.info(f"Received {received} log entries in {elapsed * 1000:.0f}ms "
+                f"({received / elapsed:.0f} entries/s), sink overhead "
+                f"{processing_time * 1000:.1f}ms, written {sink.written}, "
+                f"dropped {sink.dropped}, files {len(sink.files)}")
+
+    assert sink.dropped == 0
+    assert sink.written == LOG_COUNT
+    assert len(sink.files) >= 3
+    # Files are only rotated once they reach the limit.
+    assert all(path.stat().st_size >= MAX_FILE_BYTES
+               for path in sink.files[:-1])
+
+    entries = [
+        json.loads(line) for path in sink.files for line in gzip.open(path)
+    ]
+    assert [entry["text"] for entry in entries
+            ] == [f"message {i} from a chatty page" for i in range(LOG_COUNT)]
+    assert entries[0] == {
+        "level": "info",
+        "text": "message 0 from a chatty page",
+        "source": {
+            "realm": entries[0]["source"]["realm"],
+            "context": context_id
+        },
+        "timestamp": entries[0]["timestamp"]
+    }
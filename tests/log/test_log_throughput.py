@@ -0,0 +1,88 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+
+import pytest
+from test_helpers import (execute_command, logger, read_JSON_message,
+                          send_JSON_command, subscribe)
+
+TAB_COUNT = 5
+LOG_COUNT = 2000
+CHANNEL_COUNT = 2
+
+
+async def log_and_count(websocket, context_ids: list[str]) -> float:
+    """Logs `LOG_COUNT` messages in each context and returns the number of
+    `log.entryAdded` events received per second on all the channels."""
+    command_ids: set[int | None] = set()
+    for context_id in context_ids:
+        command_ids.add(await send_JSON_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": f"""
+                        for (let i = 0; i < {LOG_COUNT}; i++) {{
+                            console.log('message', i, 'from a chatty page');
+                        }}""",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            }))
+
+    expected = LOG_COUNT * len(context_ids) * CHANNEL_COUNT
+    received = 0
+    start = time.perf_counter()
+    while received < expected or command_ids:
+        message = await read_JSON_message(websocket)
+        command_ids.discard(message.get("id"))
+        if message.get("method") == "log.entryAdded":
+            received += 1
+    return received / (time.perf_counter() - start)
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_log_entry_added_throughput(websocket, create_context,
+                                          get_mapper_heap_usage):
+    await subscribe(websocket, ["log.entryAdded"])
+    # Every channel adds its own bookkeeping per event.
+    for i in range(1, CHANNEL_COUNT):
+        await subscribe(websocket, ["log.entryAdded"], channel=f"channel-{i}")
+
+    heap_before = await get_mapper_heap_usage()
+
+    context_ids = [await create_context() for _ in range(TAB_COUNT)]
+    events_per_second = await log_and_count(websocket, context_ids)
+    heap_with_tabs = await get_mapper_heap_usage()
+
+    for context_id in context_ids:
+        await execute_command(websocket, {
+            "method": "browsingContext.close",
+            "params": {
+                "context": context_id
+            }
+        })
+    heap_after_close = await get_mapper_heap_usage()
+
+    logger.info(f"Received {events_per_second:.0f} log entries/s from "
+                f"{TAB_COUNT} tabs on {CHANNEL_COUNT} channels; mapper heap "
+                f"{heap_before / 1024:.0f}KiB before, "
+                f"{heap_with_tabs / 1024:.0f}KiB with tabs, "
+                f"{heap_after_close / 1024:.0f}KiB after closing them")
+
+    assert events_per_second > 0
@@ -0,0 +1,148 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import json
+import time
+import tracemalloc
+
+import pytest
+from test_helpers import (goto_url, logger, read_JSON_message,
+                          send_JSON_command, subscribe)
+
+from tools.har_writer import HarWriter
+
+REQUEST_COUNT = 2000
+# Requests are sent by this many workers, so at most this many are in flight.
+CONCURRENCY = 50
+MAX_IN_FLIGHT = 2 * CONCURRENCY
+# Keeping all the entries in memory would take tens of megabytes.
+MAX_PEAK_MEMORY = 8 * 1024 * 1024
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_har_writer_many_requests(websocket, context_id, local_server,
+                                        tmp_path):
+    await goto_url(websocket, context_id, local_server.url_200())
+    await subscribe(websocket, HarWriter.events, [context_id])
+
+    har_path = tmp_path / "trace.har"
+    processing_time = 0.0
+    processed_events = 0
+
+    tracemalloc.start()
+    har_file = open(har_path, "w")
+    with har_file, HarWriter(har_file, max_in_flight=MAX_IN_FLIGHT) as writer:
+        command_id = await send_JSON_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": f"""(() => {{
+                        let next = 0;
+                        const worker = async () => {{
+                            while (next < {REQUEST_COUNT}) {{
+                                const i = next++;
+                                await fetch('/200?' + i).then(r => r.text());
+                            }}
+                        }};
+                        return Promise.all(
+                            Array.from({{length: {CONCURRENCY}}}, worker))
+                            .then(() => 'done');
+                    }})()""",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": True
+                }
+            })
+
+        command_done = False
+        while not command_done or writer.written < REQUEST_COUNT:
+            message = await read_JSON_message(websocket)
+            if message.get("id") == command_id:
+                assert message["result"]["result"]["value"] == "done"
+                command_done = True
+                continue
+
+            start = time.perf_counter()
+            writer.process_event(message)
+            processing_time += time.perf_counter() - start
+            processed_events += 1
+
+            # The writer should not keep finished requests.
+            assert writer.in_flight <= MAX_IN_FLIGHT
+
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    logger.info(f"HAR writer processed {processed_events} events in "
+                f"{processing_time * 1000:.1f}ms "
+                f"({processed_events / processing_time:.0f} events/s), "
+                f"peak memory {peak_memory / 1024:.0f}KiB, "
+                f"evicted {writer.evicted} entries")
+
+    with open(har_path) as har_file:
+        har = json.load(har_file)
+
+    assert writer.evicted == 0
+    assert peak_memory < MAX_PEAK_MEMORY
+
+    entries = [
+        entry for entry in har["log"]["entries"]
+        if "/200?" in entry["request"]["url"]
+    ]
+    assert len(entries) == REQUEST_COUNT
+    assert all(entry["response"]["status"] == 200 for entry in entries)
+    assert har["log"]["pages"] == [{
+        "startedDateTime": har["log"]["pages"][0]["startedDateTime"],
+        "id": context_id,
+        "title": context_id,
+        "pageTimings": {}
+    }]
+    assert all(entry["pageref"] == context_id for entry in entries)
+
+
+@pytest.mark.asyncio
+async def test_har_writer_fetch_error(websocket, context_id, local_server,
+                                      tmp_path):
+    await goto_url(websocket, context_id, local_server.url_200())
+    await subscribe(websocket, HarWriter.events, [context_id])
+
+    har_path = tmp_path / "trace.har"
+    with open(har_path, "w") as har_file, HarWriter(har_file) as writer:
+        # Events can arrive before the command result, so don't use
+        # `execute_command`, which would drop them.
+        await send_JSON_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": "fetch('http://invalid.invalid/').catch(() => {})",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": True
+                }
+            })
+
+        while writer.written == 0:
+            writer.process_event(await read_JSON_message(websocket))
+
+    with open(har_path) as har_file:
+        har = json.load(har_file)
+
+    [entry] = har["log"]["entries"]
+    assert entry["request"]["url"] == "http://invalid.invalid/"
+    assert entry["response"]["status"] == 0
+    assert "_errorText" in entry
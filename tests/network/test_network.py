@@ -359,7 +359,6 @@ def compute_response_headers_size(headers) -> int:
 
 
 @pytest.mark.asyncio
-@pytest.mark.skip(reason="TODO: #1080")
 async def test_network_specific_context_subscription_does_not_enable_cdp_network_globally(
         websocket, context_id, create_context):
     await subscribe(websocket, ["network.beforeRequestSent"], [context_id])
@@ -0,0 +1,111 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import statistics
+import time
+
+import pytest
+from test_helpers import (execute_command, logger, read_JSON_message,
+                          send_JSON_command, subscribe)
+
+EVALUATE_COUNT = 50
+
+# Logs objects whose serialization needs extra CDP round trips, until stopped.
+FLOOD_SCRIPT = """
+    window.flooding = true;
+    (function flood() {
+        for (let i = 0; i < 50; i++) {
+            console.log('flood', i, {nested: {list: [1, {deep: new Map([[i, i]])}]}},
+                new Set([i]), document.body, window);
+        }
+        if (window.flooding) {
+            setTimeout(flood, 0);
+        }
+    })();
+"""
+
+
+async def measure_evaluate_latency(websocket, context_id: str) -> list[float]:
+    """Returns the latency of `script.evaluate` commands in milliseconds,
+    skipping any events received meanwhile."""
+    latencies = []
+    for i in range(EVALUATE_COUNT):
+        start = time.perf_counter()
+        command_id = await send_JSON_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": f"{i} + 1",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            })
+        while True:
+            message = await read_JSON_message(websocket)
+            if message.get("id") == command_id:
+                break
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert message["result"]["result"] == {
+            "type": "number",
+            "value": i + 1
+        }
+    return latencies
+
+
+def describe(latencies: list[float]) -> str:
+    percentiles = statistics.quantiles(latencies, n=20)
+    return (f"p50 {statistics.median(latencies):.1f}ms, "
+            f"p95 {percentiles[-1]:.1f}ms, max {max(latencies):.1f}ms")
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_evaluate_latency_during_console_flood(websocket, context_id,
+                                                     another_context_id):
+    await subscribe(websocket, ["log.entryAdded"])
+
+    baseline = await measure_evaluate_latency(websocket, another_context_id)
+
+    await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": FLOOD_SCRIPT,
+                "target": {
+                    "context": context_id
+                },
+                "awaitPromise": False
+            }
+        })
+    try:
+        flooded = await measure_evaluate_latency(websocket, another_context_id)
+    finally:
+        await execute_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": "window.flooding = false",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            })
+
+    logger.info(f"script.evaluate latency in another tab: "
+                f"idle {describe(baseline)}; "
+                f"during console flood {describe(flooded)}")
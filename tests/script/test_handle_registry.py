@@ -0,0 +1,134 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import pytest
+from test_helpers import execute_command
+
+from tools.handle_registry import HandleRegistry
+
+
+def evaluate_root(expression: str, realm: str) -> dict:
+    return {
+        "method": "script.evaluate",
+        "params": {
+            "expression": expression,
+            "target": {
+                "realm": realm
+            },
+            "awaitPromise": False,
+            "resultOwnership": "root"
+        }
+    }
+
+
+async def assert_handle_disowned(websocket, realm: str, handle: str):
+    with pytest.raises(Exception,
+                       match=str({
+                           "error": "no such handle",
+                           "message": "Handle was not found."
+                       })):
+        await execute_command(
+            websocket, {
+                "method": "script.callFunction",
+                "params": {
+                    "functionDeclaration": "(obj) => obj",
+                    "arguments": [{
+                        "handle": handle
+                    }],
+                    "target": {
+                        "realm": realm
+                    },
+                    "awaitPromise": False
+                }
+            })
+
+
+@pytest.mark.asyncio
+async def test_handle_registry_disowns_collected_handles_in_batches(
+        websocket, default_realm):
+    registry = HandleRegistry(websocket, threshold=10)
+
+    handles = []
+    for i in range(25):
+        remote = await registry.execute(
+            evaluate_root(f"({{index: {i}}})", default_realm))
+        handles.append(remote.handle)
+        # The wrapper goes out of scope here.
+        del remote
+
+    # Two batches of 10 handles were disowned, 5 handles are still pending.
+    assert registry.disown_calls == 2
+    assert registry.pending == 5
+    assert registry.live == 0
+    assert registry.peak == 1
+
+    await assert_handle_disowned(websocket, default_realm, handles[0])
+
+    await registry.close()
+    assert registry.disown_calls == 3
+    await assert_handle_disowned(websocket, default_realm, handles[-1])
+
+
+@pytest.mark.asyncio
+async def test_handle_registry_keeps_referenced_handles(
+        websocket, default_realm, handle_registry):
+    remote = await handle_registry.execute(
+        evaluate_root("({foo: 'bar'})", default_realm))
+    others = [
+        await handle_registry.execute(evaluate_root("({})", default_realm))
+        for _ in range(5)
+    ]
+    assert handle_registry.live == 6
+    assert handle_registry.peak == 6
+
+    others.clear()
+    await handle_registry.flush()
+    assert handle_registry.live == 1
+
+    result = await execute_command(
+        websocket, {
+            "method": "script.callFunction",
+            "params": {
+                "functionDeclaration": "(obj) => obj.foo",
+                "arguments": [remote.as_argument()],
+                "target": {
+                    "realm": default_realm
+                },
+                "awaitPromise": False
+            }
+        })
+    assert result["result"] == {"type": "string", "value": "bar"}
+
+    handle_registry.release(remote)
+    await handle_registry.flush()
+    await assert_handle_disowned(websocket, default_realm, remote.handle)
+
+
+@pytest.mark.asyncio
+async def test_handle_registry_ignores_results_without_handle(
+        default_realm, handle_registry):
+    result = await handle_registry.execute({
+        "method": "script.evaluate",
+        "params": {
+            "expression": "({foo: 'bar'})",
+            "target": {
+                "realm": default_realm
+            },
+            "awaitPromise": False,
+            "resultOwnership": "none"
+        }
+    })
+
+    assert result["type"] == "object"
+    assert handle_registry.live == 0
@@ -0,0 +1,138 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import os
+import time
+
+import pytest
+import websockets
+from test_helpers import execute_command, goto_url, logger
+
+from tools.preload_script_manager import PreloadScriptManager
+
+
+def instrumentation_bundle(index: int) -> str:
+    """Returns a preload script resembling a large instrumentation bundle."""
+    payload = "x" * 50_000
+    return f"""() => {{
+        const payload = '{payload}';
+        window.BUNDLES = [...(window.BUNDLES ?? []), {index}];
+    }}"""
+
+
+async def get_bundles(websocket, context_id: str) -> list:
+    result = await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": "window.BUNDLES ?? []",
+                "target": {
+                    "context": context_id
+                },
+                "awaitPromise": False
+            }
+        })
+    return [item["value"] for item in result["result"]["value"]]
+
+
+@pytest.mark.asyncio
+async def test_preload_script_manager_dedupes(websocket, context_id, html):
+    manager = PreloadScriptManager(websocket)
+
+    script_1 = await manager.add(instrumentation_bundle(1))
+    script_2 = await manager.add(instrumentation_bundle(1))
+    script_3 = await manager.add(instrumentation_bundle(2))
+
+    assert script_1 == script_2
+    assert script_1 != script_3
+    assert manager.add_calls == 2
+
+    await goto_url(websocket, context_id, html())
+    assert await get_bundles(websocket, context_id) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_preload_script_manager_sync_is_idempotent(
+        websocket, context_id, html):
+    manager = PreloadScriptManager(websocket)
+    desired = [{
+        "functionDeclaration": instrumentation_bundle(i)
+    } for i in range(3)]
+
+    await manager.sync(desired)
+    await manager.sync(desired)
+    assert manager.add_calls == 3
+
+    await manager.sync(desired[1:])
+    assert manager.add_calls == 3
+    assert len(manager.installed) == 2
+
+    await goto_url(websocket, context_id, html())
+    assert await get_bundles(websocket, context_id) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_preload_script_manager_reinstalls_after_reconnect(websocket):
+    manager = PreloadScriptManager(websocket)
+    await manager.add(instrumentation_bundle(1))
+
+    port = os.getenv("PORT", 8080)
+    async with websockets.connect(f"ws://localhost:{port}") as connection:
+        await execute_command(connection, {
+            "method": "session.new",
+            "params": {
+                "capabilities": {}
+            }
+        })
+        await manager.attach(connection)
+        assert manager.add_calls == 2
+
+        # Syncing again in the same session does not add anything.
+        await manager.sync()
+        assert manager.add_calls == 2
+
+        result = await execute_command(connection, {
+            "method": "browsingContext.getTree",
+            "params": {}
+        })
+        context_id = result["contexts"][0]["context"]
+        await goto_url(connection, context_id, "data:text/html,")
+        assert await get_bundles(connection, context_id) == [1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(60)
+@pytest.mark.parametrize("script_count", [0, 1, 20])
+async def test_preload_script_first_navigation_latency(websocket,
+                                                       create_context, html,
+                                                       script_count):
+    manager = PreloadScriptManager(websocket)
+    for i in range(script_count):
+        await manager.add(instrumentation_bundle(i))
+
+    # A new target runs `CdpTarget.#initAndEvaluatePreloadScripts` before it
+    # is unblocked.
+    start = time.perf_counter()
+    context_id = await create_context()
+    created = time.perf_counter()
+    await goto_url(websocket, context_id, html("<h1>Hello</h1>"))
+    navigated = time.perf_counter()
+
+    logger.info(f"First navigation with {script_count} preload scripts: "
+                f"create {(created - start) * 1000:.1f}ms, "
+                f"navigate {(navigated - created) * 1000:.1f}ms")
+
+    assert await get_bundles(websocket,
+                             context_id) == list(range(script_count))
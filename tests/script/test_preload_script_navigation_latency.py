@@ -0,0 +1,74 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+
+import pytest
+from test_helpers import execute_command, get_tree, goto_url, logger
+
+IFRAME_COUNT = 20
+PRELOAD_SCRIPT_COUNT = 10
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(60)
+async def test_preloadScript_navigate_crossOriginIframes_latency(
+        websocket, context_id, local_server):
+    for i in range(PRELOAD_SCRIPT_COUNT):
+        await execute_command(
+            websocket, {
+                "method": "script.addPreloadScript",
+                "params": {
+                    "functionDeclaration": f"() => {{ window.PRELOAD_{i} = true; }}",
+                }
+            })
+
+    # The iframes are served from another host, so that they are out-of-process
+    # iframes with their own CDP targets.
+    iframes = "".join(
+        f"<iframe src=\"{local_server.url_200('127.0.0.1')}?iframe={i}\">"
+        "</iframe>" for i in range(IFRAME_COUNT))
+    page_url = local_server.url_html("/iframes", iframes)
+
+    start = time.perf_counter()
+    await goto_url(websocket, context_id, page_url, "complete")
+    elapsed = time.perf_counter() - start
+
+    tree = await get_tree(websocket, context_id)
+    children = tree["contexts"][0]["children"]
+    assert len(children) == IFRAME_COUNT
+
+    # Every preload script is run in the out-of-process iframes.
+    result = await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": "Object.keys(window)"
+                              ".filter(key => key.startsWith('PRELOAD_'))"
+                              ".length",
+                "target": {
+                    "context": children[-1]["context"]
+                },
+                "awaitPromise": False
+            }
+        })
+    assert result["result"] == {
+        "type": "number",
+        "value": PRELOAD_SCRIPT_COUNT
+    }
+
+    logger.info(f"Navigation to a page with {IFRAME_COUNT} cross-origin "
+                f"iframes and {PRELOAD_SCRIPT_COUNT} preload scripts took "
+                f"{elapsed * 1000:.0f}ms")
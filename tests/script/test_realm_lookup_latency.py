@@ -0,0 +1,85 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+
+import pytest
+from test_helpers import execute_command, logger
+
+TAB_COUNT = 20
+SANDBOXES_PER_TAB = 5
+ROUND_COUNT = 5
+
+
+async def evaluate_in_sandbox(websocket, context_id: str, sandbox: str):
+    result = await execute_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": "1 + 1",
+                "target": {
+                    "context": context_id,
+                    "sandbox": sandbox
+                },
+                "awaitPromise": False
+            }
+        })
+    assert result["result"] == {"type": "number", "value": 2}
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_realm_lookup_manySandboxes_latency(websocket, context_id,
+                                                  create_context):
+    context_ids = [context_id]
+    for _ in range(TAB_COUNT - 1):
+        context_ids.append(await create_context())
+    sandboxes = [f"sandbox_{i}" for i in range(SANDBOXES_PER_TAB)]
+
+    # The first evaluation creates the sandbox.
+    for tab_id in context_ids:
+        for sandbox in sandboxes:
+            await evaluate_in_sandbox(websocket, tab_id, sandbox)
+
+    result = await execute_command(websocket, {
+        "method": "script.getRealms",
+        "params": {}
+    })
+    assert len(result["realms"]) >= TAB_COUNT * (SANDBOXES_PER_TAB + 1)
+
+    start = time.perf_counter()
+    for _ in range(ROUND_COUNT):
+        for tab_id in context_ids:
+            for sandbox in sandboxes:
+                await evaluate_in_sandbox(websocket, tab_id, sandbox)
+    evaluate_elapsed = time.perf_counter() - start
+    evaluate_count = ROUND_COUNT * TAB_COUNT * SANDBOXES_PER_TAB
+
+    start = time.perf_counter()
+    for tab_id in context_ids:
+        result = await execute_command(websocket, {
+            "method": "script.getRealms",
+            "params": {
+                "context": tab_id
+            }
+        })
+        assert len(result["realms"]) == SANDBOXES_PER_TAB + 1
+    get_realms_elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"With {TAB_COUNT * SANDBOXES_PER_TAB} sandboxes in {TAB_COUNT} tabs: "
+        f"script.evaluate took {evaluate_elapsed * 1000 / evaluate_count:.2f}ms, "
+        f"script.getRealms took {get_realms_elapsed * 1000 / TAB_COUNT:.2f}ms "
+        f"on average")
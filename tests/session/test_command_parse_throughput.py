@@ -0,0 +1,92 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+
+import pytest
+from test_helpers import logger, read_JSON_message, send_JSON_command
+
+COMMAND_COUNT = 200
+# Large enough for the parameters parsing to be a noticeable share of the
+# command processing.
+ACTION_COUNT = 500
+ARGUMENT_COUNT = 500
+
+
+async def measure_throughput(websocket, command: dict) -> float:
+    """Sends the command `COMMAND_COUNT` times without waiting for the
+    responses, and returns the number of commands processed per second."""
+    start = time.perf_counter()
+    command_ids = set()
+    for _ in range(COMMAND_COUNT):
+        command_ids.add(await send_JSON_command(websocket, command))
+
+    while command_ids:
+        message = await read_JSON_message(websocket)
+        if message.get("id") in command_ids:
+            assert message["type"] == "success", message
+            command_ids.remove(message["id"])
+    return COMMAND_COUNT / (time.perf_counter() - start)
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_perform_actions_parse_throughput(websocket, context_id):
+    throughput = await measure_throughput(
+        websocket, {
+            "method": "input.performActions",
+            "params": {
+                "context": context_id,
+                "actions": [{
+                    "type": "none",
+                    "id": "none",
+                    "actions": [{
+                        "type": "pause",
+                        "duration": 0
+                    }] * ACTION_COUNT
+                }]
+            }
+        })
+
+    logger.info(f"input.performActions with {ACTION_COUNT} actions: "
+                f"{throughput:.0f} commands/s")
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_call_function_parse_throughput(websocket, context_id):
+    throughput = await measure_throughput(
+        websocket, {
+            "method": "script.callFunction",
+            "params": {
+                "functionDeclaration": "() => {}",
+                "awaitPromise": False,
+                "target": {
+                    "context": context_id
+                },
+                "arguments": [{
+                    "type": "object",
+                    "value": [[f"key{i}", {
+                        "type": "number",
+                        "value": i
+                    }] for i in range(ARGUMENT_COUNT)]
+                }],
+                "resultOwnership": "none"
+            }
+        })
+
+    logger.info(f"script.callFunction with a {ARGUMENT_COUNT} keys argument: "
+                f"{throughput:.0f} commands/s")
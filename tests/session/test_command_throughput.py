@@ -0,0 +1,45 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import time
+
+import pytest
+from test_helpers import logger, read_JSON_message, send_JSON_command
+
+COMMAND_COUNT = 5000
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(120)
+async def test_session_status_pipelined_throughput(websocket):
+    start = time.perf_counter()
+    command_ids = set()
+    for _ in range(COMMAND_COUNT):
+        command_ids.add(await send_JSON_command(websocket, {
+            "method": "session.status",
+            "params": {}
+        }))
+
+    while command_ids:
+        message = await read_JSON_message(websocket)
+        assert message["result"] == {
+            "ready": False,
+            "message": "already connected"
+        }
+        command_ids.remove(message["id"])
+    elapsed = time.perf_counter() - start
+
+    logger.info(f"Processed {COMMAND_COUNT} pipelined session.status commands "
+                f"at {COMMAND_COUNT / elapsed:.0f} commands/s")
@@ -0,0 +1,75 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import json
+import time
+
+import pytest
+from test_helpers import logger, send_JSON_command, subscribe
+
+CHANNEL_COUNT = 10
+LOG_COUNT = 20
+PAYLOAD_SIZE = 100_000
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(60)
+async def test_event_fan_out_large_payloads(websocket, context_id):
+    # Named channels subscribe first, so the channel-less subscription is the
+    # last recipient of every event.
+    for i in range(CHANNEL_COUNT - 1):
+        await subscribe(websocket, ["log.entryAdded"], channel=f"channel-{i}")
+    await subscribe(websocket, ["log.entryAdded"])
+
+    command_id = await send_JSON_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": f"""
+                    const payload = 'x'.repeat({PAYLOAD_SIZE});
+                    for (let i = 0; i < {LOG_COUNT}; i++) {{
+                        console.log(i, payload);
+                    }}""",
+                "target": {
+                    "context": context_id
+                },
+                "awaitPromise": False
+            }
+        })
+
+    received: dict[str | None, int] = {}
+    received_bytes = 0
+    start = time.perf_counter()
+    while sum(received.values()) < CHANNEL_COUNT * LOG_COUNT:
+        data = await websocket.recv()
+        received_bytes += len(data)
+        message = json.loads(data)
+        if message.get("id") == command_id:
+            continue
+        assert message["method"] == "log.entryAdded"
+        channel = message.get("channel")
+        received[channel] = received.get(channel, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    logger.info(f"Received {CHANNEL_COUNT * LOG_COUNT} events "
+                f"({received_bytes / 1024 / 1024:.1f}MiB) on {CHANNEL_COUNT} "
+                f"channels in {elapsed * 1000:.0f}ms "
+                f"({received_bytes / 1024 / 1024 / elapsed:.1f}MiB/s)")
+
+    assert received == {
+        None: LOG_COUNT,
+        **{f"channel-{i}": LOG_COUNT
+           for i in range(CHANNEL_COUNT - 1)}
+    }
@@ -0,0 +1,75 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import statistics
+import time
+
+import pytest
+from test_helpers import execute_command, logger
+
+# Enough to fill the mapper tab debug log, so that the heap is measured with
+# the log at its capacity.
+WARM_UP_COMMAND_COUNT = 2000
+COMMAND_COUNT = 10000
+BATCH_SIZE = 1000
+MAX_HEAP_GROWTH = 2 * 1024 * 1024
+
+
+async def evaluate_batch(websocket, context_id: str) -> list[float]:
+    """Returns the latency of `script.evaluate` commands in milliseconds. Each
+    of them adds BiDi and CDP messages to the mapper tab debug log."""
+    latencies = []
+    for i in range(BATCH_SIZE):
+        start = time.perf_counter()
+        result = await execute_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": f"({{index: {i}, payload: 'x'.repeat(100)}})",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            })
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert result["type"] == "success"
+    return latencies
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(900)
+async def test_mapper_debug_log_soak_manyCommands_heapAndLatencyStayFlat(
+        websocket, context_id, get_mapper_heap_usage):
+    """Meant to be run with `RUN_BENCHMARKS=1` against a server started with
+    `VERBOSE=true`, so that the debug log is forwarded to the server as
+    well."""
+    for _ in range(WARM_UP_COMMAND_COUNT // BATCH_SIZE):
+        await evaluate_batch(websocket, context_id)
+    heap_before = await get_mapper_heap_usage()
+
+    medians = []
+    for _ in range(COMMAND_COUNT // BATCH_SIZE):
+        latencies = await evaluate_batch(websocket, context_id)
+        medians.append(statistics.median(latencies))
+
+    heap_after = await get_mapper_heap_usage()
+
+    logger.info(f"script.evaluate p50 latency per {BATCH_SIZE} commands: "
+                f"{', '.join(f'{median:.2f}ms' for median in medians)}; "
+                f"mapper heap {heap_before / 1024:.0f}KiB before, "
+                f"{heap_after / 1024:.0f}KiB after {COMMAND_COUNT} commands")
+
+    assert heap_after - heap_before < MAX_HEAP_GROWTH
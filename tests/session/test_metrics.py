@@ -0,0 +1,110 @@
+#  Copyright 2024 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import asyncio
+import os
+
+import pytest
+from test_helpers import execute_command, send_JSON_command
+
+from tools.metrics_report import command_stats, scrape, subtract
+
+METRICS_URL = f"http://localhost:{os.getenv('PORT', 8080)}/metrics"
+
+
+async def scrape_metrics():
+    return await asyncio.to_thread(scrape, METRICS_URL)
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_commands_by_method(websocket, context_id):
+    before = await scrape_metrics()
+
+    for _ in range(3):
+        await execute_command(
+            websocket, {
+                "method": "script.evaluate",
+                "params": {
+                    "expression": "1",
+                    "target": {
+                        "context": context_id
+                    },
+                    "awaitPromise": False
+                }
+            })
+    with pytest.raises(Exception):
+        await execute_command(
+            websocket, {
+                "method": "browsingContext.close",
+                "params": {
+                    "context": "UNKNOWN_CONTEXT"
+                }
+            })
+
+    after = await scrape_metrics()
+    stats = {s.method: s for s in command_stats(subtract(after, before))}
+
+    assert stats["script.evaluate"].count == 3
+    assert stats["script.evaluate"].errors == 0
+    assert stats["browsingContext.close"].count == 1
+    assert stats["browsingContext.close"].errors == 1
+    assert after["bidi_sessions_active"][()] >= 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_measure_session_new(_websocket_connection):
+    before = await scrape_metrics()
+
+    await execute_command(_websocket_connection, {
+        "method": "session.new",
+        "params": {
+            "capabilities": {}
+        }
+    })
+
+    after = await scrape_metrics()
+    stats = {s.method: s for s in command_stats(subtract(after, before))}
+    assert stats["session.new"].count == 1
+    assert stats["session.new"].errors == 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_ignore_events(websocket, context_id):
+    await execute_command(websocket, {
+        "method": "session.subscribe",
+        "params": {
+            "events": ["log.entryAdded"]
+        }
+    })
+    before = await scrape_metrics()
+
+    await send_JSON_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": "console.log('x')",
+                "target": {
+                    "context": context_id
+                },
+                "awaitPromise": False
+            }
+        })
+    # Wait for both the event and the command result.
+    await websocket.recv()
+    await websocket.recv()
+
+    after = await scrape_metrics()
+    stats = {s.method: s for s in command_stats(subtract(after, before))}
+    assert stats["script.evaluate"].count == 1
+    assert list(stats) == ["script.evaluate"]
@@ -0,0 +1,119 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import asyncio
+import os
+import statistics
+import time
+from uuid import uuid4
+
+import pytest
+import websockets
+from test_helpers import execute_command, logger
+
+from tools.metrics_report import scrape
+
+SESSION_COUNT = 5
+# Time for the browser pool to replace the taken browser instance.
+REFILL_DELAY = 5
+METRICS_URL = f"http://localhost:{os.getenv('PORT', 8080)}/metrics"
+
+
+async def measure_session_new(capabilities, until_get_tree=False):
+    """Returns the latency of `session.new` on a new connection in seconds,
+    optionally including the first `browsingContext.getTree`. Closing the
+    connection closes the browser."""
+    port = os.getenv("PORT", 8080)
+    async with websockets.connect(f"ws://localhost:{port}") as connection:
+        start = time.perf_counter()
+        await execute_command(
+            connection, {
+                "method": "session.new",
+                "params": {
+                    "capabilities": {
+                        "alwaysMatch": capabilities
+                    }
+                }
+            })
+        if until_get_tree:
+            await execute_command(connection, {
+                "method": "browsingContext.getTree",
+                "params": {}
+            })
+        return time.perf_counter() - start
+
+
+async def read_pool_stats():
+    """Returns the browser pool hits, misses and idle instances."""
+    metrics = await asyncio.to_thread(scrape, METRICS_URL)
+    return tuple(metrics[name][()]
+                 for name in ("bidi_browser_pool_hits_total",
+                              "bidi_browser_pool_misses_total",
+                              "bidi_browser_pool_idle"))
+
+
+def unique_capabilities():
+    """Returns capabilities with unique browser arguments, which are never in
+    the browser pool."""
+    return {"goog:chromeOptions": {"args": [f"--bidi-benchmark-id={uuid4()}"]}}
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(300)
+async def test_session_new_latency_cold_and_warm():
+    """Meant to be run against a server started with `BROWSER_POOL_SIZE=1` or
+    more. Otherwise, it is skipped."""
+    await asyncio.sleep(REFILL_DELAY)
+    hits, misses, idle = await read_pool_stats()
+    if idle == 0:
+        pytest.skip("The server has no browser pool.")
+
+    cold = []
+    for _ in range(SESSION_COUNT):
+        cold.append(await measure_session_new(unique_capabilities()))
+
+    # One-off capabilities neither take nor replace the warm instances.
+    assert await read_pool_stats() == (hits, misses + SESSION_COUNT, idle)
+
+    warm = []
+    for _ in range(SESSION_COUNT):
+        warm.append(await measure_session_new({}))
+        await asyncio.sleep(REFILL_DELAY)
+
+    assert await read_pool_stats() == (hits + SESSION_COUNT,
+                                       misses + SESSION_COUNT, idle)
+
+    logger.info(f"session.new p50 latency: "
+                f"cold {statistics.median(cold) * 1000:.0f}ms, "
+                f"warm {statistics.median(warm) * 1000:.0f}ms")
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(300)
+async def test_session_new_to_get_tree_latency_first_and_next():
+    """If the first session is the first one since the server start, it reads
+    the Mapper tab source from the disk, and the next ones reuse it. None of
+    them are served by the browser pool."""
+    first = await measure_session_new(unique_capabilities(),
+                                      until_get_tree=True)
+    next_sessions = []
+    for _ in range(SESSION_COUNT):
+        next_sessions.append(await measure_session_new(unique_capabilities(),
+                                                       until_get_tree=True))
+
+    logger.info(f"session.new to first browsingContext.getTree: "
+                f"first session {first * 1000:.0f}ms, next sessions p50 "
+                f"{statistics.median(next_sessions) * 1000:.0f}ms")
@@ -14,12 +14,14 @@
 # limitations under the License.
 
 import re
+import time
 from unittest.mock import ANY
 
 import pytest
 from anys import ANY_DICT, ANY_STR, AnyWithEntries
 from test_helpers import (ANY_TIMESTAMP, execute_command, get_next_command_id,
-                          read_JSON_message, send_JSON_command, subscribe)
+                          logger, read_JSON_message, send_JSON_command,
+                          subscribe)
 
 
 @pytest.mark.asyncio
@@ -553,3 +555,50 @@ async def test_unsubscribeIsAtomic(websocket, context_id, iframe_id):
         'method': 'log.entryAdded',
         'params': AnyWithEntries({'text': 'SOME_MESSAGE'})
     }) == resp
+
+
+@pytest.mark.asyncio
+@pytest.mark.benchmark
+@pytest.mark.timeout(60)
+async def test_subscription_manyChannels_eventThroughput(
+        websocket, context_id):
+    channel_count = 50
+    log_count = 200
+
+    await subscribe(websocket, ["log.entryAdded"])
+    for i in range(1, channel_count):
+        await subscribe(websocket, ["log.entryAdded"], [context_id],
+                        f"channel-{i}")
+
+    command_id = await send_JSON_command(
+        websocket, {
+            "method": "script.evaluate",
+            "params": {
+                "expression": f"""
+                    for (let i = 0; i < {log_count}; i++) {{
+                        console.log('SOME_MESSAGE', i);
+                    }}""",
+                "target": {
+                    "context": context_id
+                },
+                "awaitPromise": False
+            }
+        })
+
+    channels: dict[str | None, int] = {}
+    start = time.perf_counter()
+    for _ in range(channel_count * log_count + 1):
+        resp = await read_JSON_message(websocket)
+        if resp.get("id") == command_id:
+            continue
+        assert resp["method"] == "log.entryAdded"
+        channel = resp.get("channel")
+        channels[channel] = channels.get(channel, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    logger.info(f"Received {channel_count * log_count} events on "
+                f"{channel_count} channels in {elapsed * 1000:.0f}ms "
+                f"({channel_count * log_count / elapsed:.0f} events/s)")
+
+    assert len(channels) == channel_count
+    assert set(channels.values()) == {log_count}
@@ -0,0 +1,168 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+from __future__ import annotations
+
+import weakref
+
+from test_helpers import execute_command
+
+# Errors of `script.disown` meaning that there is nothing left to disown.
+_GONE_ERRORS = ("no such frame", "no such handle")
+
+
+def _is_gone_error(exception: Exception) -> bool:
+    """Returns whether the exception raised by `execute_command` is an error
+    response for a realm or handle which no longer exists."""
+    response = exception.args[0] if exception.args else None
+    return isinstance(response, dict) and response.get("error") in _GONE_ERRORS
+
+
+class RemoteHandle:
+    """A remote value owned by the client, i.e. returned with a `handle`.
+
+    Once the wrapper is garbage collected or explicitly released, its handle is
+    queued in the owning `HandleRegistry` to be disowned.
+    """
+
+    __slots__ = ("realm", "handle", "value", "__weakref__")
+
+    def __init__(self, realm: str, value: dict) -> None:
+        self.realm = realm
+        self.handle: str = value["handle"]
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"RemoteHandle(realm={self.realm!r}, handle={self.handle!r})"
+
+    def as_argument(self) -> dict:
+        """Returns the `script.LocalValue` referencing this handle."""
+        return {"handle": self.handle}
+
+
+class HandleRegistry:
+    """Tracks handles returned per realm and releases them in batched
+    `script.disown` calls.
+
+    Released handles are disowned when the registry is flushed, when the number
+    of pending releases reaches `threshold`, or when the registry is closed.
+
+    >>> registry = HandleRegistry(websocket=None, threshold=10)
+    >>> remote = registry.track({"realm": "r1",
+    ...     "result": {"type": "object", "handle": "h1"}})
+    >>> registry.live, registry.pending
+    (1, 0)
+    >>> del remote
+    >>> registry.live, registry.pending, registry.peak
+    (0, 1, 1)
+    """
+    def __init__(self, websocket, threshold: int = 100) -> None:
+        self._websocket = websocket
+        self._threshold = threshold
+        self._finalizers: dict[str, weakref.finalize] = {}
+        self._pending: dict[str, list[str]] = {}
+        self._pending_count = 0
+        self._peak = 0
+        self._disown_calls = 0
+
+    async def __aenter__(self) -> HandleRegistry:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @property
+    def live(self) -> int:
+        """Number of tracked handles which are not released yet."""
+        return len(self._finalizers)
+
+    @property
+    def pending(self) -> int:
+        """Number of released handles waiting for `script.disown`."""
+        return self._pending_count
+
+    @property
+    def peak(self) -> int:
+        """Maximum number of simultaneously live handles."""
+        return self._peak
+
+    @property
+    def disown_calls(self) -> int:
+        """Number of `script.disown` commands sent."""
+        return self._disown_calls
+
+    def track(self, result: dict) -> RemoteHandle | dict:
+        """Tracks the handle of a successful `script.evaluate` or
+        `script.callFunction` result. Returns a `RemoteHandle` if the result
+        has a handle, and the plain remote value otherwise."""
+        value = result["result"]
+        if "handle" not in value:
+            return value
+
+        remote = RemoteHandle(result["realm"], value)
+        self._finalizers[remote.handle] = weakref.finalize(
+            remote, self._schedule_release, remote.realm, remote.handle)
+        self._peak = max(self._peak, len(self._finalizers))
+        return remote
+
+    def release(self, remote: RemoteHandle) -> None:
+        """Queues the handle for `script.disown` without waiting for the
+        wrapper to be garbage collected."""
+        finalizer = self._finalizers.get(remote.handle)
+        if finalizer is not None:
+            finalizer()
+
+    async def execute(self, command: dict) -> RemoteHandle | dict:
+        """Executes a `script.evaluate` or `script.callFunction` command and
+        tracks the returned handle, if any."""
+        if self._pending_count >= self._threshold:
+            await self.flush()
+
+        result = await execute_command(self._websocket, command)
+        if result.get("type") != "success":
+            return result
+        return self.track(result)
+
+    async def flush(self) -> None:
+        """Disowns all the released handles, one command per realm."""
+        pending, self._pending = self._pending, {}
+        self._pending_count = 0
+        for realm, handles in pending.items():
+            self._disown_calls += 1
+            try:
+                await execute_command(
+                    self._websocket, {
+                        "method": "script.disown",
+                        "params": {
+                            "handles": handles,
+                            "target": {
+                                "realm": realm
+                            }
+                        }
+                    })
+            except Exception as e:
+                # The realm is already gone, and its handles with it.
+                if not _is_gone_error(e):
+                    raise
+
+    async def close(self) -> None:
+        """Releases all the live handles and disowns them."""
+        for finalizer in list(self._finalizers.values()):
+            finalizer()
+        await self.flush()
+
+    def _schedule_release(self, realm: str, handle: str) -> None:
+        del self._finalizers[handle]
+        self._pending.setdefault(realm, []).append(handle)
+        self._pending_count += 1
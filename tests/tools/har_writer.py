@@ -0,0 +1,229 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TextIO
+
+
+class HarWriter:
+    """Streams a HAR file to disk from BiDi `network.*` events.
+
+    Events are correlated by request id in a bounded in-flight table. As soon
+    as a request finishes (`network.responseCompleted` or `network.fetchError`)
+    its entry is written to the file and forgotten, so the memory footprint
+    depends on the number of concurrent requests, not on the number of requests
+    seen. If the in-flight table is full, the oldest request is written as is.
+    Each browsing context is a page, and the pages are written after the
+    entries, when the writer is closed.
+
+    >>> import io
+    >>> out = io.StringIO()
+    >>> writer = HarWriter(out)
+    >>> writer.process_event({
+    ...     "method": "network.beforeRequestSent",
+    ...     "params": {"request": {"request": "1", "url": "http://a/",
+    ...                            "method": "GET"},
+    ...                "context": "c", "timestamp": 0}})
+    >>> writer.in_flight
+    1
+    >>> writer.process_event({
+    ...     "method": "network.responseCompleted",
+    ...     "params": {"request": {"request": "1"},
+    ...                "response": {"status": 200, "statusText": "OK"},
+    ...                "timestamp": 5}})
+    >>> writer.close()
+    >>> har = json.loads(out.getvalue())
+    >>> [(e["request"]["url"], e["response"]["status"], e["time"])
+    ...  for e in har["log"]["entries"]]
+    [('http://a/', 200, 5)]
+    >>> [(p["id"], p["startedDateTime"]) for p in har["log"]["pages"]]
+    [('c', '1970-01-01T00:00:00+00:00')]
+    """
+
+    events = [
+        "network.beforeRequestSent",
+        "network.responseStarted",
+        "network.responseCompleted",
+        "network.fetchError",
+        "network.authRequired",
+    ]
+
+    def __init__(self, file: TextIO, max_in_flight: int = 1000) -> None:
+        self._file = file
+        self._max_in_flight = max_in_flight
+        self._in_flight: OrderedDict[str, dict] = OrderedDict()
+        self._written = 0
+        self._evicted = 0
+        self._closed = False
+        # Browsing context id to the start time of its first request.
+        self._pages: dict[str, float] = {}
+
+        self._file.write(
+            '{"log":{"version":"1.2","creator":{"name":"chromium-bidi",'
+            '"version":"0"},"entries":[')
+
+    def __enter__(self) -> HarWriter:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests which are not finished yet."""
+        return len(self._in_flight)
+
+    @property
+    def written(self) -> int:
+        """Number of entries written to the file."""
+        return self._written
+
+    @property
+    def evicted(self) -> int:
+        """Number of unfinished entries written because the in-flight table
+        was full."""
+        return self._evicted
+
+    def process_event(self, event: dict) -> None:
+        """Processes a single BiDi message. Non-network messages are ignored."""
+        method = event.get("method")
+        if method not in self.events:
+            return
+
+        params = event["params"]
+        request_id = params["request"]["request"]
+
+        if method == "network.beforeRequestSent":
+            # Redirects keep the same request id, so the previous hop is done.
+            if request_id in self._in_flight:
+                self._write_entry(self._in_flight.pop(request_id))
+            if len(self._in_flight) >= self._max_in_flight:
+                _, oldest = self._in_flight.popitem(last=False)
+                self._evicted += 1
+                self._write_entry(oldest)
+            self._in_flight[request_id] = {
+                "start": params,
+                "response": None,
+                "end": None,
+                "error": None,
+            }
+            return
+
+        entry = self._in_flight.get(request_id)
+        if entry is None:
+            # The request started before the writer was attached or was
+            # evicted.
+            return
+
+        if method in ("network.responseStarted", "network.authRequired"):
+            entry["response"] = params["response"]
+        elif method == "network.responseCompleted":
+            entry["response"] = params["response"]
+            entry["end"] = params
+            self._write_entry(self._in_flight.pop(request_id))
+        elif method == "network.fetchError":
+            entry["error"] = params.get("errorText")
+            entry["end"] = params
+            self._write_entry(self._in_flight.pop(request_id))
+
+    def close(self) -> None:
+        """Writes all the unfinished requests and terminates the HAR file."""
+        if self._closed:
+            return
+        self._closed = True
+        while self._in_flight:
+            _, entry = self._in_flight.popitem(last=False)
+            self._write_entry(entry)
+        self._file.write('],"pages":')
+        self._file.write(
+            json.dumps([{
+                "startedDateTime": _to_har_date(started),
+                "id": context,
+                "title": context,
+                "pageTimings": {},
+            } for context, started in self._pages.items()]))
+        self._file.write('}}')
+        self._file.flush()
+
+    def _write_entry(self, entry: dict) -> None:
+        if self._written > 0:
+            self._file.write(',')
+        self._file.write(json.dumps(_to_har_entry(entry)))
+        self._written += 1
+        context = entry["start"].get("context")
+        if context is not None:
+            self._pages.setdefault(context, entry["start"].get("timestamp", 0))
+
+
+def _to_har_date(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp / 1000, timezone.utc).isoformat()
+
+
+def _to_har_headers(headers: list[dict] | None) -> list[dict]:
+    return [{
+        "name": header["name"],
+        "value": header["value"].get("value", "")
+    } for header in headers or []]
+
+
+def _to_har_entry(entry: dict) -> dict:
+    start = entry["start"]
+    request = start["request"]
+    response = entry["response"] or {}
+    started = start.get("timestamp", 0)
+    ended = entry["end"].get("timestamp", started) if entry["end"] else started
+
+    har_entry = {
+        "startedDateTime": _to_har_date(started),
+        "time": max(0, ended - started),
+        "request": {
+            "method": request.get("method", ""),
+            "url": request.get("url", ""),
+            "httpVersion": response.get("protocol", ""),
+            "cookies": _to_har_headers(request.get("cookies")),
+            "headers": _to_har_headers(request.get("headers")),
+            "queryString": [],
+            "headersSize": request.get("headersSize", -1),
+            "bodySize": request.get("bodySize", -1),
+        },
+        "response": {
+            "status": response.get("status", 0),
+            "statusText": response.get("statusText", ""),
+            "httpVersion": response.get("protocol", ""),
+            "cookies": [],
+            "headers": _to_har_headers(response.get("headers")),
+            "content": {
+                "size": response.get("content", {}).get("size", 0),
+                "mimeType": response.get("mimeType", ""),
+            },
+            "redirectURL": "",
+            "headersSize": response.get("headersSize", -1),
+            "bodySize": response.get("bodySize", -1),
+        },
+        "cache": {},
+        "timings": {
+            "send": 0,
+            "wait": max(0, ended - started),
+            "receive": 0,
+        },
+    }
+    if start.get("context") is not None:
+        har_entry["pageref"] = start["context"]
+    if entry["error"] is not None:
+        har_entry["_errorText"] = entry["error"]
+    return har_entry
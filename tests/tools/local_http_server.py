@@ -156,3 +156,12 @@ class LocalHttpServer:
     def url_cacheable(self, host='localhost') -> str:
         """Returns the url for the cacheable page with the `default_200_page_content`."""
         return self._url_for(self.__path_cacheable, host)
+
+    def url_html(self, path: str, content: str, host='localhost') -> str:
+        """Serves the given HTML content on the given path and returns the url
+        for it."""
+        self.__http_server \
+            .expect_request(path) \
+            .respond_with_data(f"<html><body>{content}</body></html>",
+                               headers={"Content-Type": "text/html"})
+        return self._url_for(path, host)
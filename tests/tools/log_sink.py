@@ -0,0 +1,153 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+from __future__ import annotations
+
+import gzip
+import json
+import queue
+import threading
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+
+# Marks the end of the stream for the writer thread.
+_CLOSE = object()
+
+
+class LogEntrySink:
+    """Streams `log.entryAdded` events to size-rotated gzip-compressed JSONL
+    files.
+
+    `process_event` only extracts the selected fields and enqueues them, so it
+    never blocks the event loop. A writer thread drains the queue in batches.
+    When the queue is full, entries are dropped and counted in `dropped`.
+
+    >>> import tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> with LogEntrySink(directory) as sink:
+    ...     sink.process_event({"method": "log.entryAdded", "params": {
+    ...         "level": "info", "text": "hi", "timestamp": 1,
+    ...         "source": {"realm": "r"}, "args": []}})
+    >>> sink.written, sink.dropped
+    (1, 0)
+    >>> [json.loads(line) for line in gzip.open(sink.files[0])]
+    [{'level': 'info', 'text': 'hi', 'source': {'realm': 'r'}, 'timestamp': 1}]
+    """
+
+    fields = ("level", "text", "source", "timestamp")
+
+    def __init__(self,
+                 directory: str | Path,
+                 max_file_bytes: int = 16 * 1024 * 1024,
+                 batch_size: int = 500,
+                 max_queue: int = 100_000) -> None:
+        self._directory = Path(directory)
+        self._max_file_bytes = max_file_bytes
+        self._batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._files: list[Path] = []
+        self._written = 0
+        self._dropped = 0
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run,
+                                        name="LogEntrySink",
+                                        daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> LogEntrySink:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def written(self) -> int:
+        """Number of entries written to disk."""
+        return self._written
+
+    @property
+    def dropped(self) -> int:
+        """Number of entries dropped because the writer was behind."""
+        return self._dropped
+
+    @property
+    def files(self) -> list[Path]:
+        """Files created so far, oldest first."""
+        return list(self._files)
+
+    def process_event(self, event: dict) -> None:
+        """Enqueues a `log.entryAdded` event. Other messages are ignored."""
+        if event.get("method") != "log.entryAdded":
+            return
+        params = event["params"]
+        entry = {field: params.get(field) for field in self.fields}
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._dropped += 1
+
+    def close(self) -> None:
+        """Writes the remaining entries and waits for the writer thread."""
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def _run(self) -> None:
+        output: tuple[BinaryIO, gzip.GzipFile] | None = None
+        closing = False
+        while not closing:
+            batch = []
+            item = self._queue.get()
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                    break
+                batch.append(item)
+                if len(batch) >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if not batch:
+                continue
+
+            if output is None:
+                path = self._directory / f"log-{len(self._files):05d}.jsonl.gz"
+                self._files.append(path)
+                file: BinaryIO = open(path, "wb")
+                output = file, gzip.GzipFile(fileobj=file, mode="wb")
+
+            raw, compressed = output
+            compressed.write("".join(
+                json.dumps(entry, separators=(",", ":")) + "\n"
+                for entry in batch).encode())
+            # Without a flush, the compressor keeps tens of kilobytes
+            # buffered and the size on disk stays behind. A sync flush keeps
+            # the dictionary, so the ratio barely changes with large batches.
+            compressed.flush(zlib.Z_SYNC_FLUSH)
+            self._written += len(batch)
+
+            if raw.tell() >= self._max_file_bytes:
+                compressed.close()
+                raw.close()
+                output = None
+
+        if output is not None:
+            raw, compressed = output
+            compressed.close()
+            raw.close()
@@ -0,0 +1,170 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Parses the metrics exposed by the BiDi server on `/metrics` and renders a
+per-method latency report."""
+
+from __future__ import annotations
+
+import math
+import re
+import urllib.request
+from dataclasses import dataclass
+
+Labels = tuple[tuple[str, str], ...]
+# Metric name to the values by labels.
+Metrics = dict[str, dict[Labels, float]]
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})? (\S+)$')
+_LABEL = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+_UNESCAPE = {"\\\\": "\\", '\\"': '"', "\\n": "\n"}
+
+COMMAND_DURATION = "bidi_command_duration_seconds"
+COMMAND_ERRORS = "bidi_command_errors_total"
+
+
+@dataclass
+class MethodStats:
+    method: str
+    count: int
+    errors: int
+    mean: float
+    p50: float
+    p90: float
+    p99: float
+
+
+def scrape(url: str, timeout: float = 5) -> Metrics:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return parse_metrics(response.read().decode())
+
+
+def parse_metrics(text: str) -> Metrics:
+    """Parses the Prometheus text format, ignoring comments and timestamps.
+
+    >>> parse_metrics('# TYPE a counter\\na{method="x"} 2\\nb 1.5\\n')
+    {'a': {(('method', 'x'),): 2.0}, 'b': {(): 1.5}}
+    """
+    metrics: Metrics = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE.match(line)
+        if match is None:
+            raise ValueError(f"Invalid metrics line: {line!r}")
+        name, labels, value = match.groups()
+        metrics.setdefault(name, {})[_parse_labels(labels
+                                                   or "")] = float(value)
+    return metrics
+
+
+def _parse_labels(text: str) -> Labels:
+    return tuple((name, re.sub(r'\\.', _unescape, value))
+                 for name, value in _LABEL.findall(text))
+
+
+def _unescape(match: re.Match[str]) -> str:
+    return _UNESCAPE.get(match[0], match[0])
+
+
+def subtract(after: Metrics, before: Metrics) -> Metrics:
+    """Returns the counters and histograms accumulated between two scrapes.
+    Gauges are subtracted too, so only read them from `after`."""
+    return {
+        name: {
+            labels: value - before.get(name, {}).get(labels, 0)
+            for labels, value in values.items()
+        }
+        for name, values in after.items()
+    }
+
+
+def histogram_quantile(q: float, buckets: list[tuple[float, float]]) -> float:
+    """Estimates the `q` quantile from cumulative `(upper bound, count)`
+    buckets, interpolating linearly within the bucket like Prometheus does.
+
+    >>> histogram_quantile(0.5, [(1, 0), (2, 10), (math.inf, 10)])
+    1.5
+    """
+    buckets = sorted(buckets)
+    total = buckets[-1][1] if buckets else 0
+    if total == 0:
+        return math.nan
+    rank = q * total
+    lower_bound, lower_count = 0.0, 0.0
+    for upper_bound, count in buckets:
+        if count >= rank:
+            if math.isinf(upper_bound):
+                # Nothing is known above the last finite bound.
+                return lower_bound
+            if count == lower_count:
+                return upper_bound
+            return lower_bound + (upper_bound - lower_bound) * (
+                rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = upper_bound, count
+    return lower_bound
+
+
+def command_stats(metrics: Metrics) -> list[MethodStats]:
+    """Returns the stats of each command method, the most frequent first."""
+    buckets: dict[str, list[tuple[float, float]]] = {}
+    for labels, count in metrics.get(f"{COMMAND_DURATION}_bucket", {}).items():
+        label_map = dict(labels)
+        buckets.setdefault(label_map["method"], []).append(
+            (float(label_map["le"]), count))
+
+    sums = metrics.get(f"{COMMAND_DURATION}_sum", {})
+    errors = metrics.get(COMMAND_ERRORS, {})
+    stats = []
+    for method, method_buckets in buckets.items():
+        labels = (("method", method), )
+        count = int(max(count for _, count in method_buckets))
+        if count == 0:
+            continue
+        stats.append(
+            MethodStats(method=method,
+                        count=count,
+                        errors=int(errors.get(labels, 0)),
+                        mean=sums.get(labels, 0) / count,
+                        p50=histogram_quantile(0.5, method_buckets),
+                        p90=histogram_quantile(0.9, method_buckets),
+                        p99=histogram_quantile(0.99, method_buckets)))
+    return sorted(stats, key=lambda s: (-s.count, s.method))
+
+
+def render_report(metrics: Metrics,
+                  gauge_peaks: dict[str, float] | None = None) -> str:
+    """Renders the per-method command latencies, in milliseconds, followed by
+    the peak value of the sampled gauges."""
+    header = ("method", "count", "errors", "mean ms", "p50 ms", "p90 ms",
+              "p99 ms")
+    rows: list[tuple[str, ...]] = [header]
+    for s in command_stats(metrics):
+        rows.append((s.method, str(s.count), str(s.errors),
+                     *(f"{value * 1000:.1f}"
+                       for value in (s.mean, s.p50, s.p90, s.p99))))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [
+        "  ".join(
+            cell.ljust(width) if i == 0 else cell.rjust(width)
+            for i, (cell, width) in enumerate(zip(row, widths)))
+        for row in rows
+    ]
+
+    if gauge_peaks:
+        lines.append("")
+        name_width = max(len(name) for name in gauge_peaks)
+        for name, value in sorted(gauge_peaks.items()):
+            lines.append(f"{name.ljust(name_width)}  peak {value:g}")
+    return "\n".join(lines) + "\n"
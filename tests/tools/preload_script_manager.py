@@ -0,0 +1,126 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+from __future__ import annotations
+
+import hashlib
+import json
+
+from test_helpers import execute_command
+
+
+class PreloadScriptManager:
+    """Installs preload scripts with `script.addPreloadScript`, deduplicated by
+    the content hash of their parameters.
+
+    The manager remembers the desired set of preload scripts. Within a session
+    adding the same script again reuses the returned script id, and after a
+    reconnect `attach` installs the desired set in the new session.
+    """
+    def __init__(self, websocket=None) -> None:
+        self._websocket = websocket
+        # Content hash -> `script.addPreloadScript` parameters.
+        self._desired: dict[str, dict] = {}
+        # Content hash -> script id in the current session.
+        self._installed: dict[str, str] = {}
+        self._add_calls = 0
+
+    @property
+    def installed(self) -> dict[str, str]:
+        """Script ids installed in the current session, by content hash."""
+        return dict(self._installed)
+
+    @property
+    def add_calls(self) -> int:
+        """Number of `script.addPreloadScript` commands sent."""
+        return self._add_calls
+
+    @staticmethod
+    def content_hash(params: dict) -> str:
+        """Returns a stable hash of the `script.addPreloadScript` parameters.
+
+        >>> PreloadScriptManager.content_hash(
+        ...     {"functionDeclaration": "() => {}", "sandbox": "s"}
+        ... ) == PreloadScriptManager.content_hash(
+        ...     {"sandbox": "s", "functionDeclaration": "() => {}"})
+        True
+        """
+        return hashlib.sha256(
+            json.dumps(params, sort_keys=True,
+                       separators=(",", ":")).encode()).hexdigest()
+
+    async def attach(self, websocket) -> None:
+        """Switches to a new session and installs the desired scripts there.
+        Script ids from the previous session are no longer valid."""
+        self._websocket = websocket
+        self._installed.clear()
+        await self.sync()
+
+    async def add(self, function_declaration: str, **params) -> str:
+        """Adds a preload script unless an identical one is already installed,
+        and returns its script id."""
+        params = {"functionDeclaration": function_declaration, **params}
+        content_hash = self.content_hash(params)
+        self._desired[content_hash] = params
+        return await self._install(content_hash)
+
+    async def remove(self, script_id: str) -> None:
+        """Removes the preload script with the given id."""
+        for content_hash, installed_id in list(self._installed.items()):
+            if installed_id == script_id:
+                del self._desired[content_hash]
+                await self._uninstall(content_hash)
+
+    async def sync(self, desired: list[dict] | None = None) -> None:
+        """Makes the installed set equal to the desired one. Only the missing
+        scripts are added and only the extra ones are removed, so calling it
+        repeatedly is cheap.
+
+        If `desired` is given, it replaces the desired set of parameters.
+        """
+        if desired is not None:
+            self._desired = {
+                self.content_hash(params): params
+                for params in desired
+            }
+
+        for content_hash in list(self._installed):
+            if content_hash not in self._desired:
+                await self._uninstall(content_hash)
+        for content_hash in self._desired:
+            await self._install(content_hash)
+
+    async def _install(self, content_hash: str) -> str:
+        script_id = self._installed.get(content_hash)
+        if script_id is not None:
+            return script_id
+
+        self._add_calls += 1
+        result = await execute_command(
+            self._websocket, {
+                "method": "script.addPreloadScript",
+                "params": self._desired[content_hash]
+            })
+        self._installed[content_hash] = result["script"]
+        return result["script"]
+
+    async def _uninstall(self, content_hash: str) -> None:
+        script_id = self._installed.pop(content_hash)
+        await execute_command(
+            self._websocket, {
+                "method": "script.removePreloadScript",
+                "params": {
+                    "script": script_id
+                }
+            })
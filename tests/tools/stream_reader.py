@@ -0,0 +1,60 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+from __future__ import annotations
+
+import base64
+from pathlib import Path
+
+from test_helpers import execute_command
+
+
+async def save_stream(websocket,
+                      stream: str,
+                      path: Path,
+                      size: int | None = None) -> int:
+    """Reads the `goog:stream` returned by `browsingContext.print` or
+    `browsingContext.captureScreenshot` chunk by chunk into `path`, then closes
+    the stream. Returns the number of bytes written.
+
+    Only one chunk is held in memory at a time, so the client doesn't need to
+    raise its WebSocket message size limit.
+    """
+    params: dict = {"stream": stream}
+    if size is not None:
+        params["size"] = size
+
+    written = 0
+    try:
+        with open(path, "wb") as file:
+            while True:
+                chunk = await execute_command(websocket, {
+                    "method": "cdp.readStream",
+                    "params": params
+                })
+                if chunk.get("base64Encoded"):
+                    data = base64.b64decode(chunk["data"])
+                else:
+                    data = chunk["data"].encode()
+                file.write(data)
+                written += len(data)
+                if chunk["eof"]:
+                    return written
+    finally:
+        await execute_command(websocket, {
+            "method": "cdp.closeStream",
+            "params": {
+                "stream": stream
+            }
+        })
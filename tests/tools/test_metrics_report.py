@@ -0,0 +1,93 @@
+#  Copyright 2024 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import math
+
+import pytest
+
+from tools.metrics_report import (command_stats, histogram_quantile,
+                                  parse_metrics, render_report, subtract)
+
+SAMPLE = """\
+# HELP bidi_command_duration_seconds Time from receiving a command to sending its response.
+# TYPE bidi_command_duration_seconds histogram
+bidi_command_duration_seconds_bucket{method="script.evaluate",le="0.01"} 8
+bidi_command_duration_seconds_bucket{method="script.evaluate",le="0.1"} 10
+bidi_command_duration_seconds_bucket{method="script.evaluate",le="+Inf"} 10
+bidi_command_duration_seconds_sum{method="script.evaluate"} 0.2
+bidi_command_duration_seconds_count{method="script.evaluate"} 10
+bidi_command_duration_seconds_bucket{method="a\\"b",le="0.01"} 0
+bidi_command_duration_seconds_bucket{method="a\\"b",le="0.1"} 0
+bidi_command_duration_seconds_bucket{method="a\\"b",le="+Inf"} 1
+bidi_command_duration_seconds_sum{method="a\\"b"} 1
+bidi_command_duration_seconds_count{method="a\\"b"} 1
+# TYPE bidi_command_errors_total counter
+bidi_command_errors_total{method="a\\"b"} 1
+# TYPE bidi_sessions_active gauge
+bidi_sessions_active 2
+"""
+
+
+def test_parse_metrics():
+    metrics = parse_metrics(SAMPLE)
+
+    assert metrics["bidi_sessions_active"] == {(): 2}
+    assert metrics["bidi_command_errors_total"] == {(("method", 'a"b'), ): 1}
+    assert metrics["bidi_command_duration_seconds_bucket"][((
+        "method", "script.evaluate"), ("le", "+Inf"))] == 10
+
+
+def test_parse_metrics_invalid_line():
+    with pytest.raises(ValueError):
+        parse_metrics("not a metric line")
+
+
+@pytest.mark.parametrize("q, expected", [(0, 0), (0.4, 0.005), (0.8, 0.01),
+                                         (0.9, 0.055), (1, 0.1)])
+def test_histogram_quantile(q, expected):
+    buckets = [(0.01, 8), (0.1, 10), (math.inf, 10)]
+
+    assert histogram_quantile(q, buckets) == pytest.approx(expected)
+
+
+def test_histogram_quantile_empty():
+    assert math.isnan(histogram_quantile(0.5, [(math.inf, 0)]))
+
+
+def test_command_stats():
+    stats = command_stats(parse_metrics(SAMPLE))
+
+    assert [(s.method, s.count, s.errors)
+            for s in stats] == [("script.evaluate", 10, 0), ('a"b', 1, 1)]
+    assert stats[0].mean == pytest.approx(0.02)
+    # Above the last finite bucket, only its bound is known.
+    assert stats[1].p99 == 0.1
+
+
+def test_subtract_skips_methods_without_new_commands():
+    metrics = parse_metrics(SAMPLE)
+
+    assert command_stats(subtract(metrics, metrics)) == []
+
+
+def test_render_report():
+    report = render_report(parse_metrics(SAMPLE), {"bidi_sessions_active": 2})
+
+    assert report.splitlines() == [
+        "method           count  errors  mean ms  p50 ms  p90 ms  p99 ms",
+        "script.evaluate     10       0     20.0     6.2    55.0    95.5",
+        'a"b                  1       1   1000.0   100.0   100.0   100.0',
+        "",
+        "bidi_sessions_active  peak 2",
+    ]
@@ -0,0 +1,96 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+import json
+import time
+from pathlib import Path
+
+import pytest
+from test_helpers import logger
+
+from tools.url_pattern import (UrlPatternIndex, cdp_from_spec_url_pattern,
+                               match_url_pattern)
+
+# The same corpus is checked against `NetworkStorage.matchUrlPattern` in
+# `src/bidiMapper/domains/network/NetworkStorage.spec.ts`.
+CORPUS = json.loads(
+    (Path(__file__).parent / "url_pattern_corpus.json").read_text())
+
+# Well below the rate on a developer machine, to leave room for slow CI hosts.
+MIN_MATCHED_URLS_PER_MS = 150
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=lambda case: case["url"])
+def test_url_pattern_corpus(case):
+    assert match_url_pattern(case["pattern"], case["url"]) == case["match"]
+
+
+@pytest.mark.parametrize("case", CORPUS, ids=lambda case: case["url"])
+def test_url_pattern_index_corpus(case):
+    index = UrlPatternIndex()
+    index.add("intercept", [case["pattern"]])
+
+    assert (index.match(case["url"]) == ["intercept"]) == case["match"]
+
+
+def test_cdp_from_spec_url_pattern():
+    assert cdp_from_spec_url_pattern({
+        "type": "string",
+        "pattern": "https://example.com"
+    }) == "https://example.com"
+    assert cdp_from_spec_url_pattern({
+        "type": "pattern",
+        "protocol": "https",
+        "hostname": "example.com",
+        "port": "80",
+        "pathname": "/foo",
+        "search": "bar=baz",
+    }) == "https://example.com:80/foo?bar=baz"
+
+
+def test_url_pattern_index_throughput():
+    index = UrlPatternIndex()
+    for i in range(1000):
+        index.add(f"host-{i}", [{
+            "type": "pattern",
+            "protocol": "https",
+            "hostname": f"host-{i}.example.com",
+        }])
+        index.add(f"path-{i}", [{
+            "type": "pattern",
+            "pathname": f"/api/{i}/*",
+        }])
+        index.add(f"string-{i}", [{
+            "type": "string",
+            "pattern": f"https://static.example.com/{i}.js",
+        }])
+
+    # No URL is matched twice, so every match goes through the index.
+    urls = [
+        f"https://host-{i % 1000}.example.com/api/{i % 7}/x?i={i}"
+        for i in range(10000)
+    ]
+
+    start = time.perf_counter()
+    matched = [index.match(url) for url in urls]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    rate = len(urls) / elapsed_ms
+
+    logger.info(f"Matched {len(urls)} URLs against {len(index)} intercepts: "
+                f"{rate:.0f} URLs/ms")
+
+    assert matched[8] == ["path-1", "host-8"]
+    assert all(len(keys) == 2 for keys in matched)
+    # Scanning all the patterns of the index matches a few URLs/ms.
+    assert rate >= MIN_MATCHED_URLS_PER_MS
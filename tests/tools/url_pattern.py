@@ -0,0 +1,475 @@
+#  Copyright 2023 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Python equivalent of the `network.addIntercept` URL pattern handling in
+`src/bidiMapper/domains/network/NetworkStorage.ts`.
+
+Pattern components are matched literally, except for `*`, which matches any
+sequence of characters. Missing components match anything.
+"""
+from __future__ import annotations
+
+import functools
+import re
+from typing import Callable, Hashable, Iterable, NamedTuple
+
+# Special schemes and their default ports.
+# https://url.spec.whatwg.org/#special-scheme
+_SPECIAL_SCHEMES = {
+    "ftp": "21",
+    "file": "",
+    "http": "80",
+    "https": "443",
+    "ws": "80",
+    "wss": "443",
+}
+
+_PATTERN_FIELDS = ("protocol", "hostname", "port", "pathname", "search")
+
+_ORIGIN_CACHE_SIZE = 4096
+
+
+class _Url(NamedTuple):
+    protocol: str
+    hostname: str
+    port: str
+    pathname: str
+    search: str
+
+
+class _CompiledPattern(NamedTuple):
+    # Each component is either `None` (matches anything), a literal string or
+    # a compiled regular expression.
+    protocol: str | re.Pattern | None
+    hostname: str | re.Pattern | None
+    port: str | re.Pattern | None
+    pathname: str | re.Pattern | None
+    search: str | re.Pattern | None
+
+
+def is_special_scheme(protocol: str) -> bool:
+    """Returns true if the given protocol is special.
+
+    >>> is_special_scheme("http:")
+    True
+    >>> is_special_scheme("sftp")
+    False
+    """
+    return protocol.removesuffix(":") in _SPECIAL_SCHEMES
+
+
+def build_url_pattern_string(url_pattern: dict) -> str:
+    """Port of `NetworkStorage.buildUrlPatternString`.
+
+    >>> build_url_pattern_string({"type": "pattern", "protocol": "https",
+    ...     "hostname": "example.com", "port": "80", "pathname": "foo",
+    ...     "search": "bar=baz"})
+    'https://example.com:80/foo?bar=baz'
+    >>> build_url_pattern_string({"type": "pattern"})
+    '*'
+    """
+    protocol = url_pattern.get("protocol")
+    hostname = url_pattern.get("hostname")
+    port = url_pattern.get("port")
+    pathname = url_pattern.get("pathname")
+    search = url_pattern.get("search")
+
+    if not protocol and not hostname and not port and not pathname and not search:
+        return "*"
+
+    url = ""
+    if protocol:
+        url += protocol
+        if not protocol.endswith(":"):
+            url += ":"
+        if is_special_scheme(protocol):
+            url += "//"
+    if hostname:
+        url += hostname
+    if port:
+        url += f":{port}"
+    if pathname:
+        if not pathname.startswith("/"):
+            url += "/"
+        url += pathname
+    if search:
+        if not search.startswith("?"):
+            url += "?"
+        url += search
+    return url
+
+
+def cdp_from_spec_url_pattern(url_pattern: dict) -> str:
+    """Port of `NetworkStorage.cdpFromSpecUrlPattern`."""
+    if url_pattern["type"] == "string":
+        return url_pattern["pattern"]
+    return build_url_pattern_string(url_pattern)
+
+
+@functools.lru_cache(maxsize=16384)
+def _parse_url(url: str) -> _Url | None:
+    """Splits the URL into the components matched by patterns.
+
+    >>> _parse_url("HTTP://Example.com:80?a=b#c")
+    _Url(protocol='http', hostname='example.com', port='', pathname='/', search='a=b')
+    """
+    protocol, separator, rest = url.partition(":")
+    if not separator:
+        return None
+    protocol = protocol.lower()
+
+    rest = rest.partition("#")[0]
+    rest, _, search = rest.partition("?")
+
+    if rest.startswith("//"):
+        authority, slash, pathname = rest[2:].partition("/")
+        pathname = slash + pathname
+        host_and_port = authority.rpartition("@")[2]
+        if host_and_port.startswith("["):
+            hostname, _, port = host_and_port.partition("]")
+            hostname += "]"
+            port = port.removeprefix(":")
+        else:
+            hostname, _, port = host_and_port.partition(":")
+        hostname = hostname.lower()
+    else:
+        hostname = port = ""
+        pathname = rest
+
+    default_port = _SPECIAL_SCHEMES.get(protocol)
+    if default_port is not None:
+        if not pathname:
+            pathname = "/"
+        if port == default_port:
+            port = ""
+
+    return _Url(protocol, hostname, port, pathname, search)
+
+
+def _compile_component(value: str | None) -> str | re.Pattern | None:
+    if value is None:
+        return None
+    if "*" not in value:
+        return value
+    return re.compile(".*".join(re.escape(part) for part in value.split("*")),
+                      re.DOTALL)
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_pattern(fields: tuple[str | None, ...]) -> _CompiledPattern:
+    protocol, hostname, port, pathname, search = fields
+
+    if protocol is not None:
+        protocol = protocol.removesuffix(":").lower()
+    if hostname is not None:
+        hostname = hostname.lower()
+    if port is not None and protocol is not None and port == _SPECIAL_SCHEMES.get(
+            protocol):
+        port = ""
+    if pathname is not None and not pathname.startswith("/"):
+        pathname = "/" + pathname
+    if search is not None:
+        search = search.removeprefix("?")
+
+    return _CompiledPattern(*(_compile_component(value)
+                              for value in (protocol, hostname, port, pathname,
+                                            search)))
+
+
+def _pattern_fields(url_pattern: dict) -> tuple[str | None, ...]:
+    return tuple(url_pattern.get(field) for field in _PATTERN_FIELDS)
+
+
+def _matches(pattern: _CompiledPattern, url: _Url) -> bool:
+    for expected, actual in zip(pattern, url):
+        if expected is None:
+            continue
+        if isinstance(expected, str):
+            if expected != actual:
+                return False
+        elif expected.fullmatch(actual) is None:
+            return False
+    return True
+
+
+def match_url_pattern(url_pattern: dict, url: str) -> bool:
+    """Port of `NetworkStorage.matchUrlPattern`.
+
+    >>> match_url_pattern({"type": "string", "pattern": "https://example.com"},
+    ...                   "https://example.com")
+    True
+    >>> match_url_pattern({"type": "pattern", "protocol": "https",
+    ...                    "hostname": "example.com"}, "https://example.com/aa")
+    True
+    >>> match_url_pattern({"type": "pattern", "protocol": "https",
+    ...                    "hostname": "example.com"}, "https://example.org/aa")
+    False
+    """
+    if url_pattern["type"] == "string":
+        return url_pattern["pattern"] == url
+    parsed = _parse_url(url)
+    if parsed is None:
+        return False
+    return _matches(_compile_pattern(_pattern_fields(url_pattern)), parsed)
+
+
+# Splits a URL into its origin, i.e. its scheme and authority, its path and its
+# query, without the fragment, the same way as `_parse_url`.
+_URL_RE = re.compile(r"([^:]*:(?://[^/?#]*)?)([^?#]*)(?:\?([^#]*))?")
+
+# A match of the index: the insertion order of the intercept and its key.
+_Item = tuple[int, Hashable]
+# Checks the rest of a pattern against the origin, pathname and search of a
+# URL.
+_Predicate = Callable[[_Url, str, str], bool]
+
+
+def _check(expected: str | re.Pattern | None, actual: str) -> bool:
+    if expected is None:
+        return True
+    if isinstance(expected, str):
+        return expected == actual
+    return expected.fullmatch(actual) is not None
+
+
+def _literal_prefix(pattern: re.Pattern) -> str:
+    """Returns the literal text before the first wildcard of a compiled
+    component."""
+    return re.sub(r"\\(.)", r"\1", pattern.pattern.partition(".*")[0])
+
+
+def _predicate(origin_checks: tuple[tuple[int, str | re.Pattern],
+                                    ...], pathname: str | re.Pattern | None,
+               search: str | re.Pattern | None) -> _Predicate | None:
+    """Returns the predicate for the checks left after bucketing, or `None` if
+    there are none."""
+    if not origin_checks and pathname is None and search is None:
+        return None
+
+    def predicate(origin: _Url, actual_pathname: str,
+                  actual_search: str) -> bool:
+        return (_check(pathname, actual_pathname)
+                and _check(search, actual_search) and all(
+                    _check(check, origin[index])
+                    for index, check in origin_checks))
+
+    return predicate
+
+
+class _Bucket:
+    """The patterns sharing a literal protocol and hostname, or the lack of
+    one, keyed by the literal prefix of their pathname.
+
+    The patterns left with nothing to check are kept apart from the others, so
+    that they are matched without a call.
+    """
+    def __init__(self) -> None:
+        self.any_path: tuple[list[_Item], list[tuple[_Item,
+                                                     _Predicate]]] = ([], [])
+        self.by_path_prefix: dict[str, tuple[list[_Item],
+                                             list[tuple[_Item,
+                                                        _Predicate]]]] = {}
+        self.prefix_lengths: tuple[int, ...] = ()
+
+    def __bool__(self) -> bool:
+        return any(self.any_path) or bool(self.by_path_prefix)
+
+    def add(self, item: _Item, compiled: _CompiledPattern) -> None:
+        # A literal protocol or hostname is implied by the bucket.
+        origin_checks = tuple((index, check)
+                              for index, check in enumerate(compiled[:3])
+                              if check is not None and (
+                                  index == 2 or not isinstance(check, str)))
+        pathname = compiled.pathname
+        if pathname is None:
+            entries = self.any_path
+        else:
+            if isinstance(pathname, str):
+                # The whole pathname is the prefix, so only its length is left
+                # to check.
+                prefix = pathname
+            else:
+                prefix = _literal_prefix(pathname)
+                if pathname.pattern == re.escape(prefix) + ".*":
+                    # A trailing wildcard matches anything after the prefix.
+                    pathname = None
+            entries = self.by_path_prefix.setdefault(prefix, ([], []))
+            if len(prefix) not in self.prefix_lengths:
+                self.prefix_lengths = tuple(
+                    sorted((*self.prefix_lengths, len(prefix))))
+        predicate = _predicate(origin_checks, pathname, compiled.search)
+        if predicate is None:
+            entries[0].append(item)
+        else:
+            entries[1].append((item, predicate))
+
+    def remove(self, key: Hashable) -> None:
+        for prefix, (always, checked) in [(None, self.any_path),
+                                          *self.by_path_prefix.items()]:
+            always[:] = [item for item in always if item[1] != key]
+            checked[:] = [entry for entry in checked if entry[0][1] != key]
+            if prefix is not None and not (always or checked):
+                del self.by_path_prefix[prefix]
+        self.prefix_lengths = tuple(
+            sorted({len(prefix)
+                    for prefix in self.by_path_prefix}))
+
+    def match(self, origin: _Url, pathname: str, search: str,
+              matched: list[_Item]) -> None:
+        always, checked = self.any_path
+        matched += always
+        for item, predicate in checked:
+            if predicate(origin, pathname, search):
+                matched.append(item)
+        for length in self.prefix_lengths:
+            entries = self.by_path_prefix.get(pathname[:length])
+            if entries is None:
+                continue
+            always, checked = entries
+            matched += always
+            for item, predicate in checked:
+                if predicate(origin, pathname, search):
+                    matched.append(item)
+
+
+class UrlPatternIndex:
+    """Predicts which intercepts catch a given URL.
+
+    Patterns are compiled once and bucketed by their literal protocol and
+    hostname, then by the literal prefix of their pathname. The buckets which
+    can match an origin are looked up once per origin, so that matching a URL
+    only splits it and checks the patterns which can possibly match its path.
+
+    >>> index = UrlPatternIndex()
+    >>> index.add("all", [])
+    >>> index.add("example", [{"type": "pattern", "hostname": "example.com"}])
+    >>> index.add("exact", [{"type": "string", "pattern": "http://a.com/"}])
+    >>> index.add("api", [{"type": "pattern", "pathname": "/api/*"}])
+    >>> index.match("https://example.com/foo")
+    ['all', 'example']
+    >>> index.match("http://a.com/")
+    ['all', 'exact']
+    >>> index.match("http://a.com/api/v1")
+    ['all', 'api']
+    >>> index.remove("all")
+    >>> index.match("http://b.com/")
+    []
+    """
+    def __init__(self) -> None:
+        self._order: dict[Hashable, int] = {}
+        self._counter = 0
+        self._match_all: list[_Item] = []
+        self._exact: dict[str, list[_Item]] = {}
+        self._buckets: dict[tuple[str | None, str | None], _Bucket] = {}
+        # The parsed origin and the buckets which can match its URLs, by
+        # origin.
+        self._origins: dict[str, tuple[_Url, tuple[_Bucket, ...]] | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, key: Hashable, url_patterns: Iterable[dict]) -> None:
+        """Adds an intercept. An empty list of patterns matches all URLs, same
+        as in `network.addIntercept`."""
+        if key in self._order:
+            self.remove(key)
+        self._origins.clear()
+        order = self._order[key] = self._counter
+        self._counter += 1
+
+        url_patterns = list(url_patterns)
+        if not url_patterns:
+            self._match_all.append((order, key))
+            return
+
+        for url_pattern in url_patterns:
+            if url_pattern["type"] == "string":
+                self._exact.setdefault(url_pattern["pattern"], []).append(
+                    (order, key))
+                continue
+            compiled = _compile_pattern(_pattern_fields(url_pattern))
+            bucket = (compiled.protocol if isinstance(compiled.protocol, str)
+                      else None, compiled.hostname if isinstance(
+                          compiled.hostname, str) else None)
+            self._buckets.setdefault(bucket, _Bucket()).add((order, key),
+                                                            compiled)
+
+    def remove(self, key: Hashable) -> None:
+        """Removes an intercept, if present."""
+        if self._order.pop(key, None) is None:
+            return
+        self._origins.clear()
+        self._match_all = [
+            entry for entry in self._match_all if entry[1] != key
+        ]
+        for url, entries in list(self._exact.items()):
+            entries[:] = [entry for entry in entries if entry[1] != key]
+            if not entries:
+                del self._exact[url]
+        for bucket_key, bucket in list(self._buckets.items()):
+            bucket.remove(key)
+            if not bucket:
+                del self._buckets[bucket_key]
+
+    def match(self, url: str) -> list[Hashable]:
+        """Returns the keys of the intercepts matching the URL, in the order
+        they were added."""
+        matched = self._match_all.copy()
+        exact = self._exact.get(url)
+        if exact is not None:
+            matched += exact
+
+        split = _URL_RE.match(url)
+        if split is not None:
+            origin, pathname, search = split.groups()
+            try:
+                buckets = self._origins[origin]
+            except KeyError:
+                buckets = self._origin_buckets(origin)
+            if buckets is not None:
+                # The pathname of the parsed origin is the default one.
+                parsed, origin_buckets = buckets
+                pathname = pathname or parsed.pathname
+                search = search or ""
+                for bucket in origin_buckets:
+                    bucket.match(parsed, pathname, search, matched)
+
+        if len(matched) < 2:
+            return [key for _, key in matched]
+        # An insertion order belongs to a single key.
+        matched.sort()
+        keys = [key for _, key in matched]
+        # A key is matched once per matching pattern.
+        return keys if len(matched) == len(set(keys)) else list(
+            dict.fromkeys(keys))
+
+    def _origin_buckets(
+            self, origin: str) -> tuple[_Url, tuple[_Bucket, ...]] | None:
+        """Looks up the buckets which can match the URLs of the origin, i.e.
+        the scheme and the authority of a URL."""
+        if len(self._origins) >= _ORIGIN_CACHE_SIZE:
+            self._origins.clear()
+        parsed = _parse_url(origin)
+        buckets = None
+        if parsed is not None:
+            origin_buckets = tuple(
+                self._buckets[bucket_key]
+                for bucket_key in ((parsed.protocol,
+                                    parsed.hostname), (parsed.protocol, None),
+                                   (None, parsed.hostname), (None, None))
+                if bucket_key in self._buckets)
+            if origin_buckets:
+                buckets = parsed, origin_buckets
+        self._origins[origin] = buckets
+        return buckets
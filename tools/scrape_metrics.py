@@ -0,0 +1,88 @@
+#  Copyright 2024 Google LLC.
+#  Copyright (c) Microsoft Corporation.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Scrapes the BiDi server `/metrics` endpoint while a command, e.g. the e2e
+tests, runs against it and prints the per-method command latencies.
+
+Usage:
+  python tools/scrape_metrics.py [--url URL] [--interval S] [-- COMMAND...]
+
+Without a command, it waits for Ctrl+C instead.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Current directory is not a module, so to import `metrics_report`, its path
+# has to be added to `sys.path`. It is done relative to this file's directory.
+# The `flake8` is disabled for this reason.
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'tests/tools/'))
+
+import metrics_report  # noqa: E402
+
+GAUGES = ('bidi_sessions_active', 'bidi_websocket_connections',
+          'bidi_websocket_send_buffer_bytes', 'bidi_mapper_commands_in_flight')
+
+
+def sample_gauges(metrics: metrics_report.Metrics, peaks: dict[str,
+                                                               float]) -> None:
+    for name in GAUGES:
+        for value in metrics.get(name, {}).values():
+            peaks[name] = max(peaks.get(name, 0), value)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--url',
+        default=f'http://localhost:{os.getenv("PORT", "8080")}/metrics')
+    parser.add_argument('--interval',
+                        type=float,
+                        default=1,
+                        help='Seconds between gauge samples.')
+    parser.add_argument('-o',
+                        '--output',
+                        help='Write the report to a file instead of stdout.')
+    parser.add_argument('command', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+
+    before = metrics_report.scrape(args.url)
+    peaks: dict[str, float] = {}
+    process = subprocess.Popen(command) if command else None
+    try:
+        while process is None or process.poll() is None:
+            time.sleep(args.interval)
+            sample_gauges(metrics_report.scrape(args.url), peaks)
+    except KeyboardInterrupt:
+        pass
+    returncode = process.wait() if process else 0
+
+    after = metrics_report.scrape(args.url)
+    sample_gauges(after, peaks)
+    report = metrics_report.render_report(
+        metrics_report.subtract(after, before), peaks)
+    if args.output:
+        Path(args.output).write_text(report)
+    else:
+        print(report, end='')
+    return returncode
+
+
+if __name__ == '__main__':
+    sys.exit(main())